@@ -0,0 +1,106 @@
+# -*- mode: python ; coding: utf-8 -*-
+# Build "onedir" otimizado para a partida:
+#   - sem extração para _MEIPASS a cada execução (os arquivos já ficam no disco);
+#   - só QtCore/QtGui/QtWidgets e os plugins que a GUI usa;
+#   - Roms FORA do pacote: ficam em dist\SNESLauncher\Roms (paths.rom_root());
+#   - sem UPX (DLLs do Qt comprimidas custam descompressão a cada carga).
+#
+#   .venv\Scripts\python.exe -m PyInstaller --noconfirm SNESLauncher_onedir.spec
+#
+# O build onefile original continua em SNESLauncher.spec.
+import os
+import fnmatch
+
+# Módulos do PySide6 que o launcher NÃO usa (evita que hooks/varredura os puxem)
+QT_EXCLUDES = [
+    'PySide6.' + m for m in (
+        'Qt3DAnimation', 'Qt3DCore', 'Qt3DExtras', 'Qt3DInput', 'Qt3DLogic', 'Qt3DRender',
+        'QtAxContainer', 'QtBluetooth', 'QtCharts', 'QtConcurrent', 'QtDataVisualization',
+        'QtDBus', 'QtDesigner', 'QtGraphs', 'QtGraphsWidgets', 'QtHelp', 'QtHttpServer',
+        'QtLocation', 'QtMultimedia', 'QtMultimediaWidgets', 'QtNetwork', 'QtNetworkAuth',
+        'QtNfc', 'QtOpenGL', 'QtOpenGLWidgets', 'QtPdf', 'QtPdfWidgets', 'QtPositioning',
+        'QtPrintSupport', 'QtQml', 'QtQuick', 'QtQuick3D', 'QtQuickControls2',
+        'QtQuickTest', 'QtQuickWidgets', 'QtRemoteObjects', 'QtScxml', 'QtSensors',
+        'QtSerialBus', 'QtSerialPort', 'QtSpatialAudio', 'QtSql', 'QtStateMachine',
+        'QtSvg', 'QtSvgWidgets', 'QtTest', 'QtTextToSpeech', 'QtUiTools', 'QtWebChannel',
+        'QtWebEngineCore', 'QtWebEngineQuick', 'QtWebEngineWidgets', 'QtWebSockets',
+        'QtWebView', 'QtXml',
+    )
+] + ['tkinter', 'unittest', 'pydoc', 'doctest']
+
+# DLLs/dados do Qt que sobram mesmo sem os módulos acima
+DROP_FILES = [
+    'opengl32sw.dll',                 # OpenGL por software (~20 MB), a GUI é só widgets
+    'd3dcompiler_*.dll',
+    '*qt6quick*', '*qt6qml*', '*qt6pdf*', '*qt6network*', '*qt6svg*', '*qt6opengl*',
+    '*qt6virtualkeyboard*', '*qtvirtualkeyboard*', '*qt6webengine*', '*qt6multimedia*',
+]
+# Plugins do Qt: só plataforma, estilos e os formatos de imagem usados (ico/jpeg; png é nativo)
+KEEP_PLUGIN_DIRS = {'platforms', 'styles', 'imageformats', 'platformthemes',
+                    'platforminputcontexts', 'xcbglintegrations'}
+KEEP_IMAGEFORMATS = ['*qico*', '*qjpeg*']
+KEEP_TRANSLATIONS = ['qtbase_pt*', 'qtbase_en*']
+
+def _keep(dest):
+    parts = dest.replace('\\', '/').lower().split('/')
+    name = parts[-1]
+    if any(fnmatch.fnmatch(name, p) for p in DROP_FILES):
+        return False
+    if 'plugins' in parts:
+        sub = parts[parts.index('plugins') + 1] if parts.index('plugins') + 1 < len(parts) - 1 else ''
+        if sub not in KEEP_PLUGIN_DIRS:
+            return False
+        if sub == 'imageformats' and not any(fnmatch.fnmatch(name, p) for p in KEEP_IMAGEFORMATS):
+            return False
+    if 'translations' in parts and name.endswith('.qm'):
+        return any(fnmatch.fnmatch(name, p) for p in KEEP_TRANSLATIONS)
+    return True
+
+datas = [('snes_bg.png', '.'), ('snes_launcher.ico', '.')]
+if os.path.exists('snes9x-x64.exe'):
+    datas.append(('snes9x-x64.exe', '.'))
+
+a = Analysis(
+    [os.path.join('src', 'main.py')],
+    pathex=['src'],
+    binaries=[],
+    datas=datas,
+    hiddenimports=[],
+    hookspath=[],
+    hooksconfig={},
+    runtime_hooks=[],
+    excludes=QT_EXCLUDES,
+    noarchive=False,
+    optimize=0,
+)
+a.binaries = [e for e in a.binaries if _keep(e[0])]
+a.datas = [e for e in a.datas if _keep(e[0])]
+pyz = PYZ(a.pure)
+
+exe = EXE(
+    pyz,
+    a.scripts,
+    [],
+    exclude_binaries=True,
+    name='SNESLauncher',
+    debug=False,
+    bootloader_ignore_signals=False,
+    strip=False,
+    upx=False,
+    console=False,
+    disable_windowed_traceback=True,
+    argv_emulation=False,
+    target_arch=None,
+    codesign_identity=None,
+    entitlements_file=None,
+    icon=['snes_launcher.ico'],
+)
+coll = COLLECT(
+    exe,
+    a.binaries,
+    a.datas,
+    strip=False,
+    upx=False,
+    upx_exclude=[],
+    name='SNESLauncher',
+)
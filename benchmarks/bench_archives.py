@@ -0,0 +1,94 @@
+# benchmarks/bench_archives.py
+"""
+Formatos de contêiner lado a lado (app.archives), com a mesma ROM sintética
+em cada um: tamanho no disco, listagem, leitura do cabeçalho (read limitado)
+e extração em streaming (MiB/s e pico de memória do Python, que deve ficar
+perto do chunk do formato e não do tamanho da ROM).
+
+    python benchmarks/bench_archives.py --rom-mb 4 --repeat 5
+
+7z só entra com o py7zr instalado.
+"""
+import os, sys, gzip, bz2, lzma, json, time, shutil, zipfile, argparse, tempfile, statistics, tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from app.archives import open_archive, throughput
+
+def rom_bytes(size: int) -> bytes:
+    # Metade código/gráficos "aleatórios", metade tabelas e preenchimento repetidos (~2x no deflate)
+    out = bytearray()
+    i = 0
+    while len(out) < size:
+        out += os.urandom(16384) if i % 2 == 0 else bytes((j * 13 + i) & 0x3F for j in range(16384))
+        i += 1
+    return bytes(out[:size])
+
+def make_containers(tmp: str, data: bytes) -> dict:
+    out = {}
+    p = os.path.join(tmp, "jogo.zip")
+    with zipfile.ZipFile(p, "w", zipfile.ZIP_DEFLATED) as zf:
+        zf.writestr("jogo.sfc", data)
+    out["zip"] = p
+    try:
+        import py7zr
+        p = os.path.join(tmp, "jogo.7z")
+        with py7zr.SevenZipFile(p, "w") as z:
+            z.writestr(data, "jogo.sfc")
+        out["7z"] = p
+    except ImportError:
+        pass
+    for kind, mod in (("gz", gzip), ("bz2", bz2), ("xz", lzma)):
+        p = os.path.join(tmp, f"jogo.sfc.{kind}")
+        with open(p, "wb") as f:
+            f.write(mod.compress(data))
+        out[kind] = p
+    return out
+
+class _Null:
+    def write(self, b):
+        return len(b)
+
+def bench_one(path: str, repeat: int) -> dict:
+    list_ms, header_ms, extract_ms = [], [], []
+    for _ in range(repeat):
+        t0 = time.perf_counter()
+        with open_archive(path) as ar:
+            member = ar.pick(None)
+            list_ms.append((time.perf_counter() - t0) * 1000)
+            t0 = time.perf_counter()
+            ar.read(member, 0x10000)
+            header_ms.append((time.perf_counter() - t0) * 1000)
+            t0 = time.perf_counter()
+            n = ar.copy(member, _Null())
+            extract_ms.append((time.perf_counter() - t0) * 1000)
+    tracemalloc.start()
+    with open_archive(path) as ar:
+        ar.copy(ar.pick(None), _Null())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    med = statistics.median(extract_ms)
+    return {"disk_bytes": os.path.getsize(path), "ratio": round(n / os.path.getsize(path), 2),
+            "list_ms": round(statistics.median(list_ms), 2), "header_ms": round(statistics.median(header_ms), 2),
+            "extract_ms": round(med, 2), "mb_per_s": round(n / (1024 * 1024) / (med / 1000), 1),
+            "peak_kib": peak // 1024}
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rom-mb", type=float, default=4)
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="snes_arch_")
+    try:
+        data = rom_bytes(int(args.rom_mb * 1024 * 1024))
+        result = {"bench": "archives", "rom_mb": args.rom_mb}
+        for kind, path in make_containers(tmp, data).items():
+            result[kind] = bench_one(path, args.repeat)
+        result["throughput"] = throughput()
+        print(json.dumps(result))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+# benchmarks/bench_conf.py
+"""
+Custo de _patch_fullscreen_conf por lançamento e quantas aberturas de
+arquivo ele faz na pasta do emulador (via audit hook). Relançar na mesma
+resolução deve dar 0 aberturas.
+
+    python benchmarks/bench_conf.py --repeat 200
+"""
+import os, sys, json, time, shutil, tempfile, argparse, logging, statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from app.launcher import _patch_fullscreen_conf
+
+SAMPLE_CONF = """\
+[Display\\Win]
+  Stretch:Enabled                 = FALSE
+  Stretch:MaintainAspectRatio     = TRUE
+  Fullscreen:Width                = 800
+  Fullscreen:Height               = 600
+  Fullscreen:EmulateFullscreen    = TRUE
+
+[Controls\\Win\\Joypad1]
+  Up                              = Up
+  Down                            = Down
+  A                               = V
+
+[Settings]
+  PauseWhenInactive               = TRUE
+"""
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=200)
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="snes_bench_")
+    opens = []
+    def _audit(event, a):
+        if event == "open" and isinstance(a[0], str) and a[0].startswith(tmp):
+            opens.append(a[0])
+    sys.addaudithook(_audit)
+
+    log = logging.getLogger("bench"); log.addHandler(logging.NullHandler())
+    try:
+        with open(os.path.join(tmp, "snes9x.conf"), "w", encoding="utf-8") as f:
+            f.write(SAMPLE_CONF)
+        opens.clear()
+        t0 = time.perf_counter()
+        _patch_fullscreen_conf(tmp, 1920, 1080, log)
+        first_ms = (time.perf_counter() - t0) * 1000
+        first_opens = len(opens)
+
+        opens.clear()
+        samples = []
+        for _ in range(args.repeat):
+            t0 = time.perf_counter()
+            _patch_fullscreen_conf(tmp, 1920, 1080, log)
+            samples.append((time.perf_counter() - t0) * 1000)
+        repeat_opens = len(opens)
+
+        opens.clear()
+        _patch_fullscreen_conf(tmp, 2560, 1440, log)
+        change_opens = len(opens)
+
+        print(json.dumps({
+            "bench": "conf",
+            "first_ms": round(first_ms, 3),
+            "first_opens": first_opens,
+            "repeat_median_ms": round(statistics.median(samples), 4),
+            "repeat_opens_total": repeat_opens,
+            "resolution_change_opens": change_opens,
+        }))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
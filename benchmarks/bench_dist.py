@@ -0,0 +1,109 @@
+# benchmarks/bench_dist.py
+"""
+Compara os dois modos de distribuição do PyInstaller:
+
+  - onefile: SNESLauncher.spec (tudo num .exe, extraído para _MEIPASS a cada execução)
+  - onedir:  SNESLauncher_onedir.spec (pasta pronta, Qt enxuto, Roms fora do pacote)
+
+Mede o tamanho em disco e o tempo de partida: "frio" é a primeira execução
+numa cópia nova da distribuição (onefile ainda extrai tudo do zero), "quente"
+é a mediana das execuções seguintes. O app é aberto com
+SNES_EXIT_AFTER_STARTUP=1 (fecha sozinho após a partida) e o primeiro quadro
+é lido do trace (Saves/trace.jsonl) da cópia.
+
+    python benchmarks/bench_dist.py --build --runs 5
+    python benchmarks/bench_dist.py --onefile dist\\SNESLauncher.exe --onedir dist_onedir\\SNESLauncher
+
+Para um "frio" de verdade (sem cache de arquivos do SO), reinicie a máquina
+antes e rode com --runs 1.
+"""
+import os, sys, json, time, shutil, argparse, tempfile, statistics, subprocess
+
+ROOT = os.path.normpath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+EXE_NAME = "SNESLauncher.exe" if os.name == "nt" else "SNESLauncher"
+
+def build(spec: str, distpath: str) -> None:
+    subprocess.run([sys.executable, "-m", "PyInstaller", "--noconfirm", "--distpath", distpath,
+                    "--workpath", os.path.join(distpath, "_build"), os.path.join(ROOT, spec)],
+                   cwd=ROOT, check=True)
+
+def disk_size(path: str) -> int:
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    total = 0
+    for dirpath, _, files in os.walk(path):
+        for f in files:
+            p = os.path.join(dirpath, f)
+            try:
+                if not os.path.islink(p):  # links (.so versionadas) não ocupam de novo
+                    total += os.lstat(p).st_size
+            except OSError:
+                pass
+    return total
+
+def _first_paint(exe_dir: str):
+    """at_ms do último first_paint registrado no trace da cópia."""
+    last = None
+    try:
+        with open(os.path.join(exe_dir, "Saves", "trace.jsonl"), "r", encoding="utf-8") as f:
+            for line in f:
+                ev = json.loads(line)
+                if ev.get("kind") == "startup" and ev.get("name") == "first_paint":
+                    last = ev.get("at_ms")
+    except (OSError, ValueError):
+        pass
+    return last
+
+def run_once(exe: str, timeout: float) -> dict:
+    env = dict(os.environ, SNES_EXIT_AFTER_STARTUP="1")
+    t0 = time.perf_counter()
+    rc = subprocess.run([exe], env=env, cwd=os.path.dirname(exe), timeout=timeout,
+                        stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+    return {"wall_ms": round((time.perf_counter() - t0) * 1000, 1), "rc": rc,
+            "first_paint_ms": _first_paint(os.path.dirname(exe))}
+
+def measure(mode: str, src: str, runs: int, timeout: float) -> dict:
+    tmp = tempfile.mkdtemp(prefix=f"snes_dist_{mode}_")
+    try:
+        if os.path.isdir(src):
+            dst = os.path.join(tmp, os.path.basename(src.rstrip("\\/")))
+            shutil.copytree(src, dst)
+            exe = os.path.join(dst, EXE_NAME)
+        else:
+            exe = os.path.join(tmp, os.path.basename(src))
+            shutil.copy2(src, exe)
+        cold = run_once(exe, timeout)
+        warm = [run_once(exe, timeout) for _ in range(max(0, runs - 1))]
+        out = {"size_mb": round(disk_size(src) / (1024 * 1024), 1), "cold": cold}
+        if warm:
+            out["warm_median_wall_ms"] = round(statistics.median(w["wall_ms"] for w in warm), 1)
+            fp = [w["first_paint_ms"] for w in warm if w["first_paint_ms"] is not None]
+            if fp:
+                out["warm_median_first_paint_ms"] = round(statistics.median(fp), 1)
+        return out
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--build", action="store_true", help="gera os dois builds antes de medir")
+    ap.add_argument("--onefile", default=os.path.join(ROOT, "dist", EXE_NAME))
+    ap.add_argument("--onedir", default=os.path.join(ROOT, "dist_onedir", "SNESLauncher"))
+    ap.add_argument("--runs", type=int, default=5)
+    ap.add_argument("--timeout", type=float, default=120)
+    args = ap.parse_args()
+
+    if args.build:
+        build("SNESLauncher.spec", os.path.dirname(args.onefile))
+        build("SNESLauncher_onedir.spec", os.path.dirname(args.onedir))
+
+    result = {"bench": "dist", "runs": args.runs}
+    for mode, path in (("onefile", args.onefile), ("onedir", args.onedir)):
+        if not os.path.exists(path):
+            result[mode] = {"error": f"não encontrado: {path}"}
+            continue
+        result[mode] = measure(mode, path, args.runs, args.timeout)
+    print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+# benchmarks/bench_hashing.py
+"""
+Cache de hashes (app.hashing.hash_library): biblioteca sintética com
+.sfc, .smc (cabeçalho de copiadora) e ZIPs do mesmo conteúdo. Mede a
+primeira passada (tudo hasheado, MiB/s), a segunda sem mudanças e a
+terceira depois de alterar UM arquivo (deve hashear só ele). Reporta
+também quantos grupos de duplicatas o catálogo achou.
+
+    python benchmarks/bench_hashing.py --files 5000 --rom-kb 256 --workers 0
+"""
+import os, sys, json, time, shutil, zipfile, argparse, tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from app.catalog import Catalog
+from app.hashing import hash_library
+
+def make_library(root: str, files: int, rom_kb: int) -> None:
+    for i in range(files):
+        sub = os.path.join(root, f"d{i // 500:03d}")
+        os.makedirs(sub, exist_ok=True)
+        data = (i // 3).to_bytes(4, "little") * (rom_kb * 256)   # de 3 em 3: mesmo conteúdo
+        kind = i % 3
+        if kind == 0:
+            with open(os.path.join(sub, f"game{i:05d}.sfc"), "wb") as f:
+                f.write(data)
+        elif kind == 1:
+            with open(os.path.join(sub, f"game{i:05d}.smc"), "wb") as f:
+                f.write(b"\0" * 512 + data)
+        else:
+            with zipfile.ZipFile(os.path.join(sub, f"game{i:05d}.zip"), "w", zipfile.ZIP_DEFLATED) as z:
+                z.writestr(f"game{i:05d}.sfc", data)
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=5000)
+    ap.add_argument("--rom-kb", type=int, default=64)
+    ap.add_argument("--workers", type=int, default=0, help="0 = núcleos, 1 = sem pool")
+    args = ap.parse_args()
+
+    tmp = tempfile.mkdtemp(prefix="snes_hash_")
+    root = os.path.join(tmp, "Roms")
+    try:
+        make_library(root, args.files, args.rom_kb)
+        cat = Catalog(db_path=os.path.join(tmp, "catalog.sqlite3"), root=root)
+        try:
+            cat.rescan()
+            first = hash_library(cat, workers=args.workers or None)
+            second = hash_library(cat, workers=args.workers or None)
+            changed = os.path.join(root, "d000", "game00000.sfc")
+            with open(changed, "r+b") as f:
+                f.write(b"\xff")
+            os.utime(changed, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+            cat.rescan(full=True)
+            third = hash_library(cat, workers=args.workers or None)
+            dups = cat.duplicates()
+        finally:
+            cat.close()
+        print(json.dumps({"bench": "hashing", "files": args.files, "rom_kb": args.rom_kb, "cpus": os.cpu_count(),
+                          "cold": first, "unchanged": second, "one_changed": third,
+                          "duplicate_groups": len(dups)}))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,89 @@
+# benchmarks/bench_hotkeys.py
+"""
+Precisão e custo do atalho de segurar (app.hotkeys) com entrada simulada:
+o mesmo roteiro de seguradas (algumas abaixo, outras acima do limiar) passa
+pelo backend de eventos e por polling em intervalos diferentes.
+
+Para cada um: atraso do disparo em relação a press + limiar (p50/p95/máx),
+disparos perdidos (segurou além do limiar + intervalo e não disparou),
+disparos falsos (soltou antes do limiar e disparou) e acordadas por
+segundo (serviço + backend).
+
+    python benchmarks/bench_hotkeys.py --holds 30 --threshold 150 --poll 50 10
+"""
+import os, sys, json, time, random, argparse, statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from app.jobs import JobPool, Supervisor
+from app.hotkeys import HotkeyService, PollingBackend, SimulatedBackend
+
+KEY = "F12"
+
+def make_script(holds: int, threshold_ms: float, seed: int):
+    rnd = random.Random(seed)
+    script, spans, t = [], [], 0.05
+    for _ in range(holds):
+        held = rnd.uniform(0.3, 2.0) * threshold_ms / 1000.0
+        script += [(t, KEY, True), (t + held, KEY, False)]
+        spans.append(held)
+        t += held + 0.6   # acima do cooldown padrão (500 ms)
+    return script, spans, t
+
+def run_backend(mode: str, script, threshold_ms: float, interval_ms: float, duration: float) -> dict:
+    fires = []
+    sim = SimulatedBackend(script, events=(mode == "event"))
+    backends = [sim]
+    if mode != "event":
+        backends.append(PollingBackend({KEY: KEY}, sim.is_down, interval_ms))
+    svc = HotkeyService(threshold_ms, lambda key: fires.append(time.monotonic()), backends)
+    pool = JobPool("bench", max_workers=4)
+    session = Supervisor(pool, "bench")
+    t0 = time.monotonic()
+    svc.attach(session)
+    time.sleep(duration + 0.2)
+    session.close()
+    pool.shutdown(wait=True)
+    elapsed = time.monotonic() - t0
+
+    presses = [t for k, p, t in sim.log if p]
+    releases = [t for k, p, t in sim.log if not p]
+    thr = threshold_ms / 1000.0
+    slack = (interval_ms / 1000.0 if mode != "event" else 0.0) + 0.01
+    late, missed, false = [], 0, 0
+    for press, release in zip(presses, releases):
+        hit = [f for f in fires if press <= f <= release + slack]
+        held = release - press
+        if hit:
+            late.append((hit[0] - press - thr) * 1000)
+            if held < thr - 0.005:
+                false += 1
+        elif held >= thr + slack:
+            missed += 1
+    wakeups = svc.wakeups + sum(b.wakeups for b in backends)
+    out = {"fires": len(fires), "missed": missed, "false": false,
+           "wakeups_per_s": round(wakeups / elapsed, 1)}
+    if late:
+        late.sort()
+        out.update(late_p50_ms=round(statistics.median(late), 2),
+                   late_p95_ms=round(late[int(0.95 * (len(late) - 1))], 2),
+                   late_max_ms=round(late[-1], 2))
+    return out
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--holds", type=int, default=30)
+    ap.add_argument("--threshold", type=float, default=150, help="limiar em ms")
+    ap.add_argument("--poll", type=float, nargs="*", default=[50, 10], help="intervalos de polling em ms")
+    ap.add_argument("--seed", type=int, default=1)
+    args = ap.parse_args()
+
+    script, spans, duration = make_script(args.holds, args.threshold, args.seed)
+    result = {"bench": "hotkeys", "holds": args.holds, "threshold_ms": args.threshold,
+              "event": run_backend("event", script, args.threshold, 0, duration)}
+    for ms in args.poll:
+        result[f"poll_{ms:g}ms"] = run_backend("poll", script, args.threshold, ms, duration)
+    print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+# benchmarks/bench_library.py
+"""
+Como o launcher escala com o tamanho da biblioteca (benchmarks/synth.py):
+
+  - carregar_jogos: catálogo zerado, segunda chamada sem mudanças e depois
+    de um arquivo novo numa pasta;
+  - GUI (Qt offscreen): janela até o fim da varredura da partida,
+    filter_games por consulta, _refresh_game_list e _populate_internal
+    de uma ROM solta e de ZIPs (listagem fria e do cache no catálogo);
+  - Runner.run com um ZIP grande e um emulador de mentira (script que sai
+    na hora) no lugar do snes9x: clique até o resultado, com staging vazio
+    e com a ROM já no staging;
+  - _patch_fullscreen_conf: primeira escrita e relançamento na mesma resolução.
+
+Tudo roda num diretório temporário apontado por SNES_ROMS/SNES_SAVES/
+SNES_EMULATOR/LOCALAPPDATA (app.paths), nada toca a pasta real.
+
+    python benchmarks/bench_library.py --files 10000 --repeat 5
+    python benchmarks/run_all.py      # vários tamanhos, JSON para comparar commits
+"""
+import os, sys, json, time, shutil, logging, argparse, tempfile, statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from synth import make_library, make_zip
+from bench_conf import SAMPLE_CONF
+
+_qapp = None   # QApplication da GUI/Runner, vivo até o fim do processo
+QUERIES = ("super", "dragon quest", "usa", "kong country 2", "zzzz", "")
+
+def _ms(t0: float) -> float:
+    return round((time.perf_counter() - t0) * 1000, 2)
+
+def _median(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); samples.append((time.perf_counter() - t0) * 1000)
+    return round(statistics.median(samples), 3)
+
+def _pump(until, timeout: float = 120.0) -> bool:
+    from PySide6.QtCore import QEventLoop
+    # QEventLoop.processEvents, não QApplication.processEvents: no PySide6 6.12 o
+    # estático perde uma referência de None por chamada e derruba o processo
+    # depois de umas dezenas de milhares de voltas (bibliotecas grandes)
+    loop = QEventLoop()
+    end = time.perf_counter() + timeout
+    while not until():
+        if time.perf_counter() > end:
+            return False
+        loop.processEvents()
+        time.sleep(0.001)
+    return True
+
+def setup_env(tmp: str) -> dict:
+    """Pastas do app no temporário e um emulador que só sai (com um snes9x.conf ao lado)."""
+    emu = os.path.join(tmp, "emu")
+    os.makedirs(emu)
+    if os.name == "nt":
+        exe = os.path.join(emu, "snes9x-stub.cmd")
+        with open(exe, "w") as f:
+            f.write("@exit /b 0\r\n")
+    else:
+        exe = os.path.join(emu, "snes9x-stub")
+        with open(exe, "w") as f:
+            f.write("#!/bin/sh\nexit 0\n")
+        os.chmod(exe, 0o755)
+    with open(os.path.join(emu, "snes9x.conf"), "w", encoding="utf-8") as f:
+        f.write(SAMPLE_CONF)
+    env = {"SNES_ROMS": os.path.join(tmp, "Roms"), "SNES_SAVES": os.path.join(tmp, "Saves"),
+           "SNES_EMULATOR": exe, "LOCALAPPDATA": os.path.join(tmp, "local")}
+    os.environ.update(env)
+    return env
+
+def bench_carregar(files: int, repeat: int) -> dict:
+    from app.paths import rom_root
+    from app.roms import carregar_jogos
+    t0 = time.perf_counter()
+    n = len(carregar_jogos())
+    cold = _ms(t0)
+    assert n >= files, f"carregar_jogos devolveu {n} de {files}"
+    warm = _median(carregar_jogos, repeat)
+    sub = os.path.join(rom_root(), sorted(os.listdir(rom_root()))[0])
+    sub = os.path.join(sub, sorted(os.listdir(sub))[0])
+    with open(os.path.join(sub, "Novo Jogo (USA).sfc"), "wb") as f:
+        f.truncate(0x10000)
+    os.utime(sub, ns=(time.time_ns(), time.time_ns() + 1_000_000_000))
+    t0 = time.perf_counter()
+    n2 = len(carregar_jogos())
+    return {"entries": n, "cold_ms": cold, "warm_ms": warm, "one_added_ms": _ms(t0), "one_added_delta": n2 - n}
+
+def bench_gui(repeat: int) -> dict:
+    from app.gui import MainWindow
+    log = logging.getLogger("bench")
+    t0 = time.perf_counter()
+    w = MainWindow(log)
+    w.show()
+    done = []
+    w.scanner.done.connect(done.append)
+    _pump(lambda: done and not w.scanner.is_running())
+    out = {"startup_scan_ms": _ms(t0), "rows": w.game_proxy.rowCount()}
+    _pump(lambda: False, timeout=0.5)   # deixa índice de cabeçalhos/tags assentar
+    try:
+        out["filter_ms"] = {q or "(vazio)": _median(lambda: w.filter_games(q), repeat) for q in QUERIES}
+        out["filter_rows"] = {}
+        for q in QUERIES:
+            w.filter_games(q)
+            out["filter_rows"][q or "(vazio)"] = w.game_proxy.rowCount()
+        out["refresh_ms"] = _median(w._refresh_game_list, repeat)
+
+        entries = w.catalog.entries()
+        rom = next(e for e in entries if e[0] == "rom")
+        out["populate_rom_ms"] = _median(lambda: w._populate_internal(*rom), repeat)
+        multi = [e for e in entries if e[0] == "zip"]
+        for label in ("populate_zip_cold_ms", "populate_zip_cached_ms"):
+            samples = []
+            for tipo, rel in multi[:repeat] if label.endswith("cold_ms") else multi[:1] * repeat:
+                w._selected = (tipo, rel)
+                w.list_internal.clear()
+                t0 = time.perf_counter()
+                w._populate_internal(tipo, rel)
+                _pump(lambda: w.list_internal.count() > 0, timeout=30)
+                samples.append((time.perf_counter() - t0) * 1000)
+            out[label] = round(statistics.median(samples), 2)
+    finally:
+        w._selected = None
+        w.close_app()
+    return out
+
+def bench_runner(tmp: str, members: int, rom_mb: float, repeat: int) -> dict:
+    from app.runner import Runner
+    zp = os.path.join(tmp, "Grande.zip")
+    names = make_zip(zp, members, rom_mb)
+    log = logging.getLogger("bench")
+    r = Runner(log)
+    results = []
+    r.result.connect(results.append)
+
+    def once(member):
+        n = len(results)
+        t0 = time.perf_counter()
+        r.run(zp, member, fullscreen=False)
+        _pump(lambda: len(results) > n)
+        ms = (time.perf_counter() - t0) * 1000
+        assert results[-1].status == "ok", results[-1]
+        return ms
+    try:
+        once(names[0])   # deploy do emulador no runtime (uma vez por processo)
+        cold = []
+        for i in range(repeat):
+            shutil.rmtree(r.staging.root, ignore_errors=True)
+            cold.append(once(names[1 + i % (members - 1)]))
+        warm = [once(names[0]) for _ in range(repeat)]
+    finally:
+        r.shutdown()
+    return {"members": members, "rom_mb": rom_mb, "cold_ms": round(statistics.median(cold), 2),
+            "staged_ms": round(statistics.median(warm), 2)}
+
+def bench_conf(tmp: str, repeat: int) -> dict:
+    from app.launcher import _patch_fullscreen_conf
+    d = os.path.join(tmp, "conf")
+    os.makedirs(d)
+    with open(os.path.join(d, "snes9x.conf"), "w", encoding="utf-8") as f:
+        f.write(SAMPLE_CONF)
+    log = logging.getLogger("bench")
+    t0 = time.perf_counter()
+    _patch_fullscreen_conf(d, 1920, 1080, log)
+    first = _ms(t0)
+    return {"first_ms": first, "repeat_ms": _median(lambda: _patch_fullscreen_conf(d, 1920, 1080, log), repeat)}
+
+def main():
+    global _qapp
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=10000)
+    ap.add_argument("--rom-kb", type=int, default=64)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--members", type=int, default=4, help="ROMs no ZIP do Runner.run")
+    ap.add_argument("--rom-mb", type=float, default=4, help="tamanho de cada ROM do ZIP do Runner.run")
+    ap.add_argument("--no-gui", action="store_true", help="só carregar_jogos e _patch_fullscreen_conf")
+    args = ap.parse_args()
+
+    logging.getLogger("bench").addHandler(logging.NullHandler())
+    logging.getLogger("bench").propagate = False
+    tmp = tempfile.mkdtemp(prefix="snes_lib_")
+    try:
+        env = setup_env(tmp)
+        result = {"bench": "library", "files": args.files, "cpus": os.cpu_count(),
+                  "synth": make_library(env["SNES_ROMS"], args.files, args.rom_kb)}
+        result["carregar_jogos"] = bench_carregar(args.files, args.repeat)
+        result["conf"] = bench_conf(tmp, args.repeat * 20)
+        if not args.no_gui:
+            from PySide6.QtWidgets import QApplication
+            _qapp = QApplication.instance() or QApplication(sys.argv)
+            result["gui"] = bench_gui(args.repeat)
+            result["runner"] = bench_runner(tmp, max(args.members, 2), args.rom_mb, args.repeat)
+        print(json.dumps(result))
+    finally:
+        shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+# benchmarks/bench_patches.py
+"""
+Aplicação de patches (app.patches) sobre uma ROM sintética de 4 MB no
+formato de uma tradução: milhares de trechos de texto trocados, um bloco
+grande de gráficos novo, um bloco movido e expansão da ROM (preenchimento
+0xFF + dados novos). Gera IPS, UPS e BPS do mesmo par base/resultado e
+compara com a aplicação byte a byte em Python puro (referência).
+
+    python benchmarks/bench_patches.py --rom-mb 4 --edits 3000 --repeat 5
+
+Também confere que todos os formatos reproduzem exatamente o resultado, e
+mede o checksum interno (app.romheader.rom_checksum) que o lançamento
+confere em cada patch aplicado, contra sum() byte a byte.
+"""
+import os, re, sys, json, time, zlib, random, argparse, statistics
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+from app.patches import apply_patch, _varint
+from app.romheader import rom_checksum
+
+def make_pair(rom_mb: float, edits: int, seed: int = 1):
+    rnd = random.Random(seed)
+    size = int(rom_mb * 1024 * 1024)
+    source = bytearray(rnd.randbytes(size))
+    target = bytearray(source)
+    for _ in range(edits):                        # textos traduzidos
+        off = rnd.randrange(0, size - 64)
+        n = rnd.randint(1, 64)
+        target[off:off + n] = rnd.randbytes(n)
+    g = size // 4                                  # fonte/gráficos novos
+    target[g:g + 256 * 1024] = rnd.randbytes(256 * 1024)
+    moved = (size // 2, size // 3, 32 * 1024)      # destino, origem, tamanho
+    target[moved[0]:moved[0] + moved[2]] = source[moved[1]:moved[1] + moved[2]]
+    target += b"\xff" * (512 * 1024) + rnd.randbytes(512 * 1024)   # expansão
+    return bytes(source), bytes(target), moved
+
+def _enc(n: int) -> bytes:
+    out = bytearray()
+    while True:
+        x, n = n & 0x7F, n >> 7
+        if n == 0:
+            out.append(0x80 | x)
+            return bytes(out)
+        out.append(x)
+        n -= 1
+
+def _xor(source: bytes, target: bytes) -> bytes:
+    src = source[:len(target)].ljust(len(target), b"\0")
+    return (int.from_bytes(src, "little") ^ int.from_bytes(target, "little")).to_bytes(len(target), "little")
+
+def _runs(source: bytes, target: bytes):
+    """Trechos (início, fim) em que o resultado difere da base (ou passa do fim dela)."""
+    diff = _xor(source, target[:len(source)])
+    for m in re.finditer(rb"[^\x00]+", diff):
+        yield m.start(), m.end()
+    if len(target) > len(source):
+        yield len(source), len(target)
+
+def _fill(run: bytes) -> bool:
+    return len(run) > 16 and run.count(run[:1]) == len(run)
+
+def make_ips(target: bytes, runs) -> bytes:
+    out = bytearray(b"PATCH")
+    for a, b in runs:
+        fill = _fill(target[a:b])
+        for off in range(a, b, 0xFFFE):
+            end = min(b, off + 0xFFFE)
+            if off == 0x454F46:     # offset igual a "EOF": começa um byte antes (regrava o anterior)
+                off -= 1
+            elif fill:              # RLE: (0, tamanho, valor)
+                out += off.to_bytes(3, "big") + b"\0\0" + (end - off).to_bytes(2, "big") + target[off:off + 1]
+                continue
+            out += off.to_bytes(3, "big") + (end - off).to_bytes(2, "big") + target[off:end]
+    return bytes(out + b"EOF")
+
+def make_ups(source: bytes, target: bytes) -> bytes:
+    out = bytearray(b"UPS1" + _enc(len(source)) + _enc(len(target)))
+    pos = 0
+    for m in re.finditer(rb"[^\x00]+", _xor(source, target)):
+        out += _enc(m.start() - pos) + m.group() + b"\0"
+        pos = m.end() + 1
+    out += zlib.crc32(source).to_bytes(4, "little") + zlib.crc32(target).to_bytes(4, "little")
+    return bytes(out + zlib.crc32(out).to_bytes(4, "little"))
+
+def make_bps(source: bytes, target: bytes, moved, runs) -> bytes:
+    out = bytearray(b"BPS1" + _enc(len(source)) + _enc(len(target)) + _enc(0))
+    pos = src_rel = dst_rel = 0
+
+    def cmd(kind, length):
+        out.extend(_enc(((length - 1) << 2) | kind))
+
+    def rel(delta):
+        out.extend(_enc(abs(delta) << 1 | (delta < 0)))
+
+    for a, b in runs:
+        if a > pos:
+            cmd(0, a - pos)                                      # SourceRead
+        run = target[a:b]
+        if moved[0] <= a and b <= moved[0] + moved[2]:
+            src_at = moved[1] + (a - moved[0])
+            cmd(2, b - a); rel(src_at - src_rel); src_rel = src_at + (b - a)   # SourceCopy
+        elif _fill(run):
+            cmd(1, 1); out.append(run[0])                        # TargetRead de 1 byte...
+            cmd(3, b - a - 1); rel(a - dst_rel); dst_rel = a + (b - a - 1)     # ...e TargetCopy sobreposto
+        else:
+            cmd(1, b - a); out += run                            # TargetRead
+        pos = b
+    if pos < len(target):
+        cmd(0, len(target) - pos)
+    out += zlib.crc32(source).to_bytes(4, "little") + zlib.crc32(target).to_bytes(4, "little")
+    return bytes(out + zlib.crc32(out).to_bytes(4, "little"))
+
+def _merge(runs):
+    """Junta trechos que se tocam ou se sobrepõem."""
+    merged = []
+    for a, b in runs:
+        if merged and a <= merged[-1][1]:
+            merged[-1] = (merged[-1][0], max(b, merged[-1][1]))
+        else:
+            merged.append((a, b))
+    return merged
+
+def split_fill(runs, target: bytes):
+    """Separa o preenchimento 0xFF da expansão (vira RLE no IPS e TargetCopy no BPS)."""
+    out = []
+    for a, b in runs:
+        m = re.search(rb"\xff{4096,}", target[a:b])
+        if m:
+            out += [r for r in ((a, a + m.start()), (a + m.start(), a + m.end()), (a + m.end(), b)) if r[0] < r[1]]
+        else:
+            out.append((a, b))
+    return out
+
+# --- referência: um byte por iteração, como um port direto dos formatos ---
+
+def naive_ips(source: bytes, patch: bytes) -> bytearray:
+    out = bytearray(source)
+    p = 5
+    while patch[p:p + 3] != b"EOF":
+        off = (patch[p] << 16) | (patch[p + 1] << 8) | patch[p + 2]
+        size = (patch[p + 3] << 8) | patch[p + 4]
+        p += 5
+        rle = size == 0
+        if rle:
+            size = (patch[p] << 8) | patch[p + 1]
+        for i in range(size):
+            while off + i >= len(out):
+                out.append(0)
+            out[off + i] = patch[p + 2] if rle else patch[p + i]
+        p += 3 if rle else size
+    return out
+
+def naive_ups(source: bytes, patch: bytes) -> bytearray:
+    src_size, p = _varint(patch, 4)
+    dst_size, p = _varint(patch, p)
+    out = bytearray(dst_size)
+    for i in range(min(src_size, dst_size)):
+        out[i] = source[i]
+    pos, end = 0, len(patch) - 12
+    while p < end:
+        skip, p = _varint(patch, p)
+        pos += skip
+        while patch[p]:
+            out[pos] ^= patch[p]
+            pos += 1; p += 1
+        pos += 1; p += 1
+    return out
+
+def naive_bps(source: bytes, patch: bytes) -> bytearray:
+    _, p = _varint(patch, 4)
+    dst_size, p = _varint(patch, p)
+    meta, p = _varint(patch, p)
+    p += meta
+    out = bytearray(dst_size)
+    pos = src_rel = dst_rel = 0
+    end = len(patch) - 12
+    while p < end:
+        data, p = _varint(patch, p)
+        cmd, length = data & 3, (data >> 2) + 1
+        if cmd in (2, 3):
+            d, p = _varint(patch, p)
+            delta = -(d >> 1) if d & 1 else d >> 1
+        for _ in range(length):
+            if cmd == 0:
+                out[pos] = source[pos]
+            elif cmd == 1:
+                out[pos] = patch[p]; p += 1
+            elif cmd == 2:
+                if _ == 0:
+                    src_rel += delta
+                out[pos] = source[src_rel]; src_rel += 1
+            else:
+                if _ == 0:
+                    dst_rel += delta
+                out[pos] = out[dst_rel]; dst_rel += 1
+            pos += 1
+    return out
+
+def _time(fn, repeat: int) -> float:
+    samples = []
+    for _ in range(repeat):
+        t0 = time.perf_counter(); fn(); samples.append((time.perf_counter() - t0) * 1000)
+    return round(statistics.median(samples), 2)
+
+def naive_checksum(rom: bytes) -> int:
+    n = len(rom)
+    base = 1 << (n.bit_length() - 1)
+    rest = n - base
+    total = sum(rom[:base]) + (sum(rom[base:]) * (base // rest if rest and base % rest == 0 else 1))
+    return total & 0xFFFF
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--rom-mb", type=float, default=4)
+    ap.add_argument("--edits", type=int, default=3000)
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--naive-repeat", type=int, default=1, help="a referência é lenta; 0 pula")
+    args = ap.parse_args()
+
+    source, target, moved = make_pair(args.rom_mb, args.edits)
+    runs = split_fill(_merge(_runs(source, target)), target)
+    patches = {
+        "ips": make_ips(target, runs),
+        "ups": make_ups(source, target),
+        "bps": make_bps(source, target, moved, runs),
+    }
+    result = {"bench": "patches", "rom_mb": args.rom_mb, "target_mb": round(len(target) / (1024 * 1024), 2),
+              "edits": args.edits}
+    naive = {"ips": naive_ips, "ups": naive_ups, "bps": naive_bps}
+    for kind, patch in patches.items():
+        out = apply_patch(source, patch)
+        assert out == target, f"{kind}: resultado diferente"
+        row = {"patch_kb": round(len(patch) / 1024, 1), "buffer_ms": _time(lambda: apply_patch(source, patch), args.repeat)}
+        row["mb_per_s"] = round(len(target) / (1024 * 1024) / (row["buffer_ms"] / 1000), 1)
+        if args.naive_repeat:
+            assert naive[kind](source, patch) == target, f"{kind}: referência diferente"
+            row["naive_ms"] = _time(lambda: naive[kind](source, patch), args.naive_repeat)
+            row["speedup"] = round(row["naive_ms"] / row["buffer_ms"], 1)
+        result[kind] = row
+    assert rom_checksum(target) == naive_checksum(target), "checksum diferente"
+    row = {"sum_ms": _time(lambda: rom_checksum(target), args.repeat)}
+    if args.naive_repeat:
+        row["naive_ms"] = _time(lambda: naive_checksum(target), args.naive_repeat)
+        row["speedup"] = round(row["naive_ms"] / row["sum_ms"], 1)
+    result["checksum"] = row
+    print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
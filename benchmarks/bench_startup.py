@@ -0,0 +1,43 @@
+# benchmarks/bench_startup.py
+"""
+Partida a frio da CLI (python -m app) contra a da GUI (import app.gui +
+QApplication), cada uma num processo novo. Também confere que a CLI não
+carrega o PySide6.
+
+    python benchmarks/bench_startup.py --repeat 5
+"""
+import os, sys, json, time, argparse, statistics, subprocess
+
+SRC = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src")
+
+CASES = {
+    "cli_help": [sys.executable, "-m", "app", "--help"],
+    "cli_import_qt": [sys.executable, "-c",
+                      "import sys, app.cli, app.launcher; sys.exit('PySide6' in sys.modules)"],
+    "gui_import": [sys.executable, "-c",
+                   "from PySide6.QtWidgets import QApplication; import app.gui; QApplication([])"],
+}
+
+def _run(cmd) -> tuple[float, int]:
+    env = dict(os.environ, PYTHONPATH=SRC, QT_QPA_PLATFORM="offscreen")
+    t0 = time.perf_counter()
+    rc = subprocess.run(cmd, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL).returncode
+    return (time.perf_counter() - t0) * 1000, rc
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--repeat", type=int, default=5)
+    args = ap.parse_args()
+
+    result = {"bench": "startup"}
+    for name, cmd in CASES.items():
+        samples, rc = [], 0
+        for _ in range(args.repeat):
+            ms, rc = _run(cmd)
+            samples.append(ms)
+        result[name] = {"median_ms": round(statistics.median(samples), 1), "rc": rc}
+    result["cli_loads_qt"] = result["cli_import_qt"]["rc"] != 0
+    print(json.dumps(result))
+
+if __name__ == "__main__":
+    main()
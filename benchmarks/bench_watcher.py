@@ -0,0 +1,79 @@
+# benchmarks/bench_watcher.py
+"""
+Copia N arquivos para uma pasta Roms temporária enquanto o RomWatcher observa
+e conta quantas atualizações (rescans com Delta não vazio) a lista receberia.
+
+    python benchmarks/bench_watcher.py --files 1000
+"""
+import os, sys, json, time, shutil, tempfile, argparse, threading, logging
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PySide6.QtCore import QCoreApplication, QTimer
+from app.catalog import Catalog
+from app.watcher import RomWatcher
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=1000)
+    ap.add_argument("--burst", type=int, default=50, help="arquivos por rajada")
+    ap.add_argument("--pause-ms", type=int, default=20, help="pausa entre rajadas")
+    ap.add_argument("--poll", action="store_true", help="força modo polling")
+    args = ap.parse_args()
+
+    app = QCoreApplication(sys.argv)
+    tmp = tempfile.mkdtemp(prefix="snes_bench_")
+    root = os.path.join(tmp, "Roms"); os.makedirs(root)
+    cat = Catalog(os.path.join(tmp, "catalog.sqlite3"), root)
+    cat.rescan()
+
+    log = logging.getLogger("bench"); log.addHandler(logging.NullHandler())
+    w = RomWatcher(cat, log, poll_ms=500)
+    updates, entries = [], [0]
+    def _on_dirty():
+        delta = cat.rescan()
+        w.sync_paths()
+        if delta:
+            updates.append(time.perf_counter())
+            entries[0] += len(delta.added)
+    w.dirty.connect(_on_dirty)
+    if args.poll:
+        w._poll.start()
+    else:
+        w.start()
+
+    payload = b"\0" * 4096
+    def _copy():
+        for i in range(args.files):
+            with open(os.path.join(root, f"Jogo {i:05d} (USA).sfc"), "wb") as f:
+                f.write(payload)
+            if (i + 1) % args.burst == 0:
+                time.sleep(args.pause_ms / 1000.0)
+
+    t0 = time.perf_counter()
+    th = threading.Thread(target=_copy); th.start()
+
+    def _check():
+        if not th.is_alive() and entries[0] >= args.files:
+            app.quit()
+    timer = QTimer(); timer.timeout.connect(_check); timer.start(50)
+    guard = QTimer(); guard.setSingleShot(True); guard.timeout.connect(app.quit); guard.start(120000)
+    app.exec()
+    th.join()
+
+    result = {
+        "bench": "watcher",
+        "mode": "poll" if args.poll else "fsw",
+        "files": args.files,
+        "entries_seen": entries[0],
+        "ui_updates": len(updates),
+        "seconds": round(time.perf_counter() - t0, 3),
+    }
+    print(json.dumps(result))
+    w.stop(); cat.close()
+    timer.stop(); guard.stop()
+    shutil.rmtree(tmp, ignore_errors=True)
+
+if __name__ == "__main__":
+    main()
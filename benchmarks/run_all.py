@@ -0,0 +1,137 @@
+# benchmarks/run_all.py
+"""
+Roda a suíte (bench_library em vários tamanhos de biblioteca + os
+benchmarks rápidos de cada parte), cada um num processo novo, e junta as
+linhas JSON num arquivo com o commit, Python e plataforma. Com --compare,
+confronta com o arquivo de outro commit e aponta regressões:
+
+    python benchmarks/run_all.py --sizes 1000 10000 100000 --out antes.json
+    git checkout outro-commit
+    python benchmarks/run_all.py --sizes 1000 10000 100000 --out depois.json --compare antes.json
+
+Métricas comparadas: chaves terminadas em _ms (menor é melhor) e em
+per_s (maior é melhor), inclusive os valores dentro delas (filter_ms por
+consulta). Sai com código 1 se alguma piorar além do limiar.
+"""
+import os, sys, json, time, platform, argparse, subprocess
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+# Os benchmarks de cada parte, com argumentos de "rodada curta"
+QUICK = {
+    "conf": ["bench_conf.py", "--repeat", "200"],
+    "extract": ["bench_extract.py", "--members", "4", "--rom-mb", "2"],
+    "archives": ["bench_archives.py", "--rom-mb", "2", "--repeat", "3"],
+    "patches": ["bench_patches.py", "--rom-mb", "2", "--repeat", "3", "--naive-repeat", "0"],
+    "romheader": ["bench_romheader.py", "--files", "2000"],
+    "hashing": ["bench_hashing.py", "--files", "1000"],
+    "startup": ["bench_startup.py", "--repeat", "3"],
+}
+
+def _git(*args) -> str:
+    try:
+        return subprocess.run(["git", *args], cwd=HERE, capture_output=True, text=True, timeout=30).stdout.strip()
+    except Exception:
+        return ""
+
+def run_one(cmd: list, timeout: float) -> dict:
+    t0 = time.perf_counter()
+    env = dict(os.environ, QT_QPA_PLATFORM="offscreen")
+    p = subprocess.run([sys.executable, os.path.join(HERE, cmd[0])] + cmd[1:], capture_output=True,
+                       text=True, encoding="utf-8", errors="replace", timeout=timeout, env=env)
+    lines = [l for l in p.stdout.splitlines() if l.startswith("{")]
+    if p.returncode != 0 or not lines:
+        raise RuntimeError((p.stderr or p.stdout).strip()[-2000:] or f"código {p.returncode}")
+    out = json.loads(lines[-1])
+    out["wall_s"] = round(time.perf_counter() - t0, 1)
+    return out
+
+def flatten(d, prefix: str = "") -> dict:
+    out = {}
+    for k, v in d.items():
+        key = f"{prefix}.{k}" if prefix else str(k)
+        if isinstance(v, dict):
+            out.update(flatten(v, key))
+        elif isinstance(v, (int, float)) and not isinstance(v, bool):
+            out[key] = v
+    return out
+
+def compare(old: dict, new: dict, threshold: float, min_ms: float) -> list:
+    """[(métrica, antes, depois, variação)] do que mudou além do limiar; variação > 0 = pior."""
+    a, b = flatten(old.get("results", {})), flatten(new.get("results", {}))
+    rows = []
+    for key in sorted(a.keys() & b.keys()):
+        # a métrica é a chave mais interna com sufixo conhecido (gui.filter_ms.super -> filter_ms)
+        last = next((p for p in reversed(key.split(".")) if p.endswith(("_ms", "per_s"))), "")
+        x, y = a[key], b[key]
+        if last.endswith("_ms"):
+            if max(x, y) < min_ms or not x:
+                continue
+            change = y / x - 1
+        elif last.endswith("per_s"):
+            if not y:
+                continue
+            change = x / y - 1
+        else:
+            continue
+        if abs(change) >= threshold:
+            rows.append((key, x, y, change))
+    return rows
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--sizes", type=int, nargs="*", default=[1000, 10000], help="arquivos na biblioteca sintética")
+    ap.add_argument("--repeat", type=int, default=5)
+    ap.add_argument("--only", nargs="*", help=f"library e/ou {' '.join(QUICK)} (padrão: todos)")
+    ap.add_argument("--no-gui", action="store_true", help="bench_library sem Qt (só carregar_jogos/conf)")
+    ap.add_argument("--timeout", type=float, default=1800, help="segundos por benchmark")
+    ap.add_argument("--out", help="arquivo JSON de saída (padrão: só imprime)")
+    ap.add_argument("--compare", help="JSON de outro commit para comparar")
+    ap.add_argument("--threshold", type=float, default=0.15, help="variação relativa que conta como mudança")
+    ap.add_argument("--min-ms", type=float, default=2.0, help="ignora tempos abaixo disso (ruído)")
+    args = ap.parse_args()
+
+    jobs = {}
+    if not args.only or "library" in args.only:
+        for n in args.sizes:
+            jobs[f"library_{n}"] = ["bench_library.py", "--files", str(n), "--repeat", str(args.repeat)] + \
+                                   (["--no-gui"] if args.no_gui else [])
+    for name, cmd in QUICK.items():
+        if not args.only or name in args.only:
+            jobs[name] = cmd
+
+    commit = _git("rev-parse", "--short", "HEAD")
+    report = {"commit": commit + ("-dirty" if _git("status", "--porcelain", "--untracked-files=no") else ""),
+              "subject": _git("log", "-1", "--format=%s"), "date": time.strftime("%Y-%m-%dT%H:%M:%S"),
+              "python": platform.python_version(), "platform": platform.platform(), "cpus": os.cpu_count(),
+              "results": {}, "errors": {}}
+    for name, cmd in jobs.items():
+        print(f"{name}...", file=sys.stderr, flush=True)
+        try:
+            report["results"][name] = run_one(cmd, args.timeout)
+        except Exception as e:
+            report["errors"][name] = str(e)
+            print(f"  FALHA: {str(e).splitlines()[-1] if str(e) else e}", file=sys.stderr)
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            f.write(text + "\n")
+        print(f"resultados em {args.out}", file=sys.stderr)
+    else:
+        print(text)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            old = json.load(f)
+        rows = compare(old, report, args.threshold, args.min_ms)
+        print(f"\n{old.get('commit', '?')} -> {report['commit']} (limiar {args.threshold:.0%})", file=sys.stderr)
+        for key, x, y, change in sorted(rows, key=lambda r: -r[3]):
+            print(f"  {'PIOR ' if change > 0 else 'melhor'} {change:+7.1%}  {key}: {x} -> {y}", file=sys.stderr)
+        if not rows:
+            print("  nada mudou além do limiar", file=sys.stderr)
+        return 1 if any(r[3] > 0 for r in rows) else 0
+    return 1 if report["errors"] else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
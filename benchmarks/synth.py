@@ -0,0 +1,150 @@
+# benchmarks/synth.py
+"""
+Bibliotecas sintéticas para os benchmarks: N arquivos em pastas aninhadas
+(coleção/letra), mistura de ROMs soltas (.sfc, .smc com cabeçalho de
+copiadora), ZIPs de uma ROM e ZIPs com vários membros (regiões/revisões e
+um leia-me), todas com cabeçalho interno de SNES plausível: LoROM/HiROM,
+FastROM, SA-1/DSP/SuperFX, regiões variadas e checksum que confere.
+
+Determinístico pela semente: a mesma chamada gera a mesma árvore, então os
+números são comparáveis entre commits. As ROMs soltas são esparsas
+(truncate) onde o sistema de arquivos permite: 100k x 64 KiB não ocupam
+6 GB de fato.
+
+    python benchmarks/synth.py --files 10000 --out /tmp/Roms
+"""
+import os, sys, json, time, random, struct, zipfile, argparse
+
+COPIER = 512
+WORDS = ("Super", "Mega", "Dragon", "Quest", "Star", "Fighter", "Legend", "Chrono", "Mario", "Kart",
+         "Final", "Fantasy", "Street", "Donkey", "Kong", "Country", "Metroid", "Zelda", "Secret",
+         "Mana", "Castle", "Vania", "Ninja", "Turtles", "Racing", "Soccer", "World", "Cup", "Tales",
+         "Fire", "Emblem", "Breath", "Ogre", "Battle", "Tactics", "Wings", "Pilot", "Pocket", "Demon")
+REGIONS = (("USA", 1), ("Europe", 2), ("Japan", 0), ("Brazil", 16), ("Germany", 9), ("France", 6))
+# (map_mode, cart_type, hirom): LoROM, FastROM, HiROM, SA-1, DSP, SuperFX
+CARTS = ((0x20, 0x02, False), (0x30, 0x02, False), (0x21, 0x02, True), (0x31, 0x02, True),
+         (0x23, 0x35, False), (0x20, 0x03, False), (0x20, 0x15, False))
+DEFAULT_MIX = {"sfc": 0.45, "smc": 0.2, "zip": 0.25, "multi": 0.1}
+
+def make_header(title: str, hirom: bool, region: int, rom_kb: int = 512,
+                map_mode: int = None, cart: int = 0x02) -> bytes:
+    """Cabeçalho interno (0x40 bytes); o checksum confere com uma ROM zerada de `rom_kb` contendo só ele."""
+    h = bytearray(0x40)
+    h[:21] = title.encode("ascii", "replace")[:21].ljust(21)
+    h[0x15] = map_mode if map_mode is not None else (0x31 if hirom else 0x20)
+    h[0x16] = cart
+    h[0x17] = max(rom_kb.bit_length() - 1, 0x07)
+    h[0x18] = 0x03
+    h[0x19] = region
+    h[0x3C:0x3E] = struct.pack("<H", 0x8000)
+    # Soma dos bytes da ROM = soma do cabeçalho; checksum + complemento somam sempre 0x1FE
+    checksum = (sum(h) + 0x1FE) & 0xFFFF
+    h[0x1C:0x20] = struct.pack("<HH", checksum ^ 0xFFFF, checksum)
+    return bytes(h)
+
+def rom_image(header: bytes, hirom: bool, rom_kb: int, copier: bool = False) -> bytes:
+    data = bytearray(rom_kb * 1024 + (COPIER if copier else 0))
+    at = (COPIER if copier else 0) + (0xFFC0 if hirom else 0x7FC0)
+    data[at:at + 0x40] = header
+    return bytes(data)
+
+def write_rom(path: str, header: bytes, hirom: bool, rom_kb: int, copier: bool = False) -> None:
+    """Mesma imagem de rom_image(), mas esparsa: só o cabeçalho é escrito."""
+    with open(path, "wb") as f:
+        f.truncate(rom_kb * 1024 + (COPIER if copier else 0))
+        f.seek((COPIER if copier else 0) + (0xFFC0 if hirom else 0x7FC0))
+        f.write(header)
+
+def rom_bytes(size: int, seed: int = 0) -> bytes:
+    """Conteúdo para extração: metade aleatório (código/gráficos), metade tabelas repetidas (~2x no deflate)."""
+    rnd = random.Random(seed)
+    pattern = bytes((j * 13 + seed) & 0x3F for j in range(16384))
+    out = bytearray()
+    while len(out) < size:
+        out += rnd.randbytes(16384) + pattern
+    return bytes(out[:size])
+
+def _title(rnd: random.Random) -> str:
+    words = rnd.sample(WORDS, rnd.choice((1, 2, 2, 3)))
+    if rnd.random() < 0.3:
+        words.append(rnd.choice(("II", "III", "IV", "2", "3", "64")))
+    return " ".join(words)
+
+def _pick(rnd: random.Random, mix: dict) -> str:
+    x, acc = rnd.random(), 0.0
+    for kind, frac in mix.items():
+        acc += frac
+        if x < acc:
+            return kind
+    return kind
+
+def make_library(root: str, files: int, rom_kb: int = 64, mix: dict = None, per_collection: int = 2000,
+                 seed: int = 1) -> dict:
+    """
+    Gera `files` arquivos em root/Coleção NN/<letra do título>/, uma coleção
+    nova a cada `per_collection`. Retorna a contagem por tipo, pastas e o
+    tempo de geração.
+    """
+    t0 = time.perf_counter()
+    rnd = random.Random(seed)
+    mix = mix or DEFAULT_MIX
+    counts = dict.fromkeys(mix, 0)
+    dirs, used = set(), set()
+    for i in range(files):
+        title = _title(rnd)
+        region, code = rnd.choice(REGIONS)
+        name = f"{title} ({region})"
+        if rnd.random() < 0.1:
+            name += f" (Rev {rnd.randint(1, 3)})"
+        sub = os.path.join(root, f"Coleção {i // per_collection:02d}", title[0])
+        while (sub, name) in used:
+            name += f" [{i}]"
+        used.add((sub, name))
+        if sub not in dirs:
+            os.makedirs(sub, exist_ok=True)
+            dirs.add(sub)
+        map_mode, cart, hirom = rnd.choice(CARTS)
+        header = make_header(title.upper(), hirom, code, rom_kb, map_mode, cart)
+        kind = _pick(rnd, mix)
+        counts[kind] += 1
+        base = os.path.join(sub, name)
+        if kind in ("sfc", "smc"):
+            write_rom(base + "." + kind, header, hirom, rom_kb, copier=kind == "smc")
+        elif kind == "zip":
+            with zipfile.ZipFile(base + ".zip", "w", zipfile.ZIP_DEFLATED) as z:
+                z.writestr(name + ".sfc", rom_image(header, hirom, rom_kb))
+        else:
+            with zipfile.ZipFile(base + ".zip", "w", zipfile.ZIP_DEFLATED) as z:
+                for r, c in rnd.sample(REGIONS, rnd.randint(2, 4)):
+                    z.writestr(f"{title} ({r}).sfc", rom_image(make_header(title.upper(), hirom, c, rom_kb,
+                                                                           map_mode, cart), hirom, rom_kb))
+                z.writestr("leia-me.txt", f"{title}\n")
+    return {"files": files, "dirs": len(dirs), "rom_kb": rom_kb, **counts,
+            "ms": round((time.perf_counter() - t0) * 1000, 1)}
+
+def make_zip(path: str, members: int, rom_mb: float) -> list[str]:
+    """Um ZIP com `members` ROMs grandes (extração do launcher)."""
+    names = []
+    size = int(rom_mb * 1024 * 1024)
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as zf:
+        for i in range(members):
+            n = f"Jogo {i:02d} (USA).sfc"
+            data = bytearray(rom_bytes(size, i))
+            data[0x7FC0:0x8000] = make_header(f"JOGO {i:02d}", False, 1, max(size // 1024, 128))
+            zf.writestr(n, bytes(data))
+            names.append(n)
+    return names
+
+def main():
+    ap = argparse.ArgumentParser()
+    ap.add_argument("--files", type=int, default=10000)
+    ap.add_argument("--rom-kb", type=int, default=64)
+    ap.add_argument("--seed", type=int, default=1)
+    ap.add_argument("--out", required=True, help="pasta Roms a criar")
+    args = ap.parse_args()
+    if os.path.exists(args.out) and os.listdir(args.out):
+        sys.exit(f"{args.out} já existe e não está vazia")
+    print(json.dumps(make_library(args.out, args.files, args.rom_kb, seed=args.seed)))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+# src/app/archives.py
+"""
+Contêineres de ROM: ZIP, 7z (py7zr, opcional), e ROMs soltas comprimidas
+(.sfc.gz, .smc.bz2, .sfc.xz...). Cada formato é uma subclasse de Archive
+registrada por extensão; quem usa (catálogo, listagem da GUI, extração,
+cabeçalhos, hashes) só fala com open_archive():
+
+    with open_archive(path) as ar:
+        nome = ar.pick(None)                 # primeira ROM
+        ar.copy(nome, arquivo_destino)       # descompressão em streaming
+
+Tudo é lido em blocos de `chunk` bytes (por formato), nunca o membro
+inteiro na memória. copy() registra bytes/tempo por formato: throughput()
+diz quantos MiB/s cada um entrega (verify da CLI e benchmarks/bench_archives.py).
+"""
+import os, time, zlib, zipfile, threading
+from typing import Callable, NamedTuple, Optional
+
+from app.jobs import Cancelled
+
+ROM_EXTS = (".sfc", ".smc", ".fig", ".swc")
+
+class BadArchive(zipfile.BadZipFile):
+    """Contêiner corrompido (qualquer formato). Herda de BadZipFile: quem já tratava ZIP ruim trata todos."""
+
+class Member(NamedTuple):
+    name: str
+    size: Optional[int]      # descomprimido; None quando o formato não guarda (bz2/xz)
+
+class _Enough(Exception):
+    """Interrompe um stream quando read() já tem o que precisa."""
+
+class Archive:
+    kind = ""
+    exts: tuple = ()
+    chunk = 1024 * 1024
+
+    def __init__(self, path: str):
+        self.path = path
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self) -> None:
+        pass
+
+    def members(self) -> list[Member]:
+        raise NotImplementedError
+
+    def _stream(self, name: str, sink: Callable, cancel, chunk: int) -> int:
+        raise NotImplementedError
+
+    def roms(self) -> list[Member]:
+        return [m for m in self.members() if m.name.lower().endswith(ROM_EXTS)]
+
+    def pick(self, name: Optional[str]) -> str:
+        """`name` se veio da GUI, senão a primeira ROM (a mesma que o launcher sempre abriu)."""
+        if name:
+            return name
+        roms = self.roms()
+        if not roms:
+            raise RuntimeError(f"{self.kind.upper()} válido, mas sem ROM {'/'.join(ROM_EXTS)}")
+        return roms[0].name
+
+    def size_of(self, name: str) -> Optional[int]:
+        for m in self.members():
+            if m.name == name:
+                return m.size
+        raise KeyError(name)
+
+    def stream(self, name: str, sink: Callable, cancel=None, chunk: Optional[int] = None) -> int:
+        """Chama sink(bloco) com o membro descomprimido. Cancelled se `cancel` for sinalizado; retorna bytes."""
+        def _sink(buf):
+            if cancel is not None and cancel.is_set():
+                raise Cancelled(name)
+            sink(buf)
+        return self._stream(name, _sink, cancel, chunk or self.chunk)
+
+    def copy(self, name: str, dst, cancel=None, chunk: Optional[int] = None) -> int:
+        """Descomprime `name` para o arquivo aberto `dst` e registra o throughput do formato."""
+        t0 = time.perf_counter()
+        n = self.stream(name, dst.write, cancel, chunk)
+        record(self.kind, n, time.perf_counter() - t0)
+        return n
+
+    def read(self, name: str, limit: int) -> tuple[bytes, int]:
+        """
+        Primeiros `limit` bytes do membro e o tamanho total. Se o formato
+        sabe o tamanho, para de descomprimir no limite; senão descomprime
+        até o fim só contando (a memória continua limitada a `limit`).
+        """
+        size = self.size_of(name)
+        buf, total = bytearray(), [0]
+
+        def _sink(b):
+            if len(buf) < limit:
+                buf.extend(b[:limit - len(buf)])
+            total[0] += len(b)
+            if size is not None and len(buf) >= limit:
+                raise _Enough()
+        try:
+            self._stream(name, _sink, None, min(self.chunk or limit, limit))
+        except _Enough:
+            pass
+        return bytes(buf), size if size is not None else total[0]
+
+    def test(self, name: str) -> int:
+        """Descomprime `name` inteiro conferindo a integridade (o que o formato tiver: CRC)."""
+        t0 = time.perf_counter()
+        n = self._stream(name, lambda b: None, None, self.chunk)
+        record(self.kind, n, time.perf_counter() - t0)
+        return n
+
+class ZipArchive(Archive):
+    kind = "zip"
+    exts = (".zip",)
+
+    def __init__(self, path: str):
+        super().__init__(path)
+        self._zf = zipfile.ZipFile(path, "r")
+
+    def close(self) -> None:
+        self._zf.close()
+
+    def members(self) -> list[Member]:
+        return [Member(i.filename, i.file_size) for i in self._zf.infolist() if not i.is_dir()]
+
+    def size_of(self, name: str) -> Optional[int]:
+        return self._zf.getinfo(name).file_size
+
+    def _stream(self, name, sink, cancel, chunk) -> int:
+        # CRC32 conferido no caminho: cada byte é inflado uma vez (sem testzip())
+        info = self._zf.getinfo(name)
+        crc, total = 0, 0
+        with self._zf.open(info) as src:
+            while True:
+                buf = src.read(chunk)
+                if not buf:
+                    break
+                crc = zlib.crc32(buf, crc)
+                sink(buf)
+                total += len(buf)
+        if crc != info.CRC or total != info.file_size:
+            raise BadArchive(f"Entrada corrompida no ZIP: {name}")
+        return total
+
+class SevenZipArchive(Archive):
+    """7z via py7zr (opcional: sem ele, abrir um .7z levanta ModuleNotFoundError)."""
+    kind = "7z"
+    exts = (".7z",)
+    chunk = 0   # o py7zr entrega os blocos do tamanho dele (~2 MiB)
+
+    def __init__(self, path: str):
+        import py7zr
+        super().__init__(path)
+        self._py7zr = py7zr
+        try:
+            self._z = py7zr.SevenZipFile(path, "r")
+        except py7zr.Bad7zFile as e:
+            raise BadArchive(f"7z inválido: {e}") from e
+        self._members = [Member(f.filename, f.uncompressed) for f in self._z.list() if not f.is_directory]
+
+    def close(self) -> None:
+        self._z.close()
+
+    def members(self) -> list[Member]:
+        return list(self._members)
+
+    def _stream(self, name, sink, cancel, chunk) -> int:
+        from py7zr.io import Py7zIO, WriterFactory
+        total = [0]
+
+        class _Writer(Py7zIO):
+            def write(self, b):
+                sink(bytes(b))
+                total[0] += len(b)
+                return len(b)
+            def read(self, size=None): return b""
+            def seek(self, offset, whence=0): return 0
+            def flush(self): pass
+            def size(self): return total[0]
+
+        class _Factory(WriterFactory):
+            def create(self, filename):
+                return _Writer()
+
+        try:
+            self._z.extract(targets=[name], factory=_Factory())
+        except (self._py7zr.Bad7zFile, self._py7zr.exceptions.CrcError) as e:
+            raise BadArchive(f"Entrada corrompida no 7z: {name}") from e
+        finally:
+            self._z.reset()
+        return total[0]
+
+class _SingleArchive(Archive):
+    """Uma ROM comprimida sozinha: o membro é o nome sem a extensão de compressão."""
+    _errors: tuple = ()
+
+    def _open(self):
+        raise NotImplementedError
+
+    def members(self) -> list[Member]:
+        name = os.path.basename(self.path)[:-len(self.exts[0])]
+        return [Member(name, self.size_of(name))]
+
+    def size_of(self, name: str) -> Optional[int]:
+        return None
+
+    def _stream(self, name, sink, cancel, chunk) -> int:
+        total = 0
+        try:
+            with self._open() as src:
+                while True:
+                    buf = src.read(chunk)
+                    if not buf:
+                        break
+                    sink(buf)
+                    total += len(buf)
+        except (EOFError,) + self._errors as e:
+            raise BadArchive(f"{self.kind} inválido ou truncado: {e}") from e
+        return total
+
+class GzipArchive(_SingleArchive):
+    kind = "gz"
+    exts = (".gz",)
+    chunk = 256 * 1024
+
+    def _open(self):
+        import gzip
+        return gzip.open(self.path, "rb")
+
+    @property
+    def _errors(self):
+        import gzip
+        return (gzip.BadGzipFile, zlib.error)
+
+    def size_of(self, name: str) -> Optional[int]:
+        # ISIZE (últimos 4 bytes): tamanho descomprimido mod 2^32, de sobra para ROMs
+        with open(self.path, "rb") as f:
+            f.seek(-4, os.SEEK_END)
+            return int.from_bytes(f.read(4), "little")
+
+class Bz2Archive(_SingleArchive):
+    kind = "bz2"
+    exts = (".bz2",)
+    chunk = 900 * 1024      # um bloco bzip2 (nível 9)
+    _errors = (OSError,)
+
+    def _open(self):
+        import bz2
+        return bz2.open(self.path, "rb")
+
+class XzArchive(_SingleArchive):
+    kind = "xz"
+    exts = (".xz",)
+
+    def _open(self):
+        import lzma
+        return lzma.open(self.path, "rb")
+
+    @property
+    def _errors(self):
+        import lzma
+        return (lzma.LZMAError,)
+
+BACKENDS: list = [ZipArchive, SevenZipArchive, GzipArchive, Bz2Archive, XzArchive]
+
+def register(cls) -> None:
+    """Adiciona (ou substitui, pela `kind`) um formato."""
+    BACKENDS[:] = [b for b in BACKENDS if b.kind != cls.kind] + [cls]
+
+def backend_for(name: str):
+    fl = name.lower()
+    for cls in BACKENDS:
+        if fl.endswith(cls.exts):
+            # comprimido solto só conta se for uma ROM (jogo.sfc.gz, não notas.txt.gz)
+            if issubclass(cls, _SingleArchive) and not fl[:-len(cls.exts[0])].endswith(ROM_EXTS):
+                return None
+            return cls
+    return None
+
+def is_archive(name: str) -> bool:
+    return backend_for(name) is not None
+
+def open_archive(path: str) -> Archive:
+    cls = backend_for(path)
+    if cls is None:
+        raise BadArchive(f"Formato de arquivo não suportado: {os.path.basename(path)}")
+    return cls(path)
+
+def stem(name: str) -> str:
+    """Nome do jogo: sem pasta, sem compressão solta e sem a extensão da ROM/contêiner."""
+    base = os.path.basename(name)
+    cls = backend_for(base)
+    if cls is not None and issubclass(cls, _SingleArchive):
+        base = base[:-len(cls.exts[0])]
+    return os.path.splitext(base)[0]
+
+_stats_lock = threading.Lock()
+_stats: dict = {}   # kind -> [membros, bytes, segundos]
+
+def record(kind: str, nbytes: int, seconds: float) -> None:
+    with _stats_lock:
+        s = _stats.setdefault(kind, [0, 0, 0.0])
+        s[0] += 1
+        s[1] += nbytes
+        s[2] += seconds
+
+def throughput() -> dict:
+    """{formato: {"count", "bytes", "ms", "mb_per_s"}} do que foi descomprimido neste processo."""
+    with _stats_lock:
+        return {k: {"count": n, "bytes": b, "ms": round(sec * 1000, 1),
+                    "mb_per_s": round(b / (1024 * 1024) / sec, 1) if sec else 0.0}
+                for k, (n, b, sec) in sorted(_stats.items())}
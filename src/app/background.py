@@ -0,0 +1,99 @@
+# src/app/background.py
+from collections import OrderedDict
+from typing import Optional
+from PySide6.QtCore import Qt, QTimer, QSize, QRect
+from PySide6.QtGui import QPainter, QPixmap, QLinearGradient, QColor
+from PySide6.QtWidgets import QWidget
+
+class BackgroundWidget(QWidget):
+    """
+    Widget central que pinta o fundo direto no paintEvent (sem QLabel).
+
+    - a imagem é decodificada uma vez (set_pixmap) e cada tamanho de janela
+      ganha uma versão escalada (suave), guardada num LRU pequeno: alternar
+      tela cheia/janela não reescala de novo;
+    - durante o redimensionamento ao vivo usa uma escala rápida
+      (FastTransformation) e só faz a suave quando o tamanho para de mudar
+      por `settle_ms`;
+    - preenche a área mantendo a proporção (corta o excesso, centralizado);
+    - sem imagem, pinta o gradiente escuro padrão.
+    """
+
+    def __init__(self, parent=None, cache_size: int = 4, settle_ms: int = 150):
+        super().__init__(parent)
+        self._source: Optional[QPixmap] = None
+        self._cache: "OrderedDict[tuple, QPixmap]" = OrderedDict()
+        self._cache_size = cache_size
+        self._fast: Optional[tuple] = None   # (tamanho, pixmap) provisório
+        self._settle = QTimer(self)
+        self._settle.setSingleShot(True)
+        self._settle.setInterval(settle_ms)
+        self._settle.timeout.connect(self._on_settled)
+        self.setAttribute(Qt.WA_OpaquePaintEvent, True)
+
+    def set_pixmap(self, pixmap: Optional[QPixmap]) -> None:
+        self._source = pixmap if pixmap is not None and not pixmap.isNull() else None
+        self._cache.clear()
+        self._fast = None
+        self.update()
+
+    def has_image(self) -> bool:
+        return self._source is not None
+
+    def _key(self, size: QSize) -> tuple:
+        dpr = self.devicePixelRatioF()
+        return (round(size.width() * dpr), round(size.height() * dpr))
+
+    def _scaled(self, key: tuple, mode) -> QPixmap:
+        pm = self._source.scaled(QSize(*key), Qt.KeepAspectRatioByExpanding, mode)
+        pm.setDevicePixelRatio(self.devicePixelRatioF())
+        return pm
+
+    def _smooth_for(self, key: tuple) -> QPixmap:
+        pm = self._cache.get(key)
+        if pm is not None:
+            self._cache.move_to_end(key)
+            return pm
+        pm = self._cache[key] = self._scaled(key, Qt.SmoothTransformation)
+        while len(self._cache) > self._cache_size:
+            self._cache.popitem(last=False)
+        return pm
+
+    def cached_sizes(self) -> list:
+        return list(self._cache)
+
+    def resizeEvent(self, ev):
+        super().resizeEvent(ev)
+        if self._source is not None and self._key(self.size()) not in self._cache:
+            self._settle.start()  # reinicia a cada evento: suave só quando parar
+
+    def _on_settled(self):
+        self._fast = None
+        self.update()
+
+    def paintEvent(self, ev):
+        p = QPainter(self)
+        r = self.rect()
+        if self._source is None:
+            g = QLinearGradient(0, 0, r.width(), r.height())
+            g.setColorAt(0, QColor("#1b1b1b"))
+            g.setColorAt(1, QColor("#0f0f0f"))
+            p.fillRect(r, g)
+            return
+        key = self._key(r.size())
+        pm = self._cache.get(key)
+        if pm is not None:
+            self._cache.move_to_end(key)
+        elif self._settle.isActive():
+            # Arrastando a borda: escala rápida, refeita só se o tamanho mudou
+            if self._fast is None or self._fast[0] != key:
+                self._fast = (key, self._scaled(key, Qt.FastTransformation))
+            pm = self._fast[1]
+        else:
+            pm = self._smooth_for(key)
+        # Centraliza o excesso (proporção mantida, sem distorcer)
+        dpr = pm.devicePixelRatio()
+        w, h = pm.width() / dpr, pm.height() / dpr
+        src = QRect(int((w - r.width()) / 2 * dpr), int((h - r.height()) / 2 * dpr),
+                    round(r.width() * dpr), round(r.height() * dpr))
+        p.drawPixmap(r, pm, src)
@@ -0,0 +1,371 @@
+import os, json, sqlite3, threading
+from typing import NamedTuple, Optional
+from .paths import rom_root, save_dir
+from .archives import ROM_EXTS, BACKENDS, is_archive, stem
+from .patches import PATCH_EXTS
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS meta (
+    key   TEXT PRIMARY KEY,
+    value TEXT
+);
+CREATE TABLE IF NOT EXISTS dirs (
+    rel_dir  TEXT PRIMARY KEY,
+    parent   TEXT,
+    mtime_ns INTEGER
+);
+CREATE TABLE IF NOT EXISTS files (
+    rel_path TEXT PRIMARY KEY,
+    rel_dir  TEXT NOT NULL,
+    tipo     TEXT NOT NULL,
+    size     INTEGER,
+    mtime_ns INTEGER,
+    sort_key TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS zip_members (
+    rel_path TEXT PRIMARY KEY,
+    size     INTEGER,
+    mtime_ns INTEGER,
+    members  TEXT
+);
+CREATE TABLE IF NOT EXISTS rom_headers (
+    rel_path    TEXT PRIMARY KEY,
+    size        INTEGER,
+    mtime_ns    INTEGER,
+    title       TEXT,
+    mapping     TEXT,
+    region      TEXT,
+    coprocessor TEXT,
+    info        TEXT
+);
+CREATE TABLE IF NOT EXISTS rom_hashes (
+    rel_path     TEXT PRIMARY KEY,
+    size         INTEGER,
+    mtime_ns     INTEGER,
+    member       TEXT,
+    payload_size INTEGER,
+    crc32        TEXT,
+    sha1         TEXT,
+    erro         TEXT
+);
+CREATE INDEX IF NOT EXISTS rom_hashes_sha1 ON rom_hashes(sha1);
+CREATE INDEX IF NOT EXISTS rom_hashes_crc32 ON rom_hashes(crc32);
+CREATE INDEX IF NOT EXISTS files_dir ON files(rel_dir);
+CREATE INDEX IF NOT EXISTS files_sort ON files(sort_key);
+"""
+
+def catalog_path(save_path: str) -> str:
+    return os.path.join(save_path, "catalog.sqlite3")
+
+def classificar(nome: str) -> Optional[str]:
+    """
+    Retorna "zip" (qualquer contêiner de app.archives: .zip, .7z, .sfc.gz...),
+    "rom", "patch" (IPS/BPS/UPS, ver app.patches) ou None (arquivo ignorado)
+    a partir da extensão.
+    """
+    if is_archive(nome):
+        return "zip"
+    fl = nome.lower()
+    if fl.endswith(ROM_EXTS):
+        return "rom"
+    if fl.endswith(PATCH_EXTS):
+        return "patch"
+    return None
+
+def _exts_key() -> str:
+    return ",".join(ROM_EXTS + PATCH_EXTS + tuple(e for b in BACKENDS for e in b.exts))
+
+def sort_key(rel_path: str) -> str:
+    """Chave de ordenação: nome do jogo (sem extensão nem compressão), minúsculo."""
+    return stem(rel_path).lower()
+
+class Delta(NamedTuple):
+    """
+    Diferenças de uma varredura incremental. Cada lista contém tuplas
+    (tipo, caminho_relativo), no mesmo formato de carregar_jogos().
+    """
+    added: list
+    removed: list
+    modified: list
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed or self.modified)
+
+class Catalog:
+    """
+    Catálogo persistente (SQLite) das ROMs em rom_root().
+
+    Guarda, por caminho relativo, tipo/tamanho/mtime de cada arquivo e o
+    mtime de cada pasta. Uma nova varredura só lista (scandir) as pastas
+    cujo mtime mudou; nas demais apenas confere as subpastas já conhecidas.
+    """
+
+    def __init__(self, db_path: Optional[str] = None, root: Optional[str] = None):
+        self.root = root or rom_root()
+        if db_path is None:
+            os.makedirs(save_dir(), exist_ok=True)
+            db_path = catalog_path(save_dir())
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._db = sqlite3.connect(db_path, check_same_thread=False)
+        self._db.executescript(_SCHEMA)
+        self._check_root()
+
+    def _check_root(self) -> None:
+        # Se a pasta Roms mudou de lugar, o catálogo antigo não vale mais
+        root = os.path.normcase(os.path.abspath(self.root))
+        exts = _exts_key()
+        with self._lock, self._db:
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'root'").fetchone()
+            if not row or row[0] != root:
+                self._db.execute("DELETE FROM files")
+                self._db.execute("DELETE FROM dirs")
+                self._db.execute("DELETE FROM zip_members")
+                self._db.execute("DELETE FROM rom_headers")
+                self._db.execute("DELETE FROM rom_hashes")
+                self._db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('root', ?)", (root,))
+            # Formatos reconhecidos mudaram: toda pasta precisa ser relistada uma vez
+            # (sem o mtime delas as intocadas seriam puladas e os arquivos novos nunca apareceriam)
+            row = self._db.execute("SELECT value FROM meta WHERE key = 'exts'").fetchone()
+            if not row or row[0] != exts:
+                self._db.execute("DELETE FROM dirs")
+                self._db.execute("INSERT OR REPLACE INTO meta(key, value) VALUES ('exts', ?)", (exts,))
+
+    def close(self) -> None:
+        with self._lock:
+            try: self._db.close()
+            except Exception: pass
+
+    def dirs(self) -> list[str]:
+        """Caminhos absolutos de todas as pastas conhecidas (raiz inclusa)."""
+        with self._lock:
+            rows = self._db.execute("SELECT rel_dir FROM dirs").fetchall()
+        return [os.path.join(self.root, d) if d else self.root for (d,) in rows]
+
+    def entries(self) -> list[tuple[str, str]]:
+        """Lista (tipo, caminho_relativo) já ordenada, direto do catálogo (sem tocar no disco)."""
+        with self._lock:
+            rows = self._db.execute("SELECT tipo, rel_path FROM files ORDER BY sort_key, rel_path").fetchall()
+        return [(t, p) for t, p in rows]
+
+    def get_zip_members(self, rel_path: str, size: int, mtime_ns: int) -> Optional[list[str]]:
+        """ROMs dentro do ZIP, se já listadas para este (tamanho, mtime); senão None."""
+        with self._lock:
+            row = self._db.execute(
+                "SELECT members FROM zip_members WHERE rel_path = ? AND size = ? AND mtime_ns = ?",
+                (rel_path, size, mtime_ns)).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def put_zip_members(self, rel_path: str, size: int, mtime_ns: int, members: list[str]) -> None:
+        with self._lock, self._db:
+            self._db.execute(
+                "INSERT OR REPLACE INTO zip_members(rel_path, size, mtime_ns, members) VALUES (?, ?, ?, ?)",
+                (rel_path, size, mtime_ns, json.dumps(members, ensure_ascii=False)))
+
+    def stale_headers(self) -> list[tuple[str, str, int, int]]:
+        """(rel_path, tipo, size, mtime_ns) das ROMs sem cabeçalho lido para o tamanho/mtime atual (patches não entram)."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT f.rel_path, f.tipo, f.size, f.mtime_ns FROM files f "
+                "LEFT JOIN rom_headers h ON h.rel_path = f.rel_path "
+                "WHERE f.tipo != 'patch' AND "
+                "(h.rel_path IS NULL OR h.size != f.size OR h.mtime_ns != f.mtime_ns)").fetchall()
+
+    def put_headers(self, rows) -> None:
+        """rows: (rel_path, size, mtime_ns, info); info com "erro" fica gravado para não reler até mudar."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO rom_headers(rel_path, size, mtime_ns, title, mapping, region, coprocessor, info) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(rel, size, mtime_ns, info.get("title"), info.get("mapping"), info.get("region"),
+                  info.get("coprocessor"), json.dumps(info, ensure_ascii=False))
+                 for rel, size, mtime_ns, info in rows])
+
+    def clear_headers(self) -> None:
+        with self._lock, self._db:
+            self._db.execute("DELETE FROM rom_headers")
+
+    def headers(self) -> dict[str, dict]:
+        """{rel_path: cabeçalho} dos arquivos com cabeçalho reconhecido."""
+        with self._lock:
+            rows = self._db.execute("SELECT rel_path, info FROM rom_headers WHERE mapping IS NOT NULL").fetchall()
+        return {p: json.loads(i) for p, i in rows}
+
+    def stale_hashes(self) -> list[tuple[str, str, int, int]]:
+        """(rel_path, tipo, size, mtime_ns) das ROMs sem hash para o tamanho/mtime atual (patches não entram)."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT f.rel_path, f.tipo, f.size, f.mtime_ns FROM files f "
+                "LEFT JOIN rom_hashes h ON h.rel_path = f.rel_path "
+                "WHERE f.tipo != 'patch' AND "
+                "(h.rel_path IS NULL OR h.size != f.size OR h.mtime_ns != f.mtime_ns)").fetchall()
+
+    def put_hashes(self, rows) -> None:
+        """rows: (rel_path, size, mtime_ns, info) com info de app.hashing.hash_payload (ou {"erro": ...})."""
+        with self._lock, self._db:
+            self._db.executemany(
+                "INSERT OR REPLACE INTO rom_hashes(rel_path, size, mtime_ns, member, payload_size, crc32, sha1, erro) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [(rel, size, mtime_ns, info.get("member"), info.get("size"), info.get("crc32"),
+                  info.get("sha1"), info.get("erro")) for rel, size, mtime_ns, info in rows])
+
+    def hashes(self) -> dict[str, dict]:
+        """{rel_path: {"crc32", "sha1", "size", "member"}} dos arquivos já hasheados."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT rel_path, crc32, sha1, payload_size, member FROM rom_hashes WHERE sha1 IS NOT NULL").fetchall()
+        return {p: {"crc32": c, "sha1": s, "size": n, "member": m} for p, c, s, n, m in rows}
+
+    def find_by_sort_key(self, key: str) -> list[tuple[str, str]]:
+        """(tipo, rel_path) dos arquivos com esse nome de jogo (sort_key), em qualquer pasta."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT tipo, rel_path FROM files WHERE sort_key = ? ORDER BY rel_path", (key,)).fetchall()
+
+    def find_by_crc32(self, crc32: str) -> list[tuple[str, str]]:
+        """(tipo, rel_path) dos arquivos cuja ROM (sem copiadora) tem esse CRC32 (precisa dos hashes)."""
+        with self._lock:
+            return self._db.execute(
+                "SELECT f.tipo, f.rel_path FROM rom_hashes h JOIN files f ON f.rel_path = h.rel_path "
+                "WHERE h.crc32 = ? AND h.size = f.size AND h.mtime_ns = f.mtime_ns ORDER BY f.rel_path",
+                (crc32.lower(),)).fetchall()
+
+    def duplicates(self) -> list[list[str]]:
+        """Grupos de arquivos com o mesmo conteúdo (SHA1 da ROM, sem cabeçalho de copiadora)."""
+        with self._lock:
+            rows = self._db.execute(
+                "SELECT h.sha1, h.rel_path FROM rom_hashes h JOIN files f ON f.rel_path = h.rel_path "
+                "WHERE h.sha1 IN (SELECT sha1 FROM rom_hashes WHERE sha1 IS NOT NULL "
+                "GROUP BY sha1 HAVING COUNT(*) > 1) ORDER BY h.sha1, f.sort_key, h.rel_path").fetchall()
+        groups: dict[str, list[str]] = {}
+        for sha1, rel in rows:
+            groups.setdefault(sha1, []).append(rel)
+        return list(groups.values())
+
+    def rescan(self, full: bool = False) -> Delta:
+        """
+        Varre rom_root() comparando com o catálogo e retorna o Delta.
+
+        full=True relista todas as pastas (detecta também arquivos alterados
+        sem mudança no mtime da pasta, p.ex. ROM sobrescrita no lugar).
+        """
+        added, removed, modified = [], [], []
+        for d, _ in self.iter_rescan(full=full):
+            added += d.added; removed += d.removed; modified += d.modified
+        return Delta(added, removed, modified)
+
+    def iter_rescan(self, full: bool = False, cancel=None):
+        """
+        Versão incremental de rescan(): gera (Delta, pastas_visitadas) a cada
+        pasta relistada, gravando no catálogo à medida que avança.
+
+        `cancel` (threading.Event ou similar) interrompe a varredura entre
+        pastas; o que já foi gravado continua válido. A remoção de pastas que
+        sumiram só acontece se a varredura chegar ao fim.
+        """
+        with self._lock:
+            known = {d: (p, m) for d, p, m in self._db.execute("SELECT rel_dir, parent, mtime_ns FROM dirs")}
+        children: dict[str, list[str]] = {}
+        for d, (p, _) in known.items():
+            if p is not None:
+                children.setdefault(p, []).append(d)
+
+        seen: set[str] = set()
+        stack = [("", None)]
+        while stack:
+            if cancel is not None and cancel.is_set():
+                return
+            rel_dir, parent = stack.pop()
+            abs_dir = os.path.join(self.root, rel_dir) if rel_dir else self.root
+            try:
+                st = os.stat(abs_dir)
+            except OSError:
+                continue
+            seen.add(rel_dir)
+            prev = known.get(rel_dir)
+            if prev is not None and prev[1] == st.st_mtime_ns and not full:
+                # Conteúdo direto inalterado: só confere as subpastas conhecidas
+                stack.extend((c, rel_dir) for c in children.get(rel_dir, ()))
+                yield Delta([], [], []), len(seen)
+                continue
+            before = len(stack)
+            listing = self._list_dir(rel_dir, abs_dir, stack)
+            if listing is None:
+                continue
+            with self._lock, self._db:
+                delta = self._merge_dir(rel_dir, listing)
+                self._db.execute(
+                    "INSERT OR REPLACE INTO dirs(rel_dir, parent, mtime_ns) VALUES (?, ?, ?)",
+                    (rel_dir, parent, st.st_mtime_ns))
+                # Subpastas novas entram já (mtime NULL = ainda não listada): se a
+                # varredura for cancelada antes de chegar nelas, a próxima as visita
+                # mesmo com o mtime desta pasta já em dia
+                self._db.executemany(
+                    "INSERT OR IGNORE INTO dirs(rel_dir, parent, mtime_ns) VALUES (?, ?, NULL)",
+                    stack[before:])
+            yield delta, len(seen)
+
+        # Pastas que sumiram: remove seus arquivos
+        gone = set(known) - seen
+        if not gone:
+            return
+        removed = []
+        with self._lock, self._db:
+            for rel_dir in gone:
+                removed += self._db.execute(
+                    "SELECT tipo, rel_path FROM files WHERE rel_dir = ?", (rel_dir,)).fetchall()
+                for table in ("zip_members", "rom_headers", "rom_hashes"):
+                    self._db.execute(
+                        f"DELETE FROM {table} WHERE rel_path IN (SELECT rel_path FROM files WHERE rel_dir = ?)",
+                        (rel_dir,))
+                self._db.execute("DELETE FROM files WHERE rel_dir = ?", (rel_dir,))
+                self._db.execute("DELETE FROM dirs WHERE rel_dir = ?", (rel_dir,))
+        yield Delta([], [(t, p) for t, p in removed], []), len(seen)
+
+    def _list_dir(self, rel_dir, abs_dir, stack):
+        """Lista uma pasta (E/S, fora do lock): {rel_path: (tipo, size, mtime_ns)}."""
+        try:
+            it = os.scandir(abs_dir)
+        except OSError:
+            return None
+        out = {}
+        with it:
+            for e in it:
+                try:
+                    if e.is_dir():
+                        stack.append((os.path.join(rel_dir, e.name) if rel_dir else e.name, rel_dir))
+                        continue
+                    tipo = classificar(e.name)
+                    if tipo is None:
+                        continue
+                    st = e.stat()
+                except OSError:
+                    continue
+                rel = os.path.join(rel_dir, e.name) if rel_dir else e.name
+                out[rel] = (tipo, st.st_size, st.st_mtime_ns)
+        return out
+
+    def _merge_dir(self, rel_dir, listing) -> Delta:
+        added, removed, modified = [], [], []
+        old = {p: (t, s, m) for p, t, s, m in self._db.execute(
+            "SELECT rel_path, tipo, size, mtime_ns FROM files WHERE rel_dir = ?", (rel_dir,))}
+        for rel, (tipo, size, mtime_ns) in listing.items():
+            prev = old.get(rel)
+            if prev is None:
+                added.append((tipo, rel))
+            elif prev[1] != size or prev[2] != mtime_ns:
+                modified.append((tipo, rel))
+            else:
+                continue
+            self._db.execute(
+                "INSERT OR REPLACE INTO files(rel_path, rel_dir, tipo, size, mtime_ns, sort_key) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (rel, rel_dir, tipo, size, mtime_ns, sort_key(rel)))
+        for rel, (tipo, _, _) in old.items():
+            if rel not in listing:
+                removed.append((tipo, rel))
+                self._db.execute("DELETE FROM files WHERE rel_path = ?", (rel,))
+                self._db.execute("DELETE FROM zip_members WHERE rel_path = ?", (rel,))
+                self._db.execute("DELETE FROM rom_headers WHERE rel_path = ?", (rel,))
+                self._db.execute("DELETE FROM rom_hashes WHERE rel_path = ?", (rel,))
+        return Delta(added, removed, modified)
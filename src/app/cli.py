@@ -0,0 +1,362 @@
+# src/app/cli.py
+"""
+Linha de comando sem Qt (nada aqui importa PySide6):
+
+    python -m app scan [--full]
+    python -m app list [--tipo zip|rom|patch] [--mapa HiROM] [--coproc SA-1] [--regiao EUA] [--json]
+    python -m app index [--workers N] [--checksum]
+    python -m app hash [--workers N] [--dat arquivo.dat] [--json]
+    python -m app search <texto> [-n 20] [--json]
+    python -m app verify [nome]
+    python -m app patches [--check] [--json]
+    python -m app launch <nome> [--rom membro.sfc] [--janela]
+    python -m app stats [--json]
+
+Usa o mesmo catálogo (Saves/catalog.sqlite3), staging e núcleo de
+lançamento (app.launcher) da GUI.
+"""
+import os, sys, json, time, logging, argparse
+from typing import Optional
+
+from app.paths import rom_root, save_dir
+from app.catalog import Catalog
+
+def _logger(verbose: bool) -> logging.Logger:
+    logger = logging.getLogger("SNESLauncher.cli")
+    if not logger.handlers:
+        h = logging.StreamHandler()
+        h.setFormatter(logging.Formatter("%(levelname)s: %(message)s"))
+        logger.addHandler(h)
+    logger.setLevel(logging.INFO if verbose else logging.WARNING)
+    return logger
+
+def _open_catalog(scan: bool = True, full: bool = False):
+    cat = Catalog()
+    delta = cat.rescan(full=full) if scan else None
+    return cat, delta
+
+def _print_json(data) -> None:
+    json.dump(data, sys.stdout, ensure_ascii=False, indent=2)
+    sys.stdout.write("\n")
+
+def resolver_jogo(entries, nome: str) -> Optional[tuple[str, str]]:
+    """Caminho relativo exato (com / ou \\) ou o melhor resultado da busca."""
+    alvo = os.path.normcase(os.path.normpath(nome))
+    for tipo, rel in entries:
+        if os.path.normcase(os.path.normpath(rel)) == alvo:
+            return tipo, rel
+    from app.search import SearchIndex
+    res = SearchIndex.build(entries).search(nome)
+    if not res:
+        return None
+    tipos = dict((rel, tipo) for tipo, rel in entries)
+    return tipos[res[0]], res[0]
+
+def cmd_scan(args) -> int:
+    t0 = time.perf_counter()
+    cat, d = _open_catalog(full=args.full)
+    try:
+        n = len(cat.entries())
+    finally:
+        cat.close()
+    print(f"{n} jogos | +{len(d.added)} -{len(d.removed)} ~{len(d.modified)} "
+          f"({(time.perf_counter() - t0) * 1000:.0f} ms)")
+    return 0
+
+def _header_match(info: Optional[dict], args) -> bool:
+    filtros = ((args.mapa, "mapping"), (args.coproc, "coprocessor"), (args.regiao, "region"))
+    if not any(v for v, _ in filtros):
+        return True
+    if not info:
+        return False
+    return all(not v or str(info.get(k) or "").lower() == v.lower() for v, k in filtros)
+
+def cmd_list(args) -> int:
+    from app.romheader import index_headers, summary
+    cat, _ = _open_catalog(scan=not args.cached)
+    try:
+        entries = [e for e in cat.entries() if not args.tipo or e[0] == args.tipo]
+        if not args.cached:
+            index_headers(cat)
+        headers = cat.headers()
+    finally:
+        cat.close()
+    entries = [e for e in entries if _header_match(headers.get(e[1]), args)]
+    if args.json:
+        _print_json([{"tipo": t, "rel_path": r, "header": headers.get(r)} for t, r in entries])
+    else:
+        for tipo, rel in entries:
+            info = summary(headers.get(rel))
+            print(f"{tipo}\t{rel}\t{info}" if info else f"{tipo}\t{rel}")
+    return 0
+
+def cmd_index(args) -> int:
+    """Lê o cabeçalho interno das ROMs novas/alteradas (ou de todas, com --full)."""
+    from app.romheader import index_headers
+    cat, _ = _open_catalog()
+    try:
+        if args.full:
+            cat.clear_headers()
+        st = index_headers(cat, workers=args.workers, verify=args.checksum,
+                           logger=logging.getLogger("SNESLauncher.cli"))
+    finally:
+        cat.close()
+    print(f"{st['indexed']} arquivos lidos, {st['failed']} sem cabeçalho "
+          f"({st['ms']:.0f} ms, {st['files_per_s']:.0f} arquivos/s)")
+    return 0
+
+def cmd_search(args) -> int:
+    from app.search import SearchIndex
+    cat, _ = _open_catalog(scan=not args.cached)
+    try:
+        entries = cat.entries()
+    finally:
+        cat.close()
+    res = SearchIndex.build(entries).search(" ".join(args.texto)) or []
+    res = res[:args.n]
+    if args.json:
+        _print_json(res)
+    else:
+        for rel in res:
+            print(rel)
+    return 0 if res else 1
+
+def cmd_hash(args) -> int:
+    """CRC32/SHA1 das ROMs (cache no catálogo), duplicatas e conferência com DAT No-Intro."""
+    from collections import Counter
+    from app.config import get_settings
+    from app.dat import Dat, load_dats, tag_library
+    from app.hashing import hash_library
+    cat, _ = _open_catalog()
+    try:
+        st = hash_library(cat, workers=args.workers, logger=logging.getLogger("SNESLauncher.cli"))
+        hashes, entries = cat.hashes(), cat.entries()
+    finally:
+        cat.close()
+    dat = Dat.load(args.dat) if args.dat else load_dats(save_dir(), get_settings(save_dir()).get("dat_path", ""))
+    tags = tag_library(hashes, entries, dat)
+    if args.json:
+        _print_json([dict(rel_path=rel, **hashes[rel], **tags.get(rel, {})) for _, rel in entries if rel in hashes])
+        return 0
+    print(f"{st['hashed']} arquivos hasheados agora ({st['mb_per_s']:.0f} MiB/s), {len(hashes)} no cache")
+    if dat is not None:
+        print(f"DAT: {dat.name} ({len(dat)} ROMs)")
+    counts = Counter(t["tag"] for t in tags.values())
+    if counts:
+        print("  ".join(f"{k}: {v}" for k, v in sorted(counts.items())))
+    for _, rel in entries:
+        t = tags.get(rel)
+        if t and t["tag"] == "bad":
+            print(f"ruim\t{rel}\t{t.get('game') or ''}")
+        elif t and t["tag"] == "duplicate":
+            print(f"duplicado\t{rel}\t= {t['duplicate_of']}")
+    return 0
+
+def cmd_verify(args) -> int:
+    """
+    Descomprime e confere (CRC32 no ZIP/7z/gz, checagem do bz2/xz) as ROMs de
+    todos os contêineres (ou só do jogo indicado) e aplica os patches na
+    memória (CRC32 de BPS/UPS); no fim, MiB/s por formato.
+    """
+    from app.archives import open_archive, throughput
+    from app.patches import check_patch
+    cat, _ = _open_catalog()
+    entries = cat.entries()
+    if args.nome:
+        jogo = resolver_jogo(entries, args.nome)
+        if not jogo:
+            cat.close()
+            print(f"Jogo não encontrado: {args.nome}", file=sys.stderr)
+            return 2
+        entries = [jogo]
+    bad = 0
+    for tipo, rel in entries:
+        full = os.path.join(rom_root(), rel)
+        try:
+            if tipo == "patch":
+                check_patch(cat, rel)
+                erro = None
+            elif tipo == "zip":
+                with open_archive(full) as ar:
+                    roms = ar.roms()
+                    erro = None if roms else "sem ROM"
+                    for m in roms:
+                        ar.test(m.name)
+            else:
+                erro = None if os.path.getsize(full) > 0 else "arquivo vazio"
+        except Exception as e:
+            erro = str(e) or type(e).__name__
+        if erro:
+            bad += 1
+            print(f"FALHA\t{rel}\t{erro}")
+        elif args.verbose:
+            print(f"ok\t{rel}")
+    cat.close()
+    print(f"{len(entries) - bad}/{len(entries)} ok", file=sys.stderr)
+    for kind, t in throughput().items():
+        print(f"  {kind:<4} {t['count']:>6} ROMs  {t['bytes'] / (1024 * 1024):>9.1f} MiB  {t['mb_per_s']:>7.1f} MiB/s",
+              file=sys.stderr)
+    return 1 if bad else 0
+
+def cmd_patches(args) -> int:
+    """Patches IPS/BPS/UPS da biblioteca e a ROM base de cada um (com --check, aplica e confere)."""
+    from app.patches import PatchError, check_patch, find_base
+    cat, _ = _open_catalog()
+    out, bad = [], 0
+    try:
+        for tipo, rel in cat.entries():
+            if tipo != "patch":
+                continue
+            row = {"rel_path": rel}
+            try:
+                if args.check:
+                    row.update(check_patch(cat, rel))
+                else:
+                    with open(os.path.join(cat.root, rel), "rb") as f:
+                        base = find_base(cat, rel, f.read())
+                    if base is None:
+                        raise PatchError("ROM base não encontrada na biblioteca")
+                    row.update(base=base[1], by=base[2])
+            except (PatchError, OSError) as e:
+                row["erro"] = str(e)
+                bad += 1
+            out.append(row)
+    finally:
+        cat.close()
+    if args.json:
+        _print_json(out)
+        return 1 if bad else 0
+    for row in out:
+        if "erro" in row:
+            print(f"FALHA\t{row['rel_path']}\t{row['erro']}")
+            continue
+        extra = ""
+        if args.check:
+            extra = f"\t{row['fmt']} {row['ms']:.0f} ms" + ("" if row["checksum_ok"] is not False else ", checksum interno não confere")
+        print(f"ok\t{row['rel_path']}\t<- {row['base']} ({row['by']}){extra}")
+    print(f"{len(out) - bad}/{len(out)} patches com base", file=sys.stderr)
+    return 1 if bad else 0
+
+def cmd_launch(args) -> int:
+    from app.launcher import Launcher
+    from app.logging_conf import setup_logger
+    cat, _ = _open_catalog()
+    try:
+        jogo = resolver_jogo(cat.entries(), args.nome)
+    finally:
+        cat.close()
+    if not jogo:
+        print(f"Jogo não encontrado: {args.nome}", file=sys.stderr)
+        return 2
+    tipo, rel = jogo
+    logger = setup_logger(save_dir())
+    launcher = Launcher(logger)
+    print(f"Executando {rel}...", file=sys.stderr)
+    try:
+        launcher.run_with_type(tipo, os.path.join(rom_root(), rel), args.rom,
+                               fullscreen=not args.janela, block=True)
+    finally:
+        launcher.shutdown()
+    res = launcher.last_result
+    if not res.ok:
+        print(res.message, file=sys.stderr)
+        return 1
+    return res.returncode or 0
+
+def cmd_stats(args) -> int:
+    from app import tracing
+    from app.staging import staging_root, _tree_size
+    cat, _ = _open_catalog(scan=not args.cached)
+    try:
+        entries = cat.entries()
+    finally:
+        cat.close()
+    launches = {name: (n, p50, p95) for name, n, p50, p95 in tracing.report()
+                if name.startswith("launch.")}
+    data = {
+        "rom_root": rom_root(),
+        "jogos": len(entries),
+        "zip": sum(1 for t, _ in entries if t == "zip"),
+        "rom": sum(1 for t, _ in entries if t == "rom"),
+        "patch": sum(1 for t, _ in entries if t == "patch"),
+        "staging_bytes": _tree_size(staging_root()),
+        "lancamentos": launches.get("launch.total", (0, 0.0, 0.0))[0],
+        "etapas_ms": {k[len("launch."):]: {"n": n, "p50": round(p50, 1), "p95": round(p95, 1)}
+                      for k, (n, p50, p95) in launches.items()},
+    }
+    if args.json:
+        _print_json(data)
+        return 0
+    print(f"Roms: {data['rom_root']}")
+    print(f"Jogos: {data['jogos']} ({data['zip']} zip, {data['rom']} rom, {data['patch']} patch)")
+    print(f"Staging: {data['staging_bytes'] / (1024 * 1024):.1f} MiB")
+    print(f"Lançamentos registrados: {data['lancamentos']}")
+    for etapa, v in data["etapas_ms"].items():
+        print(f"  {etapa:<24} p50 {v['p50']:>8.1f} ms   p95 {v['p95']:>8.1f} ms")
+    return 0
+
+def build_parser() -> argparse.ArgumentParser:
+    ap = argparse.ArgumentParser(prog="python -m app", description="SNES Launcher (sem GUI)")
+    ap.add_argument("-v", "--verbose", action="store_true")
+    sub = ap.add_subparsers(dest="cmd", required=True)
+
+    p = sub.add_parser("scan", help="atualiza o catálogo da pasta Roms")
+    p.add_argument("--full", action="store_true", help="relista todas as pastas")
+    p.set_defaults(func=cmd_scan)
+
+    p = sub.add_parser("list", help="lista os jogos")
+    p.add_argument("--tipo", choices=("zip", "rom", "patch"))
+    p.add_argument("--mapa", help="LoROM, HiROM ou ExHiROM (cabeçalho interno)")
+    p.add_argument("--coproc", help="SuperFX, SA-1, DSP...")
+    p.add_argument("--regiao", help="Japão, EUA, Europa...")
+    p.add_argument("--cached", action="store_true", help="não varre, usa só o catálogo")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_list)
+
+    p = sub.add_parser("index", help="lê o cabeçalho interno das ROMs (título, mapeamento, região...)")
+    p.add_argument("--workers", type=int, help="processos (padrão: núcleos; 1 = sem pool)")
+    p.add_argument("--checksum", action="store_true", help="confere a soma das ROMs soltas (lê o arquivo todo)")
+    p.add_argument("--full", action="store_true", help="relê todos, não só os alterados")
+    p.set_defaults(func=cmd_index)
+
+    p = sub.add_parser("search", help="busca tolerante a erros/acentos")
+    p.add_argument("texto", nargs="+")
+    p.add_argument("-n", type=int, default=20)
+    p.add_argument("--cached", action="store_true")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_search)
+
+    p = sub.add_parser("hash", help="CRC32/SHA1 das ROMs, duplicatas e conferência com DAT")
+    p.add_argument("--workers", type=int, help="processos (padrão: núcleos; 1 = sem pool)")
+    p.add_argument("--dat", help="DAT No-Intro (XML); padrão: Saves/dats ou dat_path")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_hash)
+
+    p = sub.add_parser("verify", help="confere a integridade dos contêineres (ZIP, 7z, gz...)")
+    p.add_argument("nome", nargs="?")
+    p.set_defaults(func=cmd_verify)
+
+    p = sub.add_parser("patches", help="patches IPS/BPS/UPS e a ROM base de cada um")
+    p.add_argument("--check", action="store_true", help="aplica na memória e confere os CRC32")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_patches)
+
+    p = sub.add_parser("launch", help="executa um jogo e espera o emulador fechar")
+    p.add_argument("nome", help="caminho relativo ou texto de busca")
+    p.add_argument("--rom", help="ROM dentro do ZIP (padrão: a primeira)")
+    p.add_argument("--janela", action="store_true", help="não força tela cheia")
+    p.set_defaults(func=cmd_launch)
+
+    p = sub.add_parser("stats", help="resumo do catálogo, staging e tempos de lançamento")
+    p.add_argument("--cached", action="store_true")
+    p.add_argument("--json", action="store_true")
+    p.set_defaults(func=cmd_stats)
+    return ap
+
+def main(argv=None) -> int:
+    args = build_parser().parse_args(argv)
+    _logger(args.verbose)
+    try:
+        return args.func(args)
+    except KeyboardInterrupt:
+        return 130
@@ -1,4 +1,4 @@
-import os, json
+import os, json, atexit, tempfile, threading
 
 MIN_OPACITY = 25
 DEFAULTS = {
@@ -10,16 +10,56 @@ DEFAULTS = {
     "longpress_threshold": 600,  # ms
     "xinput_enabled": True,
     "xinput_button": "BACK",
+    # Segurar longpress_key/xinput_button alterna tela cheia (ver app.hotkeys):
+    # "auto" usa hook de teclado (eventos) e cai para polling a cada hotkey_poll_ms
+    "hotkey_backend": "auto",   # "auto", "hook" ou "poll"
+    "hotkey_poll_ms": 50,
     "aggressive_fullscreen": True,
+    # Observa a pasta Roms (novas ROMs aparecem sem "Recarregar")
+    "watch_roms": True,
+    "watch_poll_ms": 5000,  # polling quando a pasta está em rede
+    # Lê o cabeçalho interno das ROMs (título, LoROM/HiROM, região...) após cada varredura
+    "rom_headers": True,
+    # CRC32/SHA1 das ROMs para achar duplicatas e conferir com DATs No-Intro
+    # (Saves/dats/*.dat ou dat_path); "auto" = só quando houver DAT
+    "hash_roms": "auto",
+    "dat_path": "",
+    # Cache de ROMs extraídas dos ZIPs (runtime/staging), com despejo LRU
+    "staging_cache_mb": 1024,
+    # Extrai em segundo plano o jogo que ficar selecionado por prefetch_dwell_ms
+    "prefetch": True,
+    "prefetch_dwell_ms": 600,
+    # Partida: o primeiro quadro deve sair antes disso (ver app.startup)
+    "startup_budget_ms": 500,
+    # SNES.log: gravado por uma thread (fila limitada); rotação "size" ou "midnight"
+    "log_format": "text",   # ou "json" (JSON lines)
+    "log_rotate": "size",
+    "log_max_mb": 5,
+    "log_backups": 3,
+    "log_queue_size": 10000,
     # Dica padrão (alinhar com a GUI)
     "hint_text": "Tela cheia: ALT+ENTER (alternar) • ou segure F12 por 0,6s",
     # Importante: documenta e permite persistir o último jogado
-    "last_played": None,  # dict {"tipo": "zip|rom", "rel_path": "...", "rom_interna": "...|None"} ou None
+    "last_played": None,  # dict {"tipo": "zip|rom|patch", "rel_path": "...", "rom_interna": "...|None"} ou None
 }
 
 def settings_path(save_path: str) -> str:
     return os.path.join(save_path, "gui_settings.json")
 
+def last_played_txt_path(save_path: str) -> str:
+    return os.path.join(save_path, "ultimo_jogo.txt")
+
+def _write_atomic(path: str, text: str) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=".tmp-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            f.write(text)
+        os.replace(tmp, path)
+    except Exception:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+
 def load_gui_settings(save_path: str) -> dict:
     """
     Carrega JSON e preserva TODAS as chaves presentes no arquivo.
@@ -41,11 +81,143 @@ def load_gui_settings(save_path: str) -> dict:
 
 def save_gui_settings(save_path: str, settings: dict) -> None:
     """
-    Salva o dicionário inteiro, sem filtrar chaves.
+    Salva o dicionário inteiro, sem filtrar chaves (gravação atômica).
     """
     try:
         os.makedirs(save_path, exist_ok=True)
-        with open(settings_path(save_path), "w", encoding="utf-8") as f:
-            json.dump(settings, f, ensure_ascii=False, indent=2)
+        _write_atomic(settings_path(save_path),
+                      json.dumps(settings, ensure_ascii=False, indent=2))
     except Exception:
         pass
+
+def _last_played_line(lp) -> str:
+    if not lp:
+        return ""
+    rom = lp.get("rom_interna")
+    return f"{lp.get('tipo')}|{lp.get('rel_path')}|{'' if rom is None else rom}"
+
+def _read_last_played_txt(save_path: str):
+    try:
+        with open(last_played_txt_path(save_path), "r", encoding="utf-8") as f:
+            parts = f.read().strip().split("|")
+        if len(parts) >= 2 and parts[1].strip():
+            rom = parts[2].strip() if len(parts) >= 3 and parts[2].strip() else None
+            return {"tipo": parts[0].strip(), "rel_path": parts[1].strip(), "rom_interna": rom}
+    except Exception:
+        pass
+    return None
+
+class SettingsStore:
+    """
+    Configurações da GUI carregadas UMA vez e servidas da memória.
+
+    - set()/update() alteram a memória, avisam os inscritos (subscribe) na
+      hora, na thread de quem alterou, e agendam um flush após `debounce`
+      segundos: várias alterações seguidas viram uma gravação só;
+    - flush() grava gui_settings.json (e ultimo_jogo.txt, se o último jogo
+      mudou) de forma atômica, e não toca no disco se nada mudou desde a
+      última gravação;
+    - close() (ou a saída do processo) força o flush pendente.
+    """
+
+    def __init__(self, save_path: str, debounce: float = 0.5):
+        self.save_path = save_path
+        self.debounce = debounce
+        self._lock = threading.RLock()
+        self._timer = None
+        self._listeners = []
+        self._data = load_gui_settings(save_path)
+        if not self._data.get("last_played"):
+            # Compatibilidade: versões antigas só tinham o ultimo_jogo.txt
+            lp = _read_last_played_txt(save_path)
+            if lp:
+                self._data["last_played"] = lp
+        self._written = json.dumps(self._data, ensure_ascii=False, indent=2, sort_keys=True)
+        self._written_txt = _last_played_line(self._data.get("last_played"))
+
+    def get(self, key: str, default=None):
+        with self._lock:
+            return self._data.get(key, default)
+
+    def snapshot(self) -> dict:
+        with self._lock:
+            return json.loads(json.dumps(self._data))
+
+    def set(self, key: str, value) -> bool:
+        return self.update({key: value})
+
+    def update(self, values: dict) -> bool:
+        """Aplica as chaves; retorna True se algo mudou."""
+        with self._lock:
+            changed = {k: v for k, v in values.items() if self._data.get(k, object()) != v}
+            if not changed:
+                return False
+            self._data.update(changed)
+            self._schedule()
+            listeners = list(self._listeners)
+        for k, v in changed.items():
+            for cb in listeners:
+                try: cb(k, v)
+                except Exception: pass
+        return True
+
+    def subscribe(self, callback):
+        """callback(chave, valor) a cada alteração. Retorna função para cancelar."""
+        with self._lock:
+            self._listeners.append(callback)
+        def _unsubscribe():
+            with self._lock:
+                if callback in self._listeners:
+                    self._listeners.remove(callback)
+        return _unsubscribe
+
+    def _schedule(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(self.debounce, self.flush)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def flush(self) -> bool:
+        """Grava o que mudou desde a última gravação. Retorna True se escreveu algo."""
+        with self._lock:
+            if self._timer is not None:
+                self._timer.cancel()
+                self._timer = None
+            text = json.dumps(self._data, ensure_ascii=False, indent=2, sort_keys=True)
+            txt = _last_played_line(self._data.get("last_played"))
+            wrote = False
+            try:
+                if text != self._written or (txt and txt != self._written_txt):
+                    os.makedirs(self.save_path, exist_ok=True)
+                if text != self._written:
+                    _write_atomic(settings_path(self.save_path), text)
+                    self._written = text
+                    wrote = True
+                if txt and txt != self._written_txt:
+                    _write_atomic(last_played_txt_path(self.save_path), txt)
+                    self._written_txt = txt
+                    wrote = True
+            except Exception:
+                pass
+            return wrote
+
+    def close(self) -> None:
+        self.flush()
+
+_stores: dict[str, SettingsStore] = {}
+_stores_lock = threading.Lock()
+
+def get_settings(save_path: str) -> SettingsStore:
+    """SettingsStore compartilhado (um por pasta de saves) para GUI e Runner."""
+    key = os.path.normcase(os.path.abspath(save_path))
+    with _stores_lock:
+        store = _stores.get(key)
+        if store is None:
+            store = _stores[key] = SettingsStore(save_path)
+        return store
+
+@atexit.register
+def _flush_all() -> None:
+    for store in list(_stores.values()):
+        store.flush()
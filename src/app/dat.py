@@ -0,0 +1,129 @@
+# src/app/dat.py
+"""
+DATs no estilo No-Intro (XML Logiqx: <datafile><game><rom .../></game>)
+e a marcação da biblioteca a partir dos hashes de app.hashing:
+
+  - "verified":  SHA1 (ou CRC32 + tamanho, se o DAT não tiver SHA1) bate
+                 com uma ROM boa do DAT;
+  - "bad":       bate com uma entrada marcada como baddump, ou o nome do
+                 arquivo é de um jogo do DAT mas o conteúdo não confere;
+  - "duplicate": mesmo conteúdo de outro arquivo que vem antes na lista;
+  - "unknown":   fora do DAT.
+
+Os DATs ficam em Saves/dats/*.dat|*.xml (ou no caminho de dat_path).
+"""
+import os, glob
+import xml.etree.ElementTree as ET
+from typing import NamedTuple, Optional
+
+from app.catalog import sort_key
+
+class DatRom(NamedTuple):
+    game: str
+    name: str
+    size: Optional[int]
+    crc32: str
+    sha1: str
+    status: str          # "" ou o status do DAT (baddump, verified...)
+
+class Dat:
+    def __init__(self, roms=(), name: str = ""):
+        self.name = name
+        self.roms = list(roms)
+        self.by_sha1 = {r.sha1: r for r in self.roms if r.sha1}
+        self.by_crc = {(r.crc32, r.size): r for r in self.roms if r.crc32}
+        self.by_game = {r.game.lower(): r for r in self.roms}
+
+    def __len__(self) -> int:
+        return len(self.roms)
+
+    @classmethod
+    def load(cls, *paths: str) -> "Dat":
+        """Lê um ou mais DATs XML (iterparse: um DAT grande não vira árvore inteira na memória)."""
+        roms, names = [], []
+        for path in paths:
+            game, dat_name = None, None
+            for event, el in ET.iterparse(path, events=("start", "end")):
+                tag = el.tag.rsplit("}", 1)[-1]
+                if event == "start":
+                    if tag in ("game", "machine"):
+                        game = el.get("name", "")
+                    continue
+                if tag == "rom" and game is not None:
+                    size = el.get("size")
+                    roms.append(DatRom(game, el.get("name", ""), int(size) if size and size.isdigit() else None,
+                                       (el.get("crc") or "").lower(), (el.get("sha1") or "").lower(),
+                                       (el.get("status") or "").lower()))
+                elif tag == "name" and game is None and dat_name is None and el.text:
+                    dat_name = el.text.strip()
+                if tag in ("game", "machine"):
+                    game = None
+                    el.clear()
+            names.append(dat_name or os.path.basename(path))
+        return cls(roms, " + ".join(names))
+
+    def lookup(self, info: dict) -> Optional[DatRom]:
+        r = self.by_sha1.get(info.get("sha1") or "")
+        if r is None:
+            r = self.by_crc.get((info.get("crc32") or "", info.get("size")))
+            if r is not None and r.sha1 and info.get("sha1") and r.sha1 != info["sha1"]:
+                r = None
+        return r
+
+    def tag(self, rel_path: str, info: dict) -> dict:
+        r = self.lookup(info)
+        if r is not None:
+            return {"tag": "bad" if r.status == "baddump" else "verified", "game": r.game}
+        named = self.by_game.get(sort_key(rel_path))
+        if named is not None:
+            return {"tag": "bad", "game": named.game}
+        return {"tag": "unknown", "game": None}
+
+def tag_library(hashes: dict, entries, dat: Optional[Dat] = None) -> dict:
+    """
+    hashes: {rel_path: {"crc32", "sha1", "size"}} (Catalog.hashes());
+    entries: (tipo, rel_path) na ordem da lista — o primeiro de cada
+    conteúdo repetido fica com a marca dele, os demais viram "duplicate".
+    Sem DAT só as duplicatas são marcadas.
+    Retorna {rel_path: {"tag", "game", "duplicate_of"?}}.
+    """
+    out, first = {}, {}
+    for _, rel in entries:
+        info = hashes.get(rel)
+        if not info:
+            continue
+        sha1 = info.get("sha1")
+        if sha1 in first:
+            orig = out.get(first[sha1]) or {}
+            out[rel] = {"tag": "duplicate", "game": orig.get("game"), "duplicate_of": first[sha1]}
+            continue
+        first[sha1] = rel
+        if dat is not None:
+            out[rel] = dat.tag(rel, info)
+    return out
+
+def find_dats(save_path: str, dat_path: str = "") -> list[str]:
+    """dat_path (arquivo ou pasta) se configurado; senão Saves/dats/*.dat|*.xml."""
+    base = dat_path or os.path.join(save_path, "dats")
+    if os.path.isfile(base):
+        return [base]
+    return sorted(glob.glob(os.path.join(base, "*.dat")) + glob.glob(os.path.join(base, "*.xml")))
+
+_loaded = (None, None)   # (chave dos arquivos, Dat)
+
+def load_dats(save_path: str, dat_path: str = "") -> Optional[Dat]:
+    """Dat com todos os arquivos encontrados; só relê quando algum muda (tamanho/mtime)."""
+    global _loaded
+    key = []
+    for p in find_dats(save_path, dat_path):
+        try:
+            st = os.stat(p)
+        except OSError:
+            continue
+        key.append((p, st.st_size, st.st_mtime_ns))
+    if not key:
+        return None
+    key = tuple(key)
+    if _loaded[0] != key:
+        _loaded = (key, Dat.load(*(p for p, _, _ in key)))
+    return _loaded[1]
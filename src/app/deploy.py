@@ -0,0 +1,152 @@
+import os, sys, json, hashlib, shutil, tempfile, threading
+from typing import Tuple
+
+from app.paths import emulator_packaged_path, runtime_dir, is_frozen
+
+MANIFEST_NAME = "deploy_manifest.json"
+# O que acompanha o emulador e também vai para o runtime (nomes exatos, relativos
+# à pasta do .exe). Sem globs: no PyInstaller essa pasta é o _MEIPASS/_internal,
+# cheio de DLLs do Python/Qt que não são do emulador
+EXTRA_FILES = ("snes9x.conf", "snes9x.cfg", "shaders")
+SEED_ONLY = {"snes9x.conf", "snes9x.cfg"}
+
+_lock = threading.Lock()
+
+def _sha1(path: str) -> str:
+    h = hashlib.sha1()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1024 * 1024), b""):
+            h.update(chunk)
+    return h.hexdigest()
+
+def _bundle_stamp():
+    """
+    No onefile do PyInstaller o _MEIPASS é reextraído a cada execução (mtime
+    novo), mas o conteúdo só muda se o próprio .exe do launcher mudar.
+    """
+    if not is_frozen():
+        return None
+    try:
+        st = os.stat(sys.executable)
+        return [st.st_size, st.st_mtime_ns]
+    except OSError:
+        return None
+
+def _source_stamp(path: str, st) -> list:
+    bundle = _bundle_stamp()
+    meipass = getattr(sys, "_MEIPASS", None)
+    if bundle and meipass and os.path.abspath(path).startswith(os.path.abspath(meipass)):
+        return [st.st_size] + bundle
+    return [st.st_size, st.st_mtime_ns]
+
+def deploy_files(src_dir: str, exe_name: str) -> list[str]:
+    """Caminhos relativos (a src_dir) a implantar: o .exe e os EXTRA_FILES que existirem ao lado dele."""
+    out = [exe_name]
+    for name in EXTRA_FILES:
+        full = os.path.join(src_dir, name)
+        if os.path.isdir(full):
+            for dirpath, _, files in os.walk(full):
+                for f in sorted(files):
+                    out.append(os.path.relpath(os.path.join(dirpath, f), src_dir))
+        elif os.path.isfile(full):
+            out.append(name)
+    return out
+
+def _load_manifest(path: str) -> dict:
+    try:
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        return data if isinstance(data, dict) else {}
+    except Exception:
+        return {}
+
+def _save_manifest(path: str, data: dict) -> None:
+    fd, tmp = tempfile.mkstemp(prefix=".manifest-", dir=os.path.dirname(path))
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(data, f, ensure_ascii=False, indent=2)
+        os.replace(tmp, path)
+    except Exception:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+
+def _copy_atomic(src: str, dst: str) -> None:
+    os.makedirs(os.path.dirname(dst), exist_ok=True)
+    fd, tmp = tempfile.mkstemp(prefix=".deploy-", dir=os.path.dirname(dst))
+    os.close(fd)
+    try:
+        shutil.copy2(src, tmp)
+        os.replace(tmp, dst)
+    except Exception:
+        try: os.remove(tmp)
+        except OSError: pass
+        raise
+
+def deploy_emulator(logger=None) -> Tuple[str, str]:
+    """
+    Copia o emulador (e shaders/config ao lado dele, EXTRA_FILES) para o runtime e
+    retorna (exe_path, emu_dir).
+
+    Um manifesto no runtime guarda, por arquivo, o carimbo da origem
+    (tamanho/mtime), o SHA1 e o carimbo da cópia. Nas execuções seguintes
+    basta comparar stat(); o SHA1 só é recalculado se algum carimbo mudar,
+    e a cópia só acontece se o conteúdo mudou de fato.
+    """
+    src = emulator_packaged_path()
+    if not os.path.exists(src):
+        return src, os.path.dirname(src)
+    rd = runtime_dir()
+    src_dir = os.path.dirname(src)
+    exe_name = os.path.basename(src)
+    dst_exe = os.path.join(rd, exe_name)
+    mpath = os.path.join(rd, MANIFEST_NAME)
+
+    with _lock:
+        manifest = _load_manifest(mpath)
+        files = manifest.setdefault("files", {})
+        changed = False
+        try:
+            for rel in deploy_files(src_dir, exe_name):
+                s_path = os.path.join(src_dir, rel)
+                d_path = os.path.join(rd, rel)
+                key = rel.replace("\\", "/")
+                try:
+                    s_st = os.stat(s_path)
+                except OSError:
+                    continue
+                try:
+                    d_st = os.stat(d_path)
+                except OSError:
+                    d_st = None
+                if os.path.basename(rel).lower() in SEED_ONLY:
+                    if d_st is None:
+                        _copy_atomic(s_path, d_path)
+                        if logger: logger.info("Deploy: %s copiado (inicial)", rel)
+                    continue
+
+                stamp = _source_stamp(s_path, s_st)
+                rec = files.get(key)
+                d_stamp = [d_st.st_size, d_st.st_mtime_ns] if d_st else None
+                if rec and rec.get("src") == stamp and rec.get("dst") == d_stamp:
+                    continue  # caminho rápido: só stat()
+
+                digest = _sha1(s_path)
+                if not (rec and d_st and rec.get("sha1") == digest and rec.get("dst") == d_stamp):
+                    if d_st is not None and d_st.st_size == s_st.st_size and _sha1(d_path) == digest:
+                        pass  # cópia já idêntica (manifesto novo/perdido)
+                    else:
+                        _copy_atomic(s_path, d_path)
+                        if logger: logger.info("Deploy: %s atualizado no runtime", rel)
+                    d_st = os.stat(d_path)
+                files[key] = {"src": stamp, "sha1": digest, "dst": [d_st.st_size, d_st.st_mtime_ns]}
+                changed = True
+        except Exception:
+            if logger: logger.exception("Falha ao implantar emulador no runtime")
+            return src, src_dir
+        finally:
+            if changed:
+                try: _save_manifest(mpath, manifest)
+                except Exception:
+                    if logger: logger.exception("Falha ao gravar %s", MANIFEST_NAME)
+    return dst_exe, rd
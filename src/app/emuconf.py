@@ -0,0 +1,156 @@
+import os, re, tempfile, threading
+from typing import Optional
+
+DISPLAY_SECTION = "Display\\Win"
+
+_SECTION_RE = re.compile(r"^\s*\[(?P<name>[^\]]+)\]\s*$")
+_KEY_RE = re.compile(r"^(?P<indent>\s*)(?P<key>[^\s#;\[=][^=]*?)(?P<sep>\s*=\s*)(?P<value>.*?)\s*$")
+
+_cache: dict[str, "Snes9xConf"] = {}
+_cache_lock = threading.Lock()
+
+def _fmt(value) -> str:
+    if isinstance(value, bool):
+        return "TRUE" if value else "FALSE"
+    return str(value)
+
+class Snes9xConf:
+    """
+    snes9x.conf em memória, preservando linhas, comentários e formatação.
+
+    - load() devolve a instância em cache para o caminho e só relê o arquivo
+      se o stat (tamanho/mtime) mudou por fora;
+    - set()/update() recebem valores tipados (bool -> TRUE/FALSE, int -> str)
+      e só marcam alteração se o valor de fato mudou;
+    - save() grava de forma atômica (temporário + os.replace) e só se houver
+      alteração: relançar na mesma resolução não faz E/S no arquivo.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.lines: list[str] = []
+        self.newline = "\r\n" if os.name == "nt" else "\n"
+        self._keys: dict[str, int] = {}       # chave (minúscula) -> índice da linha
+        self._sections: dict[str, int] = {}   # seção (minúscula) -> índice do cabeçalho
+        self._stamp = None
+        self.dirty = False
+        self.lock = threading.RLock()
+
+    @classmethod
+    def load(cls, path: str) -> "Snes9xConf":
+        key = os.path.normcase(os.path.abspath(path))
+        with _cache_lock:
+            conf = _cache.get(key)
+            if conf is None:
+                conf = _cache[key] = cls(path)
+        with conf.lock:
+            conf._refresh()
+        return conf
+
+    def _refresh(self) -> None:
+        try:
+            st = os.stat(self.path)
+            stamp = (st.st_size, st.st_mtime_ns)
+        except OSError:
+            stamp = None
+        if stamp is not None and stamp == self._stamp:
+            return
+        if self.dirty and self._stamp is not None:
+            # Alguém mexeu no arquivo com alterações nossas pendentes: o disco vence
+            self.dirty = False
+        text = ""
+        if stamp is not None:
+            with open(self.path, "r", encoding="utf-8", errors="surrogateescape", newline="") as f:
+                text = f.read()
+        self._parse(text)
+        self._stamp = stamp
+        if stamp is None:
+            self.dirty = True  # arquivo ainda não existe
+
+    def _parse(self, text: str) -> None:
+        if "\r\n" in text:
+            self.newline = "\r\n"
+        elif "\n" in text:
+            self.newline = "\n"
+        self.lines = text.splitlines()
+        self._index()
+
+    def _index(self) -> None:
+        self._keys, self._sections = {}, {}
+        for i, line in enumerate(self.lines):
+            m = _SECTION_RE.match(line)
+            if m:
+                self._sections.setdefault(m.group("name").strip().lower(), i)
+                continue
+            m = _KEY_RE.match(line)
+            if m:
+                self._keys.setdefault(m.group("key").strip().lower(), i)
+
+    def get(self, key: str, default=None) -> Optional[str]:
+        i = self._keys.get(key.lower())
+        if i is None:
+            return default
+        return _KEY_RE.match(self.lines[i]).group("value")
+
+    def set(self, key: str, value, section: Optional[str] = None, comment: Optional[str] = None) -> bool:
+        """
+        Define key = value. Se a chave não existir, entra no fim da `section`
+        (criada se preciso) ou, sem seção, no fim do arquivo. Retorna True se mudou.
+        """
+        val = _fmt(value)
+        with self.lock:
+            i = self._keys.get(key.lower())
+            if i is not None:
+                m = _KEY_RE.match(self.lines[i])
+                if m.group("value") == val:
+                    return False
+                self.lines[i] = f"{m.group('indent')}{m.group('key')}{m.group('sep')}{val}"
+                self.dirty = True
+                return True
+            new = [f"# {comment}"] if comment else []
+            new.append(f"{key} = {val}")
+            if section is None:
+                pos = len(self.lines)
+            else:
+                s = self._sections.get(section.lower())
+                if s is None:
+                    self.lines.append(f"[{section}]")
+                    pos = len(self.lines)
+                else:
+                    pos = s + 1
+                    while pos < len(self.lines) and not _SECTION_RE.match(self.lines[pos]):
+                        pos += 1
+                    while pos > s + 1 and not self.lines[pos - 1].strip():
+                        pos -= 1  # antes das linhas em branco que separam seções
+            self.lines[pos:pos] = new
+            self._index()
+            self.dirty = True
+            return True
+
+    def update(self, values: dict, section: Optional[str] = None) -> bool:
+        changed = False
+        with self.lock:
+            for k, v in values.items():
+                changed = self.set(k, v, section) or changed
+        return changed
+
+    def save(self) -> bool:
+        """Grava (atomicamente) se houver alteração. Retorna True se escreveu."""
+        with self.lock:
+            if not self.dirty:
+                return False
+            d = os.path.dirname(os.path.abspath(self.path))
+            os.makedirs(d, exist_ok=True)
+            fd, tmp = tempfile.mkstemp(prefix=".snes9x-", suffix=".conf", dir=d)
+            try:
+                with os.fdopen(fd, "w", encoding="utf-8", errors="surrogateescape", newline="") as f:
+                    f.write(self.newline.join(self.lines) + self.newline)
+                os.replace(tmp, self.path)
+            except Exception:
+                try: os.remove(tmp)
+                except OSError: pass
+                raise
+            st = os.stat(self.path)
+            self._stamp = (st.st_size, st.st_mtime_ns)
+            self.dirty = False
+            return True
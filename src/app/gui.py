@@ -1,19 +1,28 @@
-import os, zipfile, json
+import os, json
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter, QListWidget,
-    QListWidgetItem, QPushButton, QLabel, QLineEdit, QMessageBox, QCheckBox
+    QListWidgetItem, QPushButton, QLabel, QLineEdit, QMessageBox, QCheckBox,
+    QProgressBar, QListView, QAbstractItemView
 )
-from PySide6.QtCore import Qt, QTimer
+from PySide6.QtCore import Qt, QTimer, QItemSelectionModel, Signal
 from PySide6.QtGui import QFontMetrics
 
-from app.roms import carregar_jogos
+from app.models import GameListModel, GameFilterProxy
+from app.search import SearchIndex
 from app.paths import rom_root, save_dir
-from app.config import load_gui_settings, save_gui_settings
-from app.runner import Runner
-from app.resources import load_background
+from app.config import get_settings
+from app.tracing import Trace
+from app.scanner import LibraryScanner, ZipListLoader
+from app.background import BackgroundWidget
+from app import startup
+# Catálogo (sqlite3, app.archives/zipfile, app.patches), Runner (subprocess/
+# deploy), RomWatcher e o fundo só são importados depois do primeiro quadro,
+# ver _run_deferred
 
 
 class MainWindow(QMainWindow):
+    settings_changed = Signal(str, object)
+
     def __init__(self, logger):
         super().__init__()
         self.logger = logger
@@ -21,40 +30,161 @@ class MainWindow(QMainWindow):
         self.resize(1000, 700)
 
         self._busy_launch = False
+        self._launch_trace = None
+        self._last_result = None
         self._translucent_enabled = True
         self._opacity_value = 90
-
-        self.runner = Runner(logger)
-        self.runner.started.connect(self.on_started)
-        self.runner.finished.connect(self.on_finished)
+        self._games_loaded = False
+        self._selected = None   # (tipo, rel_path) escolhido pelo usuário; sobrevive ao filtro
+        self._filtering = False
+        self.settings = get_settings(self._save_path())
+        # Notificações podem vir de qualquer thread; o sinal entrega na da GUI
+        self.settings.subscribe(self.settings_changed.emit)
+        self.settings_changed.connect(self._on_setting_changed)
+        self.game_model = GameListModel(self)
+        self.game_proxy = GameFilterProxy(self)
+        self.game_proxy.setSourceModel(self.game_model)
+        self.search_index = SearchIndex()
+        # Catálogo, scanner e listagem de ZIPs nascem na primeira tarefa adiada
+        # (ou no primeiro uso, se o jogador for mais rápido), como o runner
+        self._catalog = None
+        self._scanner = None
+        self._zip_loader = None
+        self._runner = None
+        # Prefetch: jogo (ZIP) parado na seleção por um instante já vai para o staging
+        self._prefetch_timer = QTimer(self)
+        self._prefetch_timer.setSingleShot(True)
+        self._prefetch_timer.setInterval(int(self.settings.get("prefetch_dwell_ms", 600)))
+        self._prefetch_timer.timeout.connect(self._prefetch_selected)
+
+        self.watcher = None
+        self._zip_req = 0
 
         self._build_ui()
-        self._load_games()
+        startup.mark("ui_built")
+        # Partida em duas fases: a janela mínima pinta primeiro; o resto roda
+        # depois do primeiro quadro, uma tarefa por volta do event loop
+        self._first_paint = False
+        self._deferred = [self._open_catalog, self._show_cached_games, self._load_background,
+                          self._start_watcher, self._load_games, lambda: self.runner]
+        self._deferred_timer = QTimer(self)
+        self._deferred_timer.setInterval(0)
+        self._deferred_timer.timeout.connect(self._run_deferred)
+        # Sem paint (janela minimizada etc.) o adiado roda mesmo assim após o orçamento
+        self._budget_timer = QTimer(self)
+        self._budget_timer.setSingleShot(True)
+        self._budget_timer.timeout.connect(self._start_deferred)
+        self._budget_timer.start(self._startup_budget())
+
+    def _startup_budget(self) -> int:
+        return int(self.settings.get("startup_budget_ms", 500))
+
+    def paintEvent(self, ev):
+        super().paintEvent(ev)
+        if not self._first_paint:
+            self._first_paint = True
+            startup.mark("first_paint")
+            self._start_deferred()
+
+    def _start_deferred(self):
+        self._budget_timer.stop()
+        if self._deferred and not self._deferred_timer.isActive():
+            self._deferred_timer.start()
+
+    def _run_deferred(self):
+        if not self._deferred:
+            self._deferred_timer.stop()
+            return
+        task = self._deferred.pop(0)
+        try:
+            task()
+        except Exception:
+            self.logger.exception("Falha em tarefa adiada da partida")
+        if not self._deferred:
+            self._deferred_timer.stop()
+            startup.mark("ready")
+            startup.finish(self.logger, self._startup_budget(), self._save_path())
+            if startup.exit_requested():
+                self.close_app()
+
+    @property
+    def catalog(self):
+        if self._catalog is None:
+            from app.catalog import Catalog
+            try:
+                self._catalog = Catalog()
+            except Exception:
+                # Saves sem permissão de escrita etc.: catálogo só em memória
+                self.logger.exception("Falha ao abrir catálogo; usando catálogo em memória")
+                self._catalog = Catalog(db_path=":memory:")
+        return self._catalog
+
+    @property
+    def scanner(self):
+        if self._scanner is None:
+            self._scanner = LibraryScanner(self.catalog, self.logger, settings=self.settings, parent=self)
+            self._scanner.batch.connect(self._apply_delta)
+            self._scanner.progress.connect(self._on_scan_progress)
+            self._scanner.failed.connect(self._on_scan_failed)
+            self._scanner.headers.connect(self._load_headers)
+            self._scanner.tags.connect(self.game_model.set_tags)
+            self._scanner.done.connect(self._on_scan_done)
+        return self._scanner
+
+    @property
+    def zip_loader(self):
+        if self._zip_loader is None:
+            self._zip_loader = ZipListLoader(self.catalog, self.logger, parent=self)
+            self._zip_loader.loaded.connect(self._on_zip_listed)
+        return self._zip_loader
+
+    def _open_catalog(self):
+        self.scanner, self.zip_loader   # cria os dois (e abre o catálogo) aqui, já fora do primeiro quadro
+        startup.mark("catalog")
+        self._refresh_continue_button()   # o rótulo com o nome do jogo precisa de app.archives
+
+    @property
+    def runner(self):
+        if self._runner is None:
+            from app.runner import Runner
+            self._runner = Runner(self.logger)
+            self._runner.started.connect(self.on_started)
+            self._runner.finished.connect(self.on_finished)
+            self._runner.result.connect(self._on_launch_result)
+        return self._runner
+
+    def _load_background(self):
+        from app.resources import load_background
+        self.background.set_pixmap(load_background())
+        startup.mark("background")
 
     def _build_ui(self):
-        central = QWidget()
+        # Fundo pintado pelo próprio widget central (app.background): gradiente
+        # no primeiro quadro, imagem decodificada depois (_load_background)
+        central = self.background = BackgroundWidget()
         self.setCentralWidget(central)
         root = QHBoxLayout(central)
 
-        self.bg_pixmap = load_background()
-        if self.bg_pixmap:
-            self.bg_label = QLabel(central)
-            self.bg_label.setScaledContents(True)
-            self.bg_label.setPixmap(self.bg_pixmap.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation))
-            self.bg_label.setGeometry(self.rect())
-            self.bg_label.lower()
-        else:
-            central.setStyleSheet('background: qlineargradient(x1:0, y1:0, x2:1, y2:1, stop:0 #1b1b1b, stop:1 #0f0f0f);')
-
         left = QVBoxLayout()
         self.search = QLineEdit()
         self.search.setPlaceholderText("Pesquisar por nome do jogo...")
-        self.search.textChanged.connect(self.filter_games)
+        # Debounce: digitação rápida gera uma única filtragem
+        self._search_timer = QTimer(self)
+        self._search_timer.setSingleShot(True)
+        self._search_timer.setInterval(150)
+        self._search_timer.timeout.connect(lambda: self.filter_games(self.search.text()))
+        self.search.textChanged.connect(lambda _t: self._search_timer.start())
+        self.search.returnPressed.connect(lambda: self.filter_games(self.search.text()))
         left.addWidget(self.search)
 
-        self.list_games = QListWidget()
-        self.list_games.itemSelectionChanged.connect(self.on_game_selected)
-        self.list_games.itemDoubleClicked.connect(self.on_double_click)
+        self.list_games = QListView()
+        self.list_games.setUniformItemSizes(True)
+        self.list_games.setSelectionMode(QAbstractItemView.SingleSelection)
+        self.list_games.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.list_games.setModel(self.game_proxy)
+        self.list_games.selectionModel().selectionChanged.connect(self.on_game_selected)
+        self.list_games.doubleClicked.connect(self.on_double_click)
+        self.game_model.modelReset.connect(self._restore_selection)
         left.addWidget(self.list_games)
 
         btns_left = QHBoxLayout()
@@ -72,6 +202,7 @@ class MainWindow(QMainWindow):
         right.addWidget(self.lbl_selected)
 
         self.list_internal = QListWidget()
+        self.list_internal.itemSelectionChanged.connect(self._schedule_prefetch)
         right.addWidget(self.list_internal)
 
         btns = QHBoxLayout()
@@ -102,7 +233,7 @@ class MainWindow(QMainWindow):
         self.btn_exit.clicked.connect(self.on_exit_clicked)
         controls_appear.addWidget(self.btn_exit)
 
-        s = load_gui_settings(save_path=self._save_path())
+        s = self.settings
         self._hint_text = s.get('hint_text', 'Tela cheia: ALT+ENTER (alternar) • ou segure F12 por 0,6s')
         self.hint_fullscreen = QLabel(self._hint_text)
 
@@ -119,6 +250,11 @@ class MainWindow(QMainWindow):
 
         self.status = self.statusBar()
         self.status.showMessage("Pronto")
+        self.scan_progress = QProgressBar()
+        self.scan_progress.setMaximumWidth(220)
+        self.scan_progress.setTextVisible(True)
+        self.scan_progress.hide()
+        self.status.addPermanentWidget(self.scan_progress)
 
         self._refresh_continue_button()
 
@@ -154,9 +290,7 @@ class MainWindow(QMainWindow):
             f"border: 1px solid rgba(0,0,0,0.14); padding:8px 10px; border-radius:6px; }}"
             f"QLineEdit:focus {{ background-color: {search_bg_focus}; }}"
         )
-        s = load_gui_settings(save_path=self._save_path())
-        s.update({"translucent": self._translucent_enabled, "opacity": self._opacity_value})
-        save_gui_settings(save_path=self._save_path(), settings=s)
+        self.settings.update({"translucent": self._translucent_enabled, "opacity": self._opacity_value})
         self._apply_hint_style(self._translucent_enabled)
 
     def on_translucent_toggled(self, checked: bool):
@@ -177,10 +311,11 @@ class MainWindow(QMainWindow):
 
     def _refresh_continue_button(self):
         tipo, rel_path, _ = self._load_last_played()
-        if not rel_path:
+        if not rel_path or self._catalog is None:
             self.btn_continue.setText("Continuar")
             return
-        nome = os.path.splitext(os.path.basename(rel_path))[0]
+        from app.archives import stem
+        nome = stem(rel_path)
         rotulo = f"Continuar ({nome})"
         fm = QFontMetrics(self.btn_continue.font())
         maxw = max(120, self.btn_continue.width() - 12)
@@ -188,111 +323,234 @@ class MainWindow(QMainWindow):
         self.btn_continue.setText(elided)
 
     def _save_last_played(self, tipo: str, rel_path: str, rom_interna):
-        s = load_gui_settings(save_path=self._save_path())
-        s["last_played"] = {"tipo": tipo, "rel_path": rel_path, "rom_interna": rom_interna}
-        save_gui_settings(save_path=self._save_path(), settings=s)
-        txt = os.path.join(self._save_path(), "ultimo_jogo.txt")
-        with open(txt, "w", encoding="utf-8") as f:
-            f.write(f"{tipo}|{rel_path}|{'' if rom_interna is None else rom_interna}")
-        self._refresh_continue_button()
+        # O botão "Continuar" é atualizado pela notificação do SettingsStore
+        self.settings.set("last_played", {"tipo": tipo, "rel_path": rel_path, "rom_interna": rom_interna})
 
     def _load_last_played(self):
-        s = load_gui_settings(save_path=self._save_path())
-        lp = s.get("last_played") or {}
+        lp = self.settings.get("last_played") or {}
         tipo = lp.get("tipo")
         rel_path = lp.get("rel_path")
-        rom_interna = lp.get("rom_interna")
-        if tipo in ("zip", "rom") and rel_path:
-            return tipo, rel_path, rom_interna
-        txt = os.path.join(self._save_path(), "ultimo_jogo.txt")
-        if os.path.exists(txt):
-            line = open(txt, "r", encoding="utf-8").read().strip()
-            parts = line.split("|")
-            if len(parts) >= 2:
-                tipo = parts[0].strip()
-                rel_path = parts[1].strip()
-                rom_interna = parts[2].strip() if len(parts) >= 3 and parts[2].strip() else None
-                return tipo, rel_path, rom_interna
+        if tipo in ("zip", "rom", "patch") and rel_path:
+            return tipo, rel_path, lp.get("rom_interna")
         return None, None, None
 
+    def _on_setting_changed(self, key: str, value):
+        if key == "last_played":
+            self._refresh_continue_button()
+
+    def _show_cached_games(self):
+        """Mostra o que já está no catálogo (sem tocar na pasta Roms)."""
+        try:
+            entries = self.catalog.entries()
+        except Exception:
+            self.logger.exception("Falha ao ler catálogo de ROMs")
+            entries = []
+        self._games_loaded = True
+        self.search_index = SearchIndex.build(entries)
+        self.game_model.reset(entries)
+        self._load_headers()
+        self._refresh_game_list()
+
+    def _load_headers(self, _n: int = 0):
+        try:
+            self.game_model.set_headers(self.catalog.headers())
+        except Exception:
+            self.logger.exception("Falha ao ler cabeçalhos do catálogo")
+
     def _load_games(self):
-        self.all_games = carregar_jogos()
-        self.filtered_games = list(self.all_games)
+        """
+        Dispara a varredura em segundo plano; os lotes chegam por
+        _apply_delta. Se já houver uma em andamento, ela é cancelada e
+        reiniciada.
+        """
+        if not self._games_loaded:
+            self._show_cached_games()
+        known = len(self.catalog.dirs())
+        self.scan_progress.setRange(0, known)  # 0 = indeterminado (primeira varredura)
+        self.scan_progress.setValue(0)
+        self.scan_progress.setFormat("Varrendo %v/%m pastas" if known else "Varrendo...")
+        self.scan_progress.show()
+        self.scanner.start()
+
+    def _on_watch_dirty(self):
+        # Rescan silencioso (sem barra de progresso): só o Delta chega na lista
+        self.scanner.start()
+
+    def _on_scan_progress(self, dirs: int):
+        if self.scan_progress.maximum():
+            self.scan_progress.setValue(min(dirs, self.scan_progress.maximum()))
+
+    def _on_scan_failed(self, msg: str):
+        self.status.showMessage(f"Falha ao varrer a pasta Roms: {msg}")
+
+    def _on_scan_done(self, finished: bool):
+        if self.scanner.is_running():
+            return
+        self.scan_progress.hide()
+        if self.watcher is not None:
+            self.watcher.sync_paths()
+
+    def _start_watcher(self):
+        from app.watcher import RomWatcher
+        s = self.settings
+        if not s.get("watch_roms", True):
+            return
+        try:
+            self.watcher = RomWatcher(self.catalog, self.logger,
+                                      poll_ms=int(s.get("watch_poll_ms", 5000)), parent=self)
+            self.watcher.dirty.connect(self._on_watch_dirty)
+            self.watcher.start()
+        except Exception:
+            self.logger.exception("Falha ao iniciar observação da pasta Roms")
+            self.watcher = None
+
+    def _apply_delta(self, delta):
+        if delta:
+            self.logger.info("Catálogo: +%d -%d ~%d", len(delta.added), len(delta.removed), len(delta.modified))
+        for _, rel in delta.removed:
+            self.search_index.remove(rel)
+        for _, rel in delta.added:
+            self.search_index.add(rel)
+        self._filtering = True
+        try:
+            self.game_model.apply_delta(delta)
+            if delta.added and self.search.text().strip():
+                self.game_proxy.set_results(self.search_index.search(self.search.text()))
+        finally:
+            self._filtering = False
+        if self._selected:
+            rel = self._selected[1]
+            if any(r == rel for _, r in delta.removed):
+                self._selected = None
+                self.on_game_selected()
+            elif any(r == rel for _, r in delta.modified):
+                self._populate_internal(*self._selected)
         self._refresh_game_list()
 
     def _refresh_game_list(self):
-        self.list_games.clear()
-        for tipo, rel_path in self.filtered_games:
-            rotulo = os.path.splitext(os.path.basename(rel_path))[0]
-            item = QListWidgetItem(rotulo)
-            item.setData(Qt.UserRole, (tipo, rel_path))
-            self.list_games.addItem(item)
-        self.status.showMessage(f"{len(self.filtered_games)} jogos")
+        self.status.showMessage(f"{self.game_proxy.rowCount()} jogos")
 
     def filter_games(self, text: str):
-        text = text.lower().strip()
-        if not text:
-            self.filtered_games = list(self.all_games)
-        else:
-            self.filtered_games = [
-                (tipo, rel_path) for (tipo, rel_path) in self.all_games
-                if text in os.path.splitext(os.path.basename(rel_path))[0].lower()
-            ]
+        self._search_timer.stop()
+        self._filtering = True
+        try:
+            self.game_proxy.set_results(self.search_index.search(text))
+        finally:
+            self._filtering = False
+        self._restore_selection()
         self._refresh_game_list()
 
-    def on_game_selected(self):
-        items = self.list_games.selectedItems()
-        if not items:
+    def _restore_selection(self):
+        """Reaplica na view a seleção lógica (se o jogo estiver visível)."""
+        if not self._selected:
+            return
+        row = self.game_model.row_of(self._selected[1])
+        if row < 0:
+            return
+        idx = self.game_proxy.mapFromSource(self.game_model.index(row))
+        if not idx.isValid():
+            return
+        prev, self._filtering = self._filtering, True
+        try:
+            self.list_games.selectionModel().setCurrentIndex(idx, QItemSelectionModel.ClearAndSelect)
+            self.list_games.scrollTo(idx)
+        finally:
+            self._filtering = prev
+
+    def on_game_selected(self, *_):
+        if self._filtering:
+            # Mudança causada por filtro/delta: a seleção lógica continua
+            return
+        idxs = self.list_games.selectionModel().selectedIndexes()
+        self._selected = idxs[0].data(GameListModel.GameRole) if idxs else None
+        if not self._selected:
             self.lbl_selected.setText("Selecione um jogo para ver detalhes")
+            self.zip_loader.cancel()
             self.list_internal.clear()
+            self._schedule_prefetch()
             return
-        tipo, rel_path = items[0].data(Qt.UserRole)
+        tipo, rel_path = self._selected
         self.lbl_selected.setText(rel_path)
         self._populate_internal(tipo, rel_path)
+        self._schedule_prefetch()
+
+    def _schedule_prefetch(self):
+        self.runner.cancel_prefetch()
+        if self._selected and self._selected[0] == "zip" and self.settings.get("prefetch", True):
+            self._prefetch_timer.start()
+        else:
+            self._prefetch_timer.stop()
+
+    def _prefetch_selected(self):
+        if self._busy_launch or self.runner.process is not None:
+            return  # nunca compete com um jogo abrindo/rodando
+        tipo, rel_path, rom_interna = self.get_selected_zip_and_rom()
+        if tipo == "zip" and rel_path:
+            self.runner.prefetch(os.path.join(rom_root(), rel_path), rom_interna)
 
     def _populate_internal(self, tipo: str, rel_path: str):
         self.list_internal.clear()
-        base_path = rom_root()
-        full_path = os.path.join(base_path, rel_path)
         if tipo == "zip":
-            try:
-                with zipfile.ZipFile(full_path, "r") as zf:
-                    roms = [f for f in zf.namelist() if f.lower().endswith((".sfc", ".smc"))]
-                    for r in roms:
-                        item = QListWidgetItem(os.path.basename(r))
-                        item.setData(Qt.UserRole, r)
-                        self.list_internal.addItem(item)
-            except Exception as e:
-                QMessageBox.warning(self, "Erro", f"Não foi possível listar o ZIP:\n{e}")
-        else:
-            item = QListWidgetItem(os.path.basename(full_path))
-            item.setData(Qt.UserRole, None)
+            # Listagem (com cache no catálogo) sai da thread da GUI; só o
+            # resultado do pedido mais recente é aplicado em _on_zip_listed
+            self._zip_req = self.zip_loader.request(rel_path)
+            return
+        self.zip_loader.cancel()
+        full_path = os.path.join(rom_root(), rel_path)
+        item = QListWidgetItem(os.path.basename(full_path))
+        item.setData(Qt.UserRole, None)
+        self.list_internal.addItem(item)
+
+    def _on_zip_listed(self, req_id: int, rel_path: str, roms: list, err: str):
+        if req_id != self._zip_req or not self._selected or self._selected[1] != rel_path:
+            return
+        if err:
+            QMessageBox.warning(self, "Erro", f"Não foi possível listar o arquivo:\n{err}")
+            return
+        self.list_internal.clear()
+        for r in roms:
+            item = QListWidgetItem(os.path.basename(r))
+            item.setData(Qt.UserRole, r)
             self.list_internal.addItem(item)
 
     def get_selected_zip_and_rom(self):
-        items = self.list_games.selectedItems()
-        if not items:
+        if not self._selected:
             return None, None, None
-        tipo, rel_path = items[0].data(Qt.UserRole)
+        tipo, rel_path = self._selected
         rom_item = self.list_internal.selectedItems()
         rom_interna = rom_item[0].data(Qt.UserRole) if rom_item else None
         return tipo, rel_path, rom_interna
 
     def run_selected(self):
-        if self._busy_launch:
+        if self._busy_launch or self.runner.is_running():
             return
+        self._prefetch_timer.stop()
         tipo, rel_path, rom_interna = self.get_selected_zip_and_rom()
         if not rel_path:
             QMessageBox.information(self, "Selecione", "Selecione um jogo primeiro.")
             return
-        self._save_last_played(tipo, rel_path, rom_interna)
+        if self._start_launch(tipo, rel_path, rom_interna, "executar", f"Executando {rel_path}..."):
+            self._save_last_played(tipo, rel_path, rom_interna)
+
+    def _start_launch(self, tipo: str, rel_path: str, rom_interna, origem: str, message: str) -> bool:
+        """
+        Pede o lançamento e só então troca trace/resultado/botões: recusado
+        ("Busy"), nada muda e a sessão em andamento segue com o trace dela.
+        Os sinais do runner chegam pela fila do Qt, nunca antes deste retorno.
+        """
+        # Trace começa no clique: o tempo medido é o que o jogador sente
+        trace = Trace("launch", tipo=tipo, rel_path=rel_path, origem=origem)
+        if self.runner.run_with_type(tipo, os.path.join(rom_root(), rel_path), rom_interna,
+                                     fullscreen=True, trace=trace) == "Busy":
+            self.status.showMessage("Já há um jogo em execução.")
+            return False
+        self._launch_trace = trace
         self._busy_launch = True
-        self.status.showMessage(f"Executando {rel_path}...")
+        self._last_result = None
+        self.status.showMessage(message)
         for b in (self.btn_run, self.btn_refresh, self.btn_continue): b.setEnabled(False)
         self.btn_stop.setEnabled(True)
-        fullscreen = True
-        full_path = os.path.join(rom_root(), rel_path)
-        self.runner.run_with_type(tipo, full_path, rom_interna, fullscreen=fullscreen)
+        return True
 
     def stop_running(self):
         self.status.showMessage("Parando...")
@@ -300,28 +558,34 @@ class MainWindow(QMainWindow):
 
     def on_started(self):
         self._busy_launch = False
+        if self._launch_trace is not None:
+            self._launch_trace.mark("gui_started")
         self.status.showMessage("Em execução")
         self.btn_exit.setEnabled(False)
 
+    def _on_launch_result(self, result):
+        self._last_result = result
+        if not result.ok:
+            self.status.showMessage(result.message.replace("\n", " "))
+            QMessageBox.critical(self, result.title or "Erro", result.message)
+
     def on_finished(self):
-        self.status.showMessage("Parado")
+        self._busy_launch = False
+        if self._last_result is None or self._last_result.ok:
+            self.status.showMessage("Parado")
         for b in (self.btn_run, self.btn_refresh, self.btn_continue): b.setEnabled(True)
         self.btn_stop.setEnabled(False)
         self._refresh_continue_button()
         QTimer.singleShot(500, lambda: self.btn_exit.setEnabled(True))
 
     def continuar_ultimo(self):
+        if self._busy_launch or self.runner.is_running():
+            return
         tipo, rel_path, rom_interna = self._load_last_played()
         if not rel_path:
             QMessageBox.information(self, "Nenhum", "Ainda não há jogo recente para continuar.")
             return
-        self._busy_launch = True
-        self.status.showMessage(f"Executando (continuar) {rel_path}...")
-        for b in (self.btn_run, self.btn_refresh, self.btn_continue): b.setEnabled(False)
-        self.btn_stop.setEnabled(True)
-        fullscreen = True
-        full_path = os.path.join(rom_root(), rel_path)
-        self.runner.run_with_type(tipo, full_path, rom_interna, fullscreen=fullscreen)
+        self._start_launch(tipo, rel_path, rom_interna, "continuar", f"Executando (continuar) {rel_path}...")
 
     def open_roms_folder(self):
         path = rom_root()
@@ -348,14 +612,21 @@ class MainWindow(QMainWindow):
 
     def close_app(self):
         from PySide6.QtWidgets import QApplication
+        if self.watcher is not None:
+            self.watcher.stop()
+        if self._scanner is not None:
+            self._scanner.cancel()
+        self._deferred_timer.stop()
+        self._budget_timer.stop()
+        self._prefetch_timer.stop()
+        if self._runner is not None:
+            self._runner.shutdown()
+        self.settings.close()
         QApplication.quit()
 
     def resizeEvent(self, ev):
         super().resizeEvent(ev)
-        if getattr(self, "bg_pixmap", None):
-            self.bg_label.setPixmap(self.bg_pixmap.scaled(self.size(), Qt.KeepAspectRatioByExpanding, Qt.SmoothTransformation))
-            self.bg_label.setGeometry(self.rect()); self.bg_label.lower()
         self._refresh_continue_button()
 
-    def on_double_click(self, item):
+    def on_double_click(self, index):
         self.run_selected()
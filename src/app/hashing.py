@@ -0,0 +1,136 @@
+# src/app/hashing.py
+"""
+CRC32/SHA1 do conteúdo real de cada ROM da biblioteca: membro do contêiner
+(ZIP, 7z, .sfc.gz...: o mesmo que o launcher abre) ou arquivo solto, sempre SEM o cabeçalho de
+copiadora de 512 bytes — assim .smc com cabeçalho, .sfc limpo e o ZIP do
+mesmo jogo dão o mesmo hash (e batem com os DATs No-Intro, ver app.dat).
+
+Os hashes ficam no catálogo (rom_hashes) com tamanho/mtime do arquivo:
+hash_library() só relê o que mudou, num pool de processos.
+"""
+import os, mmap, time, zlib, hashlib
+from typing import Optional
+
+from app.jobs import map_processes
+from app.romheader import copier_offset, COPIER_SIZE
+from app.archives import open_archive
+
+CHUNK = 1024 * 1024
+
+def _digest(chunks) -> dict:
+    crc, sha, n = 0, hashlib.sha1(), 0
+    for buf in chunks:
+        crc = zlib.crc32(buf, crc)
+        sha.update(buf)
+        n += len(buf)
+    return {"crc32": f"{crc & 0xFFFFFFFF:08x}", "sha1": sha.hexdigest(), "size": n}
+
+def hash_rom(path: str) -> dict:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        off = copier_offset(size)
+        if size <= off:
+            return _digest(())
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            view = memoryview(mm)
+            try:
+                return _digest(view[i:i + CHUNK] for i in range(off, size, CHUNK))
+            finally:
+                view.release()
+
+class _Hasher:
+    """
+    Recebe o membro em blocos (Archive.stream). Sem o tamanho de antemão
+    (bz2/xz) não dá para saber se há cabeçalho de copiadora até o fim: os
+    dois hashes (com e sem os primeiros 512 bytes) andam juntos e o tamanho
+    final escolhe.
+    """
+    def __init__(self, size: Optional[int]):
+        self.skip = copier_offset(size) if size is not None else None
+        self.crc, self.sha, self.n = 0, hashlib.sha1(), 0                  # sem a copiadora
+        self.crc_all, self.sha_all = (0, hashlib.sha1()) if size is None else (None, None)
+        self.seen = 0
+
+    def __call__(self, buf) -> None:
+        if self.sha_all is not None:
+            self.crc_all = zlib.crc32(buf, self.crc_all)
+            self.sha_all.update(buf)
+        skip = COPIER_SIZE if self.skip is None else self.skip
+        if self.seen < skip:
+            cut = min(skip - self.seen, len(buf))
+            self.seen += cut
+            buf = buf[cut:]
+        if buf:
+            self.crc = zlib.crc32(buf, self.crc)
+            self.sha.update(buf)
+            self.n += len(buf)
+
+    def result(self) -> dict:
+        if self.skip is None and not copier_offset(self.seen + self.n):
+            return {"crc32": f"{self.crc_all & 0xFFFFFFFF:08x}", "sha1": self.sha_all.hexdigest(),
+                    "size": self.seen + self.n}
+        return {"crc32": f"{self.crc & 0xFFFFFFFF:08x}", "sha1": self.sha.hexdigest(), "size": self.n}
+
+def hash_archive_member(path: str, member: Optional[str] = None) -> Optional[dict]:
+    with open_archive(path) as ar:
+        if member is None:
+            roms = ar.roms()
+            if not roms:
+                return None
+            member = roms[0].name
+        h = _Hasher(ar.size_of(member))
+        ar.stream(member, h)
+    info = h.result()
+    info["member"] = member
+    return info
+
+def hash_payload(abs_path: str, tipo: str) -> Optional[dict]:
+    return hash_archive_member(abs_path) if tipo == "zip" else hash_rom(abs_path)
+
+def _hash_one(job) -> tuple:
+    """Worker do pool (de módulo, para o pickle)."""
+    abs_path, tipo, rel, size, mtime_ns = job
+    try:
+        info = hash_payload(abs_path, tipo) or {"erro": "contêiner sem ROM"}
+    except Exception as e:
+        info = {"erro": str(e) or type(e).__name__}
+    return rel, size, mtime_ns, info
+
+def hash_library(catalog, workers: Optional[int] = None, cancel=None, logger=None,
+                 min_parallel: int = 32, batch: int = 200) -> dict:
+    """
+    Calcula CRC32/SHA1 dos arquivos novos/alterados do catálogo (o resto
+    vem do cache). Retorna {"hashed", "failed", "bytes", "ms", "mb_per_s"}.
+    """
+    t0 = time.perf_counter()
+    jobs = [(os.path.join(catalog.root, rel), tipo, rel, size, mtime_ns)
+            for rel, tipo, size, mtime_ns in catalog.stale_hashes()]
+    stats = {"hashed": 0, "failed": 0, "bytes": 0}
+    pending = []
+
+    def _flush():
+        catalog.put_hashes(pending)
+        stats["hashed"] += len(pending)
+        stats["failed"] += sum(1 for r in pending if "erro" in r[3])
+        stats["bytes"] += sum(r[3].get("size") or 0 for r in pending)
+        pending.clear()
+
+    results = map_processes(_hash_one, jobs, workers, min_parallel, chunksize=1)
+    try:
+        for res in results:
+            pending.append(res)
+            if len(pending) >= batch:
+                _flush()
+            if cancel is not None and cancel.is_set():
+                break
+        if pending:
+            _flush()
+    finally:
+        results.close()
+    ms = (time.perf_counter() - t0) * 1000
+    stats["ms"] = round(ms, 1)
+    stats["mb_per_s"] = round(stats["bytes"] / (1024 * 1024) / (ms / 1000), 1) if stats["bytes"] and ms else 0.0
+    if logger is not None and stats["hashed"]:
+        logger.info("Hashes: %d arquivos (%d com erro), %.1f MiB em %.0f ms",
+                    stats["hashed"], stats["failed"], stats["bytes"] / (1024 * 1024), ms)
+    return stats
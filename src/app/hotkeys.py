@@ -0,0 +1,348 @@
+# src/app/hotkeys.py
+"""
+Atalho de "segurar para alternar" (longpress_key / xinput_button), sem Qt.
+
+O detector (LongPressDetector) é uma máquina de estados pura, com o tempo
+injetado; o HotkeyService recebe press/release dos backends numa fila e
+só acorda quando chega evento ou quando vence o limiar de uma tecla
+segurada — nada de acordar a cada 50 ms só para olhar o teclado.
+
+Backends (cada um roda como vigia da sessão de lançamento, ver app.jobs):
+  - Win32HookBackend: hook de teclado de baixo nível (WH_KEYBOARD_LL),
+    dirigido a eventos; se falhar, cai para o polling;
+  - PollingBackend: lê o estado a cada hotkey_poll_ms (GetAsyncKeyState);
+  - XInputBackend: botão do controle (XInput não tem eventos: polling);
+  - SimulatedBackend: roteiro de press/release, para testes e para
+    benchmarks/bench_hotkeys.py (roda em qualquer plataforma).
+"""
+import sys, time, queue, threading
+from typing import Callable, Dict, List, Optional, Tuple
+
+from app.jobs import CancelToken
+
+_NAMED_KEYS = {
+    "ESC": 0x1B, "ESCAPE": 0x1B, "TAB": 0x09, "SPACE": 0x20, "ENTER": 0x0D, "RETURN": 0x0D,
+    "BACKSPACE": 0x08, "PAUSE": 0x13, "INSERT": 0x2D, "DELETE": 0x2E, "HOME": 0x24,
+    "END": 0x23, "PAGEUP": 0x21, "PAGEDOWN": 0x22, "SCROLLLOCK": 0x91,
+}
+
+XINPUT_BUTTONS = {
+    "DPAD_UP": 0x0001, "DPAD_DOWN": 0x0002, "DPAD_LEFT": 0x0004, "DPAD_RIGHT": 0x0008,
+    "START": 0x0010, "BACK": 0x0020, "LEFT_THUMB": 0x0040, "RIGHT_THUMB": 0x0080,
+    "LEFT_SHOULDER": 0x0100, "RIGHT_SHOULDER": 0x0200,
+    "A": 0x1000, "B": 0x2000, "X": 0x4000, "Y": 0x8000,
+}
+
+def key_code(name: str) -> Optional[int]:
+    """Virtual-key do Windows para "F12", "ESC", "P", "0x7B"...; None se desconhecida."""
+    n = str(name or "").strip().upper()
+    if n.startswith("0X"):
+        try:
+            return int(n, 16)
+        except ValueError:
+            return None
+    if n in _NAMED_KEYS:
+        return _NAMED_KEYS[n]
+    if n[:1] == "F" and n[1:].isdigit() and 1 <= int(n[1:]) <= 24:
+        return 0x70 + int(n[1:]) - 1
+    if len(n) == 1 and n.isalnum():
+        return ord(n)
+    return None
+
+class LongPressDetector:
+    """
+    Dispara uma vez por segurada, quando a tecla fica pressionada por
+    threshold_ms. Repetições de press (autorepeat) são ignoradas; depois de
+    disparar, a tecla fica em cooldown (um press nesse intervalo não conta).
+    """
+
+    def __init__(self, threshold_ms: float, cooldown_ms: float = 500):
+        self.threshold = threshold_ms / 1000.0
+        self.cooldown = cooldown_ms / 1000.0
+        self._down: Dict[str, Optional[float]] = {}   # tecla -> início da segurada (None: já gasta)
+        self._cool: Dict[str, float] = {}
+
+    def next_deadline(self) -> Optional[float]:
+        pending = [t0 + self.threshold for t0 in self._down.values() if t0 is not None]
+        return min(pending) if pending else None
+
+    def poll(self, now: float) -> List[Tuple[str, float]]:
+        """Teclas cujo limiar venceu até `now`, com o atraso (s) em relação ao limiar."""
+        fired = []
+        for key, t0 in list(self._down.items()):
+            if t0 is not None and now - t0 >= self.threshold:
+                self._down[key] = None
+                self._cool[key] = now + self.cooldown
+                fired.append((key, now - t0 - self.threshold))
+        return fired
+
+    def feed(self, key: str, pressed: bool, t: float) -> List[Tuple[str, float]]:
+        # Um limiar vencido antes deste evento (ex.: soltou depois do prazo) ainda conta
+        fired = self.poll(t)
+        if pressed:
+            if key not in self._down:
+                self._down[key] = None if t < self._cool.get(key, 0.0) else t
+        else:
+            self._down.pop(key, None)
+        return fired
+
+class HotkeyService:
+    """
+    Junta os backends e o detector. Backends chamam emit(tecla, pressionada)
+    de qualquer thread; run(token) consome a fila e chama on_long_press(tecla)
+    na thread do serviço.
+    """
+
+    def __init__(self, threshold_ms: float, on_long_press: Callable[[str], None], backends=(),
+                 cooldown_ms: float = 500, logger=None, clock: Callable[[], float] = time.monotonic):
+        self.detector = LongPressDetector(threshold_ms, cooldown_ms)
+        self.on_long_press = on_long_press
+        self.backends = list(backends)
+        self.logger = logger
+        self.clock = clock
+        self.wakeups = 0
+        self.fired: List[Tuple[str, float]] = []   # (tecla, atraso em ms sobre o limiar)
+        self._q = queue.SimpleQueue()
+
+    def emit(self, key: str, pressed: bool, t: Optional[float] = None) -> None:
+        self._q.put((key, bool(pressed), self.clock() if t is None else t))
+
+    def run(self, token: CancelToken) -> None:
+        token.add_callback(lambda: self._q.put(None))
+        while not token.is_set():
+            deadline = self.detector.next_deadline()
+            timeout = None if deadline is None else max(0.0, deadline - self.clock())
+            try:
+                item = self._q.get(timeout=timeout)
+            except queue.Empty:
+                item = ()
+            self.wakeups += 1
+            if item is None:
+                break
+            fired = self.detector.feed(*item) if item else self.detector.poll(self.clock())
+            for key, late in fired:
+                self.fired.append((key, late * 1000))
+                try:
+                    self.on_long_press(key)
+                except Exception:
+                    if self.logger is not None:
+                        self.logger.exception("Falha na ação do atalho %s", key)
+
+    def run_backend(self, backend, token: CancelToken) -> None:
+        try:
+            backend.run(self.emit, token)
+        except Exception:
+            fallback = getattr(backend, "fallback", None)
+            if self.logger is not None:
+                self.logger.warning("Atalhos: backend %s falhou%s", backend.name,
+                                    f", usando {fallback.name}" if fallback else "", exc_info=True)
+            if fallback is not None and not token.is_set():
+                fallback.run(self.emit, token)
+
+    def attach(self, session) -> None:
+        """Registra o serviço e cada backend como vigias da sessão (app.jobs.Supervisor)."""
+        session.watch("hotkeys", self.run)
+        for b in self.backends:
+            session.watch(f"hotkeys-{b.name}", lambda tok, b=b: self.run_backend(b, tok))
+
+class PollingBackend:
+    """Lê read(código) de cada tecla a cada interval_ms e emite só as mudanças."""
+    name = "poll"
+
+    def __init__(self, keys: Dict[int, str], read: Callable[[int], bool], interval_ms: float = 50,
+                 name: Optional[str] = None):
+        self.keys = dict(keys)
+        self.read = read
+        self.interval = max(1.0, float(interval_ms)) / 1000.0
+        self.wakeups = 0
+        if name:
+            self.name = name
+
+    def run(self, emit, token: CancelToken) -> None:
+        state = {code: False for code in self.keys}
+        while True:
+            self.wakeups += 1
+            for code, key in self.keys.items():
+                pressed = bool(self.read(code))
+                if pressed != state[code]:
+                    state[code] = pressed
+                    emit(key, pressed)
+            if token.wait(self.interval):
+                return
+
+def _async_key_reader() -> Callable[[int], bool]:
+    import ctypes
+    get = ctypes.windll.user32.GetAsyncKeyState
+    return lambda vk: (get(vk) & 0x8000) != 0
+
+class Win32HookBackend:
+    """
+    Hook WH_KEYBOARD_LL numa thread com laço de mensagens: o Windows chama o
+    callback a cada tecla (nada de polling). Eventos injetados (o próprio
+    ALT+ENTER do launcher) são ignorados. Cancelar posta WM_QUIT.
+    """
+    name = "hook"
+
+    def __init__(self, keys: Dict[int, str], fallback=None):
+        self.keys = dict(keys)
+        self.fallback = fallback
+        self.wakeups = 0
+
+    def run(self, emit, token: CancelToken) -> None:
+        import ctypes
+        from ctypes import wintypes
+        user32 = ctypes.WinDLL("user32", use_last_error=True)
+        kernel32 = ctypes.WinDLL("kernel32", use_last_error=True)
+        WH_KEYBOARD_LL = 13
+        WM_KEYDOWN, WM_KEYUP, WM_SYSKEYDOWN, WM_SYSKEYUP, WM_QUIT = 0x0100, 0x0101, 0x0104, 0x0105, 0x0012
+        LLKHF_INJECTED = 0x10
+        PM_NOREMOVE = 0x0000
+
+        class KBDLLHOOKSTRUCT(ctypes.Structure):
+            _fields_ = [("vkCode", wintypes.DWORD), ("scanCode", wintypes.DWORD), ("flags", wintypes.DWORD),
+                        ("time", wintypes.DWORD), ("dwExtraInfo", ctypes.c_size_t)]
+
+        LRESULT = ctypes.c_ssize_t
+        HOOKPROC = ctypes.WINFUNCTYPE(LRESULT, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM)
+        user32.SetWindowsHookExW.argtypes = [ctypes.c_int, HOOKPROC, wintypes.HINSTANCE, wintypes.DWORD]
+        user32.SetWindowsHookExW.restype = wintypes.HHOOK
+        user32.CallNextHookEx.argtypes = [wintypes.HHOOK, ctypes.c_int, wintypes.WPARAM, wintypes.LPARAM]
+        user32.CallNextHookEx.restype = LRESULT
+        user32.UnhookWindowsHookEx.argtypes = [wintypes.HHOOK]
+        kernel32.GetModuleHandleW.restype = wintypes.HMODULE
+
+        def _proc(code, wparam, lparam):
+            if code == 0:
+                kb = ctypes.cast(lparam, ctypes.POINTER(KBDLLHOOKSTRUCT)).contents
+                key = self.keys.get(kb.vkCode)
+                if key is not None and not (kb.flags & LLKHF_INJECTED):
+                    self.wakeups += 1
+                    if wparam in (WM_KEYDOWN, WM_SYSKEYDOWN):
+                        emit(key, True)
+                    elif wparam in (WM_KEYUP, WM_SYSKEYUP):
+                        emit(key, False)
+            return user32.CallNextHookEx(None, code, wparam, lparam)
+
+        cb = HOOKPROC(_proc)   # referência viva enquanto o hook existir
+        msg = wintypes.MSG()
+        # Cria a fila de mensagens da thread antes de alguém poder postar WM_QUIT
+        user32.PeekMessageW(ctypes.byref(msg), None, 0, 0, PM_NOREMOVE)
+        hook = user32.SetWindowsHookExW(WH_KEYBOARD_LL, cb, kernel32.GetModuleHandleW(None), 0)
+        if not hook:
+            raise ctypes.WinError(ctypes.get_last_error())
+        tid = kernel32.GetCurrentThreadId()
+        token.add_callback(lambda: user32.PostThreadMessageW(tid, WM_QUIT, 0, 0))
+        try:
+            while not token.is_set() and user32.GetMessageW(ctypes.byref(msg), None, 0, 0) > 0:
+                pass
+        finally:
+            user32.UnhookWindowsHookEx(hook)
+
+class XInputBackend(PollingBackend):
+    """Botão do controle 0-3 (qualquer um) via XInputGetState, a cada interval_ms."""
+    name = "xinput"
+
+    def __init__(self, button: str, mask: int, interval_ms: float = 50):
+        super().__init__({mask: f"pad:{button}"}, self._read, interval_ms)
+        self._get = None
+
+    def _read(self, mask: int) -> bool:
+        if self._get is None:
+            self._get = self._load()
+        state = self._state
+        for user in range(4):
+            if self._get(user, self._ref(state)) == 0 and state.Gamepad.wButtons & mask:
+                return True
+        return False
+
+    def _load(self):
+        import ctypes
+        from ctypes import wintypes
+
+        class XINPUT_GAMEPAD(ctypes.Structure):
+            _fields_ = [("wButtons", wintypes.WORD), ("bLeftTrigger", ctypes.c_ubyte),
+                        ("bRightTrigger", ctypes.c_ubyte), ("sThumbLX", ctypes.c_short),
+                        ("sThumbLY", ctypes.c_short), ("sThumbRX", ctypes.c_short), ("sThumbRY", ctypes.c_short)]
+
+        class XINPUT_STATE(ctypes.Structure):
+            _fields_ = [("dwPacketNumber", wintypes.DWORD), ("Gamepad", XINPUT_GAMEPAD)]
+
+        for dll in ("xinput1_4", "xinput1_3", "xinput9_1_0"):
+            try:
+                fn = getattr(ctypes.windll, dll).XInputGetState
+                break
+            except (OSError, AttributeError):
+                continue
+        else:
+            raise OSError("XInput indisponível")
+        self._state = XINPUT_STATE()
+        self._ref = ctypes.byref
+        return fn
+
+class SimulatedBackend:
+    """
+    Roteiro de (instante_s, tecla, pressionada), relativo ao início do run().
+    Com `events=True` emite cada mudança (como o hook); com False só atualiza
+    is_down(), para um PollingBackend ler. `log` guarda os instantes reais.
+    """
+    name = "sim"
+
+    def __init__(self, script: List[Tuple[float, str, bool]], events: bool = True,
+                 clock: Callable[[], float] = time.monotonic):
+        self.script = sorted(script, key=lambda e: e[0])
+        self.events = events
+        self.clock = clock
+        self.log: List[Tuple[str, bool, float]] = []
+        self._down = set()
+        self._lock = threading.Lock()
+        self.wakeups = 0
+
+    def is_down(self, key) -> bool:
+        with self._lock:
+            return key in self._down
+
+    def run(self, emit, token: CancelToken) -> None:
+        t0 = self.clock()
+        for at, key, pressed in self.script:
+            if token.wait(max(0.0, t0 + at - self.clock())):
+                return
+            now = self.clock()
+            with self._lock:
+                (self._down.add if pressed else self._down.discard)(key)
+            self.log.append((key, pressed, now))
+            if self.events:
+                self.wakeups += 1
+                emit(key, pressed, now)
+
+def from_settings(settings, on_long_press: Callable[[str], None], logger=None) -> Optional[HotkeyService]:
+    """
+    Monta o serviço a partir de longpress_* / xinput_* / hotkey_*; None se
+    nada estiver ligado ou a plataforma não tiver backend real (não-Windows).
+    """
+    if not sys.platform.startswith("win"):
+        return None
+    get = settings.get
+    interval = float(get("hotkey_poll_ms", 50))
+    backends = []
+    if get("longpress_enabled", True):
+        name = str(get("longpress_key", "F12"))
+        vk = key_code(name)
+        if vk is None:
+            if logger is not None:
+                logger.warning("Atalhos: tecla desconhecida em longpress_key: %r", name)
+        else:
+            keys = {vk: name.upper()}
+            poll = PollingBackend(keys, _async_key_reader(), interval)
+            kind = str(get("hotkey_backend", "auto")).lower()
+            backends.append(poll if kind == "poll" else Win32HookBackend(keys, fallback=poll))
+    if get("xinput_enabled", True):
+        button = str(get("xinput_button", "BACK")).upper()
+        mask = XINPUT_BUTTONS.get(button)
+        if mask is None:
+            if logger is not None:
+                logger.warning("Atalhos: botão desconhecido em xinput_button: %r", button)
+        else:
+            backends.append(XInputBackend(button, mask, interval))
+    if not backends:
+        return None
+    return HotkeyService(float(get("longpress_threshold", 600)), on_long_press, backends, logger=logger)
@@ -0,0 +1,222 @@
+# src/app/jobs.py
+"""
+Trabalhos em segundo plano, sem Qt (usado pelo app.launcher e pela CLI).
+
+- CancelToken: um threading.Event com cara de token. Quem trabalha espera
+  com token.wait(seg) em vez de time.sleep, então cancelar acorda na hora.
+- JobPool: ThreadPoolExecutor com nome. submit() devolve um Job e o
+  resultado é SEMPRE um JobResult: exceção vira dado (status/erro), nunca
+  diálogo nem traceback solto numa thread.
+- map_processes(): fn(item) para muitos itens num pool de processos
+  (cabeçalhos, hashes), rodando aqui mesmo quando são poucos.
+- Supervisor: um por sessão (um lançamento). É dono de todos os vigias
+  daquela sessão (fullscreen, ALT+ENTER, atalhos...) e, no close(), cancela e
+  espera cada um antes de a sessão acabar.
+
+Na saída do interpretador os tokens ainda vivos são cancelados antes de o
+concurrent.futures esperar as threads (nada de processo preso num vigia).
+"""
+import os, time, atexit, threading, weakref
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FuturesTimeout, CancelledError
+from typing import Any, Callable, NamedTuple, Optional
+
+class Cancelled(Exception):
+    """Trabalho interrompido por quem pediu (ex.: prefetch de um jogo que deixou de estar selecionado)."""
+
+class CancelToken(threading.Event):
+    def __init__(self):
+        super().__init__()
+        self._cb_lock = threading.Lock()
+        self._callbacks = []
+
+    def set(self) -> None:
+        with self._cb_lock:
+            super().set()
+            callbacks, self._callbacks = self._callbacks, []
+        for cb in callbacks:
+            try:
+                cb()
+            except Exception:
+                pass
+
+    def cancel(self) -> None:
+        self.set()
+
+    def add_callback(self, cb: Callable[[], Any]) -> None:
+        """cb() roda (uma vez) no cancelamento; na hora, se já cancelado. Para acordar esperas que não são do token."""
+        with self._cb_lock:
+            if not self.is_set():
+                self._callbacks.append(cb)
+                return
+        cb()
+
+    @property
+    def cancelled(self) -> bool:
+        return self.is_set()
+
+    def check(self) -> None:
+        if self.is_set():
+            raise Cancelled()
+
+class JobResult(NamedTuple):
+    name: str
+    status: str           # "ok", "cancelled" ou o nome da exceção
+    value: Any = None
+    error: str = ""
+    ms: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+class Job:
+    """Handle de um trabalho submetido: token para cancelar e future com o JobResult."""
+
+    def __init__(self, name: str, token: CancelToken, future):
+        self.name = name
+        self.token = token
+        self.future = future
+
+    def cancel(self) -> None:
+        self.token.cancel()
+        self.future.cancel()   # ainda na fila: nem começa
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def wait(self, timeout: Optional[float] = None) -> Optional[JobResult]:
+        """JobResult do trabalho, ou None se não terminou dentro do timeout."""
+        try:
+            return self.future.result(timeout)
+        except FuturesTimeout:
+            return None
+        except CancelledError:
+            return JobResult(self.name, "cancelled")
+
+_pools = weakref.WeakSet()
+
+class JobPool:
+    """Pool de threads nomeadas (criadas sob demanda, até max_workers)."""
+
+    def __init__(self, name: str, max_workers: int = 4, logger=None):
+        self.name = name
+        self.logger = logger
+        self._ex = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix=f"snes-{name}")
+        self._lock = threading.Lock()
+        self._live = {}   # token -> trabalhos ainda não terminados (vigias dividem o token)
+        _pools.add(self)
+
+    def submit(self, name: str, fn: Callable[[CancelToken], Any],
+               token: Optional[CancelToken] = None) -> Job:
+        """Roda fn(token) numa thread do pool."""
+        token = token if token is not None else CancelToken()
+        with self._lock:
+            self._live[token] = self._live.get(token, 0) + 1
+        future = self._ex.submit(self._call, name, fn, token)
+        future.add_done_callback(lambda _f: self._discard(token))
+        return Job(name, token, future)
+
+    def _discard(self, token: CancelToken) -> None:
+        with self._lock:
+            n = self._live.pop(token, 1) - 1
+            if n > 0:
+                self._live[token] = n
+
+    def _call(self, name: str, fn, token: CancelToken) -> JobResult:
+        t0 = time.perf_counter()
+        try:
+            value = fn(token)
+            status, err = ("cancelled" if token.is_set() else "ok"), ""
+        except Cancelled:
+            value, status, err = None, "cancelled", ""
+        except Exception as e:
+            value, status, err = None, type(e).__name__, str(e) or type(e).__name__
+            if self.logger is not None:
+                self.logger.exception("Falha no trabalho %s/%s", self.name, name)
+        return JobResult(name, status, value, err, (time.perf_counter() - t0) * 1000)
+
+    def cancel_all(self) -> None:
+        with self._lock:
+            live = list(self._live)
+        for token in live:
+            token.cancel()
+
+    def shutdown(self, wait: bool = False) -> None:
+        self.cancel_all()
+        self._ex.shutdown(wait=wait, cancel_futures=True)
+
+class Supervisor:
+    """
+    Dono dos vigias de uma sessão. Todos compartilham o token da sessão:
+    cancel() para todos de uma vez; close() cancela e espera (até timeout).
+    """
+
+    def __init__(self, pool: JobPool, name: str, logger=None):
+        self.pool = pool
+        self.name = name
+        self.logger = logger
+        self.token = CancelToken()
+        self._lock = threading.Lock()
+        self._jobs = []
+
+    def watch(self, name: str, fn: Callable[[CancelToken], Any]) -> Optional[Job]:
+        with self._lock:
+            if self.token.is_set():
+                return None
+            job = self.pool.submit(f"{self.name}/{name}", fn, self.token)
+            self._jobs.append(job)
+            return job
+
+    def cancel(self) -> None:
+        self.token.cancel()
+
+    def close(self, timeout: float = 2.0) -> list:
+        self.token.cancel()
+        with self._lock:
+            jobs, self._jobs = self._jobs, []
+        deadline = time.monotonic() + timeout
+        results = []
+        for job in jobs:
+            res = job.wait(max(0.0, deadline - time.monotonic()))
+            if res is None and self.logger is not None:
+                self.logger.warning("Vigia %s não terminou em %.1fs", job.name, timeout)
+            results.append(res)
+        return results
+
+def map_processes(fn: Callable[[Any], Any], items, workers: Optional[int] = None,
+                  min_parallel: int = 256, chunksize: Optional[int] = None):
+    """
+    Gera fn(item) na ordem dos itens. Com menos de `min_parallel` itens (ou
+    workers=1) roda na thread atual, já que subir o pool custaria mais;
+    senão usa um ProcessPoolExecutor (fn precisa ser de módulo, por causa
+    do pickle). Fechar o gerador (close/break) cancela o que falta.
+    Os processos sobem sempre por "spawn": fork de um app com threads
+    (Qt, vigias, pools) pode herdar locks presos, e no Windows é o único modo.
+    """
+    items = list(items)
+    if len(items) < min_parallel or workers == 1:
+        yield from map(fn, items)
+        return
+    import multiprocessing
+    from concurrent.futures import ProcessPoolExecutor
+    workers = workers or os.cpu_count() or 2
+    ex = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context("spawn"))
+    try:
+        yield from ex.map(fn, items, chunksize=chunksize or max(1, min(64, len(items) // (workers * 8))))
+    finally:
+        ex.shutdown(wait=True, cancel_futures=True)
+
+def _cancel_all_pools() -> None:
+    for pool in list(_pools):
+        pool.cancel_all()
+
+# Precisa rodar ANTES de o concurrent.futures esperar as threads dos pools:
+# ele faz esse join em threading._shutdown(), que vem antes dos handlers do
+# atexit, então um vigia em token.wait() seguraria a saída até o próprio
+# timeout. threading._register_atexit (o mesmo gancho que o concurrent.futures
+# usa; roda em ordem inversa de registro) é privado do CPython: sem ele, fica
+# o atexit, que ao menos cancela o que ainda estiver vivo depois do join.
+if hasattr(threading, "_register_atexit"):
+    threading._register_atexit(_cancel_all_pools)
+else:
+    atexit.register(_cancel_all_pools)
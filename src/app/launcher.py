@@ -0,0 +1,767 @@
+
+# src/app/launcher.py
+"""
+Núcleo do lançamento, sem Qt: extração para o staging, deploy do
+emulador, ajuste do snes9x.conf, Popen e fullscreen. Usado pela GUI
+(app.runner.Runner, que só converte os callbacks em sinais) e pela CLI.
+"""
+import os
+import zipfile
+import subprocess
+import time
+import errno
+import sys
+import threading
+from typing import NamedTuple, Optional, Tuple
+
+from app.paths import save_dir
+from app.config import get_settings, DEFAULTS
+from app.staging import StagingCache
+from app.archives import open_archive, stem
+from app.catalog import Catalog
+from app.patches import PatchError, apply_patch, find_base, patch_kind, read_rom, snes_checksum_ok
+from app.jobs import Cancelled, CancelToken, Job, JobPool, Supervisor
+from app import hotkeys
+from app.deploy import deploy_emulator
+from app.emuconf import Snes9xConf, DISPLAY_SECTION
+from app.tracing import Trace
+
+def _win_long(p: str) -> str:
+    """
+    Suporte a caminhos longos (MAX_PATH) no Windows via prefixo \\?\
+    Inclui tratamento de UNC. Em outras plataformas, retorna inalterado.
+    """
+    try:
+        if os.name == "nt":
+            p = os.path.normpath(p)
+            if p.startswith("\\\\"):  # UNC
+                if not p.startswith("\\\\?\\UNC\\"):
+                    return "\\\\?\\UNC\\" + p[2:]
+            elif not p.startswith("\\\\?\\"):
+                return "\\\\?\\" + p
+        return p
+    except Exception:
+        return p
+
+def resolve_emulator_exe(logger=None) -> Tuple[str, str]:
+    """
+    Copia o emulador para o runtime e retorna (exe_path, emu_dir).
+    Se não houver arquivo empacotado, usa o caminho original.
+    A validação é por manifesto (stat), ver app.deploy.
+    """
+    return deploy_emulator(logger)
+
+_save_folders_ready = None
+
+def _ensure_save_folders(logger) -> str:
+    """
+    Garante que a pasta de saves persistente exista e retorna seu caminho absoluto.
+    Cria também subpastas opcionais para organização (uma vez por processo).
+    """
+    global _save_folders_ready
+    base = save_dir()
+    if _save_folders_ready == base:
+        return base
+    try:
+        os.makedirs(base, exist_ok=True)
+        os.makedirs(os.path.join(base, "SRAM"), exist_ok=True)
+        os.makedirs(os.path.join(base, "States"), exist_ok=True)
+        _save_folders_ready = base
+    except Exception:
+        logger.exception("Falha ao criar pastas de save persistentes")
+    return base
+
+def _patch_fullscreen_conf(emu_dir: str, width: int, height: int, logger) -> None:
+    """
+    Atualiza snes9x.conf ao lado do executável (no runtime):
+    - Stretch:Enabled = TRUE
+    - Stretch:MaintainAspectRatio = FALSE
+    - Fullscreen:Width/Height = resolução informada
+    - SaveFolder = <Saves persistente>
+
+    O arquivo fica em memória (app.emuconf) e só é regravado, de forma
+    atômica, quando algum valor realmente muda.
+    """
+    try:
+        conf_path = os.path.join(emu_dir, "snes9x.conf")
+        try:
+            save_folder = _ensure_save_folders(logger)
+            save_folder_norm = save_folder.replace("/", "\\")
+        except Exception:
+            save_folder_norm = save_dir().replace("/", "\\")
+
+        conf = Snes9xConf.load(conf_path)
+        with conf.lock:
+            conf.update({
+                "Stretch:Enabled": True,
+                "Stretch:MaintainAspectRatio": False,
+                "Fullscreen:Width": int(width),
+                "Fullscreen:Height": int(height),
+            }, section=DISPLAY_SECTION)
+            conf.set("SaveFolder", save_folder_norm, comment="Persistente")
+            if conf.save():
+                logger.info("snes9x.conf atualizado para %sx%s (%s)", width, height, conf_path)
+                logger.info("SaveFolder -> %s", save_folder_norm)
+    except Exception:
+        logger.exception("Falha ao ajustar snes9x.conf")
+
+class LaunchResult(NamedTuple):
+    """Resultado de um lançamento, entregue como dado (on_result) em vez de diálogo."""
+    status: str                    # "ok" ou o nome do erro
+    title: str = ""
+    message: str = ""
+    returncode: Optional[int] = None
+    trace_id: str = ""
+
+    @property
+    def ok(self) -> bool:
+        return self.status == "ok"
+
+class Launcher:
+    """
+    Lança jogos num JobPool (ou bloqueando, com block=True).
+
+    Em vez de sinais/diálogos, avisa por callbacks chamados na thread do
+    lançamento, sempre nesta ordem: on_started() (se o emulador chegou a
+    abrir), on_error(titulo, mensagem) (se falhou), on_result(LaunchResult)
+    e on_finished(). Cada lançamento é uma sessão com um Supervisor dono
+    dos vigias (fullscreen, ALT+ENTER, atalhos de app.hotkeys); ela só termina depois deles.
+    """
+
+    def __init__(self, logger, on_started=None, on_finished=None, on_error=None, on_result=None):
+        self.on_started = on_started
+        self.on_finished = on_finished
+        self.on_error = on_error
+        self.on_result = on_result
+        self.last_status = None
+        self.last_returncode = None
+        self.last_result: Optional[LaunchResult] = None
+        self.logger = logger
+        self._lock = threading.RLock()   # protege _process, tmpdir e _session
+        self._process = None
+        self.tmpdir = None
+        self._session: Optional[Supervisor] = None
+        self._pool = JobPool("launch", max_workers=8, logger=logger)
+        self._staging = None
+        self._catalog = None
+        self._emu_dir = None
+        # Prefetch: um só em andamento; lançar ou mudar a seleção o cancela
+        self._prefetch_pool = JobPool("prefetch", max_workers=1, logger=logger)
+        self._prefetch_lock = threading.Lock()
+        self._prefetch_job: Optional[Job] = None
+        self._prefetched = {}   # chave do staging -> ms gastos extraindo em segundo plano
+        self._prefetch_stats = {"launches": 0, "hits": 0, "saved_ms": 0.0}
+
+    @property
+    def process(self):
+        with self._lock:
+            return self._process
+
+    def is_running(self) -> bool:
+        with self._lock:
+            return self._session is not None
+
+    @property
+    def staging(self) -> StagingCache:
+        if self._staging is None:
+            mb = int(get_settings(save_dir()).get("staging_cache_mb", DEFAULTS["staging_cache_mb"]))
+            self._staging = StagingCache(cap_bytes=mb * 1024 * 1024, logger=self.logger)
+        return self._staging
+
+    @property
+    def catalog(self) -> Catalog:
+        """Catálogo próprio (conexão separada da GUI): só para achar a ROM base dos patches."""
+        if self._catalog is None:
+            self._catalog = Catalog()
+        return self._catalog
+
+    def _notify(self, cb, *args) -> None:
+        if cb is None:
+            return
+        try:
+            cb(*args)
+        except Exception:
+            self.logger.exception("Falha no callback do lançamento")
+
+    def prefetch(self, rom_zip_path: str, rom_inside_zip: Optional[str]) -> None:
+        """
+        Extrai em segundo plano (prioridade baixa) a ROM do jogo selecionado
+        para o staging, para que o "Executar" seguinte seja só um cache hit.
+        Um novo prefetch, cancel_prefetch() ou um lançamento cancelam o atual;
+        o lançamento nunca espera por ele.
+        """
+        def _target(cancel: CancelToken):
+            try:
+                import ctypes
+                # THREAD_PRIORITY_LOWEST: não disputa CPU com a GUI/emulador
+                # (a thread do pool "prefetch" só roda prefetch)
+                ctypes.windll.kernel32.SetThreadPriority(ctypes.windll.kernel32.GetCurrentThread(), -2)
+            except Exception:
+                pass
+            try:
+                path = _win_long(rom_zip_path)
+                with open_archive(path) as ar:
+                    chosen = ar.pick(rom_inside_zip)
+                    key = self.staging.key_for(path, chosen)
+                    if cancel.is_set() or os.path.exists(self.staging.path_for(key, chosen)):
+                        return
+                    t0 = time.perf_counter()
+                    # blocos menores que o padrão do formato: o cancelamento pega mais rápido
+                    self.staging.put(key, chosen, lambda dst: ar.copy(
+                        chosen, dst, cancel=cancel, chunk=min(ar.chunk, 256 * 1024) or None))
+                    ms = (time.perf_counter() - t0) * 1000
+                with self._prefetch_lock:
+                    self._prefetched[key] = ms
+                self.logger.info("Prefetch: %s pronto no staging (%.0f ms)", chosen, ms)
+            except Cancelled:
+                self.logger.debug("Prefetch cancelado: %s", rom_zip_path)
+            except Exception:
+                # Prefetch é só otimização: o lançamento refaz e mostra o erro
+                self.logger.debug("Prefetch falhou: %s", rom_zip_path, exc_info=True)
+
+        with self._prefetch_lock:
+            if self._prefetch_job is not None:
+                self._prefetch_job.cancel()
+            self._prefetch_job = self._prefetch_pool.submit("prefetch", _target)
+
+    def cancel_prefetch(self) -> None:
+        with self._prefetch_lock:
+            if self._prefetch_job is not None:
+                self._prefetch_job.cancel()
+                self._prefetch_job = None
+
+    def _note_launch(self, key: str, hit: bool) -> None:
+        with self._prefetch_lock:
+            st = self._prefetch_stats
+            st["launches"] += 1
+            saved = self._prefetched.pop(key, None) if hit else None
+            if saved is not None:
+                st["hits"] += 1
+                st["saved_ms"] += saved
+            self.logger.info("Prefetch: %d/%d lançamentos com acerto (%.0f%%), %.0f ms poupados no total",
+                             st["hits"], st["launches"], 100.0 * st["hits"] / st["launches"], st["saved_ms"])
+
+    def _enum_hwnds_for_pid(self, pid: int):
+        try:
+            import sys
+            if not sys.platform.startswith("win"):
+                return []
+            import ctypes
+            from ctypes import wintypes
+            user32 = ctypes.windll.user32
+            EnumWindows = user32.EnumWindows
+            EnumWindowsProc = ctypes.WINFUNCTYPE(wintypes.BOOL, wintypes.HWND, wintypes.LPARAM)
+            GetWindowThreadProcessId = user32.GetWindowThreadProcessId
+            matches = []
+            def _enum(hwnd, lParam):
+                pid_ret = wintypes.DWORD()
+                GetWindowThreadProcessId(hwnd, ctypes.byref(pid_ret))
+                if pid_ret.value == pid:
+                    matches.append(hwnd)
+                return True
+            EnumWindows(EnumWindowsProc(_enum), 0)
+            return matches
+        except Exception:
+            return []
+
+    def _try_fullscreen_window(self, pid: int, aggressive: bool = True) -> bool:
+        try:
+            import sys
+            if not sys.platform.startswith("win"):
+                return False
+            import ctypes
+            from ctypes import wintypes
+            import time as _t
+            user32 = ctypes.windll.user32
+            SetForegroundWindow = user32.SetForegroundWindow
+            ShowWindow = user32.ShowWindow
+            GetWindowRect = user32.GetWindowRect
+            SetWindowPos = user32.SetWindowPos
+            GetSystemMetrics = user32.GetSystemMetrics
+            SW_MAXIMIZE = 3
+            HWND_TOP = 0
+            HWND_TOPMOST = -1
+            SWP_NOOWNERZORDER = 0x0200
+            SWP_FRAMECHANGED = 0x0020
+            SWP_SHOWWINDOW = 0x0040
+            TOPMOST_FLAGS = SWP_NOOWNERZORDER | SWP_FRAMECHANGED | SWP_SHOWWINDOW
+            VK_MENU = 0x12
+            VK_RETURN = 0x0D
+            KEYEVENTF_KEYUP = 0x0002
+
+            matches = self._enum_hwnds_for_pid(pid)
+            if not matches:
+                return False
+
+            sw = GetSystemMetrics(0)
+            sh = GetSystemMetrics(1)
+
+            for hwnd in matches:
+                try:
+                    SetForegroundWindow(hwnd)
+                except Exception:
+                    pass
+                try:
+                    keybd_event = user32.keybd_event
+                    keybd_event(VK_MENU, 0, 0, 0)
+                    keybd_event(VK_RETURN, 0, 0, 0)
+                    keybd_event(VK_RETURN, 0, KEYEVENTF_KEYUP, 0)
+                    keybd_event(VK_MENU, 0, KEYEVENTF_KEYUP, 0)
+                except Exception:
+                    pass
+                _t.sleep(0.25)
+                try:
+                    rect = wintypes.RECT()
+                    if GetWindowRect(hwnd, ctypes.byref(rect)):
+                        w = rect.right - rect.left
+                        h = rect.bottom - rect.top
+                        if w >= sw - 2 and h >= sh - 2:
+                            return True
+                except Exception:
+                    pass
+                try:
+                    ShowWindow(hwnd, SW_MAXIMIZE)
+                    _t.sleep(0.15)
+                    rect = wintypes.RECT()
+                    if GetWindowRect(hwnd, ctypes.byref(rect)):
+                        w = rect.right - rect.left
+                        h = rect.bottom - rect.top
+                        if w >= sw - 2 and h >= sh - 2:
+                            return True
+                except Exception:
+                    pass
+                if aggressive:
+                    try:
+                        SetWindowPos(hwnd, HWND_TOPMOST, 0, 0, sw, sh, TOPMOST_FLAGS)
+                        _t.sleep(0.12)
+                        rect2 = wintypes.RECT()
+                        if GetWindowRect(hwnd, ctypes.byref(rect2)):
+                            w2 = rect2.right - rect2.left
+                            h2 = rect2.bottom - rect2.top
+                            if w2 >= sw - 2 and h2 >= sh - 2:
+                                SetWindowPos(hwnd, HWND_TOP, 0, 0, sw, sh, TOPMOST_FLAGS)
+                                return True
+                    except Exception:
+                        pass
+            return False
+        except Exception:
+            return False
+
+    def _fit_to_monitor(self, pid: int, logger) -> bool:
+        try:
+            import sys
+            if not sys.platform.startswith("win"):
+                return False
+            import ctypes
+            from ctypes import wintypes
+            import time as _t
+            user32 = ctypes.windll.user32
+            matches = self._enum_hwnds_for_pid(pid)
+            if not matches:
+                return False
+            MonitorFromWindow = user32.MonitorFromWindow
+            GetMonitorInfoW = user32.GetMonitorInfoW
+            class RECT(ctypes.Structure):
+                _fields_ = [('left', wintypes.LONG), ('top', wintypes.LONG),
+                            ('right', wintypes.LONG), ('bottom', wintypes.LONG)]
+            class MONITORINFO(ctypes.Structure):
+                _fields_ = [('cbSize', wintypes.DWORD), ('rcMonitor', RECT),
+                            ('rcWork', RECT), ('dwFlags', wintypes.DWORD)]
+            MONITOR_DEFAULTTONEAREST = 2
+            SetWindowPos = user32.SetWindowPos
+            HWND_TOP = 0
+            HWND_TOPMOST = -1
+            SWP_NOOWNERZORDER = 0x0200
+            SWP_FRAMECHANGED = 0x0020
+            SWP_SHOWWINDOW = 0x0040
+            FLAGS = SWP_NOOWNERZORDER | SWP_FRAMECHANGED | SWP_SHOWWINDOW
+            for hwnd in matches:
+                hmon = MonitorFromWindow(hwnd, MONITOR_DEFAULTTONEAREST)
+                mi = MONITORINFO()
+                mi.cbSize = ctypes.sizeof(mi)
+                if not GetMonitorInfoW(hmon, ctypes.byref(mi)):
+                    continue
+                l = mi.rcMonitor.left
+                t = mi.rcMonitor.top
+                r = mi.rcMonitor.right
+                b = mi.rcMonitor.bottom
+                w = r - l
+                h = b - t
+                SetWindowPos(hwnd, HWND_TOPMOST, l, t, w, h, FLAGS)
+                _t.sleep(0.10)
+                SetWindowPos(hwnd, HWND_TOP, l, t, w, h, FLAGS)
+                try:
+                    emu_dir = self._emu_dir or resolve_emulator_exe(logger)[1]
+                    _patch_fullscreen_conf(emu_dir, w, h, logger)
+                except Exception:
+                    pass
+                return True
+            return False
+        except Exception:
+            return False
+
+    def _enforce_fullscreen(self, proc, tr: Trace, token: CancelToken) -> None:
+        """Vigia: insiste no fullscreen/auto-fit por ~4s depois da abertura."""
+        for attempt in range(8):
+            if proc.poll() is not None:
+                return
+            if self._enum_hwnds_for_pid(proc.pid):
+                tr.mark("window_seen")
+            ok1 = self._try_fullscreen_window(proc.pid, aggressive=True)
+            ok2 = self._fit_to_monitor(proc.pid, self.logger)
+            self.logger.info("Fullscreen enforce -> %s | fit -> %s (%.0f ms desde o clique)",
+                             ok1, ok2, tr.elapsed_ms())
+            if ok1 or ok2:
+                tr.mark("fullscreen", attempt=attempt + 1, enforce=ok1, fit=ok2)
+                return
+            if token.wait(0.5):
+                return
+        tr.mark("fullscreen_failed")
+
+    @staticmethod
+    def _press_alt_enter() -> None:
+        import ctypes
+        user32 = ctypes.windll.user32
+        VK_MENU = 0x12
+        VK_RETURN = 0x0D
+        KEYEVENTF_KEYUP = 0x0002
+        user32.keybd_event(VK_MENU, 0, 0, 0)
+        user32.keybd_event(VK_RETURN, 0, 0, 0)
+        user32.keybd_event(VK_RETURN, 0, KEYEVENTF_KEYUP, 0)
+        user32.keybd_event(VK_MENU, 0, KEYEVENTF_KEYUP, 0)
+
+    def _on_long_press(self, key: str) -> None:
+        """Ação do atalho de segurar (app.hotkeys): alterna tela cheia."""
+        try:
+            self._press_alt_enter()
+            self.logger.info("Atalho %s segurado: ALT+ENTER enviado.", key)
+        except Exception:
+            pass
+
+    def _send_alt_enter_after(self, proc, token: CancelToken, delay_sec: float = 2.5) -> None:
+        """
+        Vigia: aguarda 'delay_sec' e envia ALT+ENTER uma ÚNICA vez.
+        Útil quando o emulador entra em fullscreen e logo "cai" para maximizado.
+        """
+        if token.wait(delay_sec) or proc.poll() is not None:
+            return
+        try:
+            self._press_alt_enter()
+            self.logger.info("ALT+ENTER enviado (gambiarra pós-abertura).")
+        except Exception:
+            pass
+
+    def _stage_zip(self, tr: Trace, rom_zip_path: str, rom_inside_zip: Optional[str]) -> str:
+        """Extrai (ou reaproveita do staging) a ROM do contêiner (ZIP, 7z, .gz...); retorna o caminho dela."""
+        self.logger.info("Staging dir: %s", self.staging.root)
+        try:
+            self.logger.info("Archive size: %s bytes", os.path.getsize(rom_zip_path))
+        except Exception:
+            pass
+
+        rom_zip_path_open = _win_long(rom_zip_path)
+        with tr.span("zip_open") as sp:
+            ar = open_archive(rom_zip_path_open)
+            sp["fmt"] = ar.kind
+        with ar:
+            chosen = ar.pick(rom_inside_zip)
+            with tr.span("extract", member=chosen, fmt=ar.kind) as sp:
+                # ROM já extraída antes (mesmo ZIP/tamanho/mtime/membro): reaproveita
+                key = self.staging.key_for(rom_zip_path_open, chosen)
+                dest_path = self.staging.get(key, chosen)
+                hit = sp["hit"] = dest_path is not None
+                if hit:
+                    self.logger.info("Staging: cache hit %s", dest_path)
+                else:
+                    # Passada única: só o membro escolhido é descomprimido, com a integridade
+                    # conferida durante a escrita (corrompido -> BadZipFile, nada entra no cache)
+                    t0 = time.perf_counter()
+                    n = 0
+                    def _write(dst):
+                        nonlocal n
+                        n = ar.copy(chosen, dst)
+                    dest_path = self.staging.put(key, chosen, _write)
+                    sec = time.perf_counter() - t0
+                    sp["mb_per_s"] = round(n / (1024 * 1024) / sec, 1) if sec else 0.0
+                    self.logger.info("Staging: ROM extraída para %s (%s, %.0f ms, %.1f MiB/s)",
+                                     dest_path, ar.kind, sec * 1000, sp["mb_per_s"])
+            self._note_launch(key, hit)
+        return dest_path
+
+    def _stage_patch(self, tr: Trace, patch_path: str) -> str:
+        """Aplica o patch sobre a ROM base (ou reaproveita do staging); retorna o caminho da ROM pronta."""
+        with tr.span("patch_base") as sp:
+            with open(_win_long(patch_path), "rb") as f:
+                patch = f.read()
+            base = find_base(self.catalog, os.path.relpath(patch_path, self.catalog.root), patch)
+            if base is None:
+                raise PatchError(f"ROM base não encontrada na biblioteca para {os.path.basename(patch_path)}"
+                                 " (nomeie o patch como a ROM base, ou rode 'python -m app hash' para achá-la pelo CRC32)")
+            tipo, base_rel, how = base
+            sp.update(base=base_rel, by=how)
+        base_path = os.path.join(self.catalog.root, base_rel)
+        # Nome próprio (o snes9x nomeia SRAM/states por ele: a tradução não divide save com a base)
+        out_name = stem(patch_path) + ".sfc"
+        with tr.span("patch", fmt=patch_kind(patch), base=base_rel) as sp:
+            st = os.stat(base_path)
+            ident = "|".join((os.path.normcase(os.path.abspath(base_path)), str(st.st_size),
+                              str(st.st_mtime_ns), out_name))
+            key = self.staging.key_for(_win_long(patch_path), ident)
+            dest_path = self.staging.get(key, out_name)
+            hit = sp["hit"] = dest_path is not None
+            if hit:
+                self.logger.info("Staging: patch já aplicado %s", dest_path)
+                return dest_path
+            t0 = time.perf_counter()
+            rom = apply_patch(read_rom(tipo, _win_long(base_path)), patch)
+            if snes_checksum_ok(rom) is False:
+                self.logger.warning("Patch %s: checksum interno da ROM resultante não confere (a tradução "
+                                    "pode não corrigi-lo, ou o patch é de outra versão da base)",
+                                    os.path.basename(patch_path))
+            dest_path = self.staging.put(key, out_name, lambda dst: dst.write(rom))
+            self.logger.info("Staging: %s + %s (%s, base por %s) em %.0f ms -> %s", base_rel,
+                             os.path.basename(patch_path), sp["fmt"], how,
+                             (time.perf_counter() - t0) * 1000, dest_path)
+        return dest_path
+
+    def _describe_error(self, e: Exception, rom_zip_path: Optional[str]) -> Tuple[str, str]:
+        """Loga a exceção e devolve (status, mensagem para o jogador)."""
+        if isinstance(e, PatchError):
+            self.logger.exception("Patch não aplicado: %s", e)
+            return "PatchError", f"Não foi possível aplicar o patch:\n{e}"
+        if rom_zip_path is None:
+            self.logger.exception("Erro ao executar ROM direta: %s", e)
+            return type(e).__name__, f"Erro ao executar ROM:\n{e}"
+        if isinstance(e, zipfile.BadZipFile):
+            self.logger.exception("Arquivo compactado inválido/corrompido: %s", e)
+            return "BadZipFile", f"Arquivo compactado inválido ou corrompido:\n{rom_zip_path}"
+        if isinstance(e, ModuleNotFoundError) and e.name == "py7zr":
+            self.logger.exception("Suporte a 7z ausente: %s", e)
+            return "ModuleNotFoundError", ("Este build não abre arquivos .7z (falta o py7zr).\n"
+                                           "Recompacte o jogo em ZIP ou atualize o build.")
+        if isinstance(e, (NotImplementedError, ModuleNotFoundError)):
+            self.logger.exception("Método de compressão do ZIP não suportado: %s", e)
+            return type(e).__name__, ("Método de compressão do ZIP não suportado no executável.\n"
+                                      "Recompacte o arquivo em 'Deflate' ou atualize o build com bz2/lzma.")
+        if isinstance(e, PermissionError):
+            self.logger.exception("Permissão negada: %s", e)
+            return "PermissionError", "Sem permissão para ler o arquivo do jogo ou escrever no TEMP."
+        if isinstance(e, OSError):
+            if getattr(e, "errno", None) == errno.ENOSPC:
+                msg = "Sem espaço em disco para extrair a ROM (TEMP/drive)."
+            else:
+                msg = f"Falha de E/S ao extrair: {e.strerror or e}"
+            self.logger.exception(msg)
+            return "OSError", msg
+        self.logger.exception("Erro ao executar ROM: %s", e)
+        return type(e).__name__, f"Erro ao executar ROM:\n{e}"
+
+    def _wait_process(self, proc, token: CancelToken) -> Optional[int]:
+        """Espera o emulador sair; com a sessão cancelada (saída do app) larga dele."""
+        while True:
+            try:
+                return proc.wait(timeout=0.25)
+            except subprocess.TimeoutExpired:
+                if token.is_set():
+                    self.logger.info("Sessão encerrada com o emulador ainda aberto (pid %s)", proc.pid)
+                    return None
+
+    def _finish(self, result: LaunchResult) -> None:
+        self.last_result = result
+        self.last_status = result.status
+        self.last_returncode = result.returncode
+        if not result.ok:
+            self._notify(self.on_error, result.title, result.message)
+        self._notify(self.on_result, result)
+        self._notify(self.on_finished)
+
+    def _launch(self, tr: Trace, prepare, fullscreen: bool, block: bool, rom_zip_path: Optional[str] = None):
+        """
+        Sessão de lançamento: prepare() devolve a ROM a abrir; o resto
+        (deploy, conf, Popen, vigias, espera) é igual para ZIP e ROM direta.
+        """
+        with self._lock:
+            session = None
+            if self._session is None:
+                session = self._session = Supervisor(self._pool, f"launch-{tr.id}", self.logger)
+        if session is None:
+            # Recusa direta: nada de _finish, que dispararia on_finished/on_error
+            # e trocaria last_result enquanto a sessão ativa ainda roda
+            tr.end("Busy")
+            self.logger.warning("Lançamento recusado: já há um jogo em execução.")
+            return "Busy"
+
+        def _target(token: CancelToken):
+            status, msg, rc = "ok", "", None
+            try:
+                rom_path = prepare()
+                with tr.span("deploy"):
+                    exe, emu_dir = resolve_emulator_exe(self.logger)
+                self._emu_dir = emu_dir
+                _ensure_save_folders(self.logger)
+                if fullscreen:
+                    with tr.span("conf_patch"):
+                        try:
+                            import ctypes
+                            w = ctypes.windll.user32.GetSystemMetrics(0)
+                            h = ctypes.windll.user32.GetSystemMetrics(1)
+                            _patch_fullscreen_conf(emu_dir, w, h, self.logger)
+                        except Exception:
+                            self.logger.exception("Não foi possível obter resolução primária")
+
+                cmd = [exe]
+                if fullscreen:
+                    cmd.append("--fullscreen")
+                cmd.append(rom_path)
+
+                if rom_zip_path is None:
+                    self.logger.info("Iniciando emulador (ROM direta): %s", cmd)
+                else:
+                    self.logger.info("Iniciando emulador: %s", cmd)
+                exe_long = _win_long(exe) if os.name == "nt" else exe
+                with tr.span("popen"):
+                    proc = subprocess.Popen([exe_long] + cmd[1:])
+                with self._lock:
+                    self._process = proc
+                tr.mark("process_started", pid=proc.pid)
+                self._notify(self.on_started)
+
+                if sys.platform.startswith("win"):
+                    session.watch("fullscreen", lambda tok: self._enforce_fullscreen(proc, tr, tok))
+                    session.watch("alt_enter", lambda tok: self._send_alt_enter_after(proc, tok, 2.5))
+                    hk = hotkeys.from_settings(get_settings(save_dir()), self._on_long_press, self.logger)
+                    if hk is not None:
+                        hk.attach(session)
+
+                rc = self._wait_process(proc, token)
+                tr.mark("exit", returncode=rc)
+            except Exception as e:
+                status, msg = self._describe_error(e, rom_zip_path)
+            finally:
+                session.close()
+                # A ROM extraída fica no staging (cache LRU) para a próxima vez
+                tr.end(status)
+                with self._lock:
+                    self._process = None
+                    self.tmpdir = None
+                    self._session = None
+                self._finish(LaunchResult(status, "Erro" if msg else "", msg, rc, tr.id))
+            return status
+
+        if block:
+            return _target(session.token)
+        self._pool.submit("launch", _target, session.token)
+
+    def run(self, rom_zip_path: str, rom_inside_zip: Optional[str], fullscreen: bool,
+            trace: Optional[Trace] = None, block: bool = False):
+        """
+        Extrai a ROM selecionada para o staging (cache), lança o emulador e força fullscreen/auto-fit.
+        Também garante SaveFolder persistente fora do runtime.
+        Cada etapa vira um span do `trace` (app.tracing), criado aqui se não vier da GUI.
+        Com block=True roda na thread atual e retorna o status ("ok" ou o erro).
+        Se já há um jogo em execução retorna "Busy" (também sem block) e não
+        chama nenhum callback: a sessão ativa segue dona de last_result.
+        """
+        self.cancel_prefetch()
+        tr = trace or Trace("launch", tipo="zip", path=rom_zip_path)
+        return self._launch(tr, lambda: self._stage_zip(tr, rom_zip_path, rom_inside_zip),
+                            fullscreen, block, rom_zip_path=rom_zip_path)
+
+    def run_with_type(self, tipo: str, path: str, rom_inside_zip: Optional[str], fullscreen: bool,
+                      trace: Optional[Trace] = None, block: bool = False):
+        """
+        tipo = "zip", "rom" ou "patch"
+        - zip: contêiner (ZIP, 7z, .sfc.gz...; ver app.archives), fluxo de extração (run)
+        - rom: executa o arquivo diretamente (.sfc/.smc/.fig/.swc)
+        - patch: IPS/BPS/UPS aplicado na hora sobre a ROM base (app.patches)
+        """
+        if tipo == "zip":
+            return self.run(path, rom_inside_zip, fullscreen, trace=trace, block=block)
+        if tipo == "patch":
+            self.cancel_prefetch()
+            tr = trace or Trace("launch", tipo=tipo, path=path)
+            return self._launch(tr, lambda: self._stage_patch(tr, path), fullscreen, block, rom_zip_path=path)
+        tr = trace or Trace("launch", tipo=tipo, path=path)
+        return self._launch(tr, lambda: path, fullscreen, block)
+
+    def shutdown(self) -> None:
+        """Saída do app: cancela prefetch e vigias e larga o emulador (que segue aberto)."""
+        self.cancel_prefetch()
+        with self._lock:
+            session = self._session
+        if session is not None:
+            session.cancel()
+        self._prefetch_pool.shutdown(wait=False)
+        self._pool.shutdown(wait=False)
+        if self._catalog is not None:
+            self._catalog.close()
+
+    def stop(self):
+        """
+        Fecha o emulador de forma amigável e, se necessário, força encerramento.
+        Tolerante a condição de corrida (self.process pode virar None enquanto executa).
+        """
+        try:
+            proc = getattr(self, "process", None)
+            if not proc:
+                return
+            try:
+                if proc.poll() is not None:
+                    return
+            except Exception:
+                return
+
+            import sys
+            if sys.platform.startswith("win"):
+                import ctypes
+                from ctypes import wintypes
+                import time as _t
+                user32 = ctypes.windll.user32
+                PostMessageW = user32.PostMessageW
+                WM_CLOSE = 0x0010
+
+                try:
+                    pid = getattr(proc, "pid", None)
+                    if pid is not None:
+                        matches = self._enum_hwnds_for_pid(pid)
+                        for hwnd in matches:
+                            try:
+                                PostMessageW(hwnd, WM_CLOSE, 0, 0)
+                            except Exception:
+                                pass
+                except Exception:
+                    pass
+
+                for _ in range(10):
+                    proc_now = getattr(self, "process", None) or proc
+                    try:
+                        if not proc_now or proc_now.poll() is not None:
+                            break
+                    except Exception:
+                        break
+                    _t.sleep(0.1)
+
+                proc_now = getattr(self, "process", None) or proc
+                try:
+                    if proc_now and proc_now.poll() is None:
+                        proc_now.terminate()
+                except Exception:
+                    pass
+
+                for _ in range(10):
+                    proc_now = getattr(self, "process", None) or proc
+                    try:
+                        if not proc_now or proc_now.poll() is not None:
+                            break
+                    except Exception:
+                        break
+                    _t.sleep(0.1)
+
+                proc_now = getattr(self, "process", None) or proc
+                try:
+                    if proc_now and proc_now.poll() is None:
+                        proc_now.kill()
+                except Exception:
+                    pass
+        except Exception:
+            self.logger.exception("Erro ao terminar emulador")
@@ -1,17 +1,147 @@
-import os, sys, logging
+import os, sys, json, queue, atexit, logging, threading, logging.handlers
+
+TEXT_FORMAT = "%(asctime)s %(levelname)s: %(message)s"
+
+class JsonFormatter(logging.Formatter):
+    """Uma linha JSON por registro (log_format = "json")."""
+
+    def format(self, record: logging.LogRecord) -> str:
+        data = {
+            "ts": self.formatTime(record, "%Y-%m-%dT%H:%M:%S") + f".{int(record.msecs):03d}",
+            "level": record.levelname,
+            "logger": record.name,
+            "thread": record.threadName,
+            "msg": record.getMessage(),
+        }
+        if record.exc_text:
+            data["exc"] = record.exc_text
+        return json.dumps(data, ensure_ascii=False)
+
+class DroppingQueueHandler(logging.handlers.QueueHandler):
+    """
+    Só enfileira (put_nowait): quem loga nunca espera por disco. Com a fila
+    cheia o registro é descartado e contado; o total vai para o log assim
+    que houver espaço de novo.
+    """
+
+    def __init__(self, q: queue.Queue):
+        super().__init__(q)
+        self.dropped = 0
+        self._unreported = 0
+        self._lock = threading.Lock()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        # Resolve mensagem/exceção aqui (os args podem mudar depois), mas sem
+        # formatar: o formatter (texto ou JSON) fica com o listener
+        record.message = record.getMessage()
+        if record.exc_info and not record.exc_text:
+            record.exc_text = logging.Formatter().formatException(record.exc_info)
+        record.msg, record.args, record.exc_info = record.message, None, None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+                self._unreported += 1
+            return
+        if self._unreported:
+            with self._lock:
+                n, self._unreported = self._unreported, 0
+            try:
+                self.queue.put_nowait(self._drop_record(record.name, n))
+            except queue.Full:
+                with self._lock:
+                    self._unreported += n
+
+    def _drop_record(self, name: str, n: int) -> logging.LogRecord:
+        return self.prepare(logging.LogRecord(name, logging.WARNING, __file__, 0,
+                                              "Log: %d registros descartados (fila cheia)", (n,), None))
+
+    def report_drops(self) -> None:
+        """Na saída: registra (esperando a fila) descartes ainda não informados."""
+        with self._lock:
+            n, self._unreported = self._unreported, 0
+        if n:
+            self.queue.put(self._drop_record("SNESLauncher", n))
+
+class _Listener(logging.handlers.QueueListener):
+    def enqueue_sentinel(self) -> None:
+        # Na saída pode esperar a fila andar (a padrão falharia com a fila cheia)
+        self.queue.put(self._sentinel)
+
+_pipeline = None   # (handler, listener)
+
+def _file_handler(log_file: str, settings) -> logging.Handler:
+    backups = int(settings.get("log_backups", 3))
+    if settings.get("log_rotate", "size") == "midnight":
+        return logging.handlers.TimedRotatingFileHandler(log_file, when="midnight",
+                                                         backupCount=backups, encoding="utf-8")
+    max_bytes = int(float(settings.get("log_max_mb", 5)) * 1024 * 1024)
+    return logging.handlers.RotatingFileHandler(log_file, maxBytes=max_bytes,
+                                                backupCount=backups, encoding="utf-8")
 
 def setup_logger(save_path: str) -> logging.Logger:
-    os.makedirs(save_path, exist_ok=True)
-    log_file = os.path.join(save_path, "SNES.log")
+    """
+    Logger do app com escrita assíncrona: os registros vão para uma fila
+    limitada e UMA thread (QueueListener) grava em Saves/SNES.log, com
+    rotação por tamanho (log_max_mb/log_backups) ou diária
+    (log_rotate = "midnight"), em texto ou JSON lines (log_format = "json").
+    """
+    global _pipeline
     logger = logging.getLogger("SNESLauncher")
-    logger.setLevel(logging.INFO)
-    fmt = logging.Formatter("%(asctime)s %(levelname)s: %(message)s")
-    fh = logging.FileHandler(log_file, encoding="utf-8")
-    fh.setFormatter(fmt); logger.addHandler(fh)
+    if _pipeline is not None:
+        return logger
+    from app.config import get_settings
+    os.makedirs(save_path, exist_ok=True)
+    settings = get_settings(save_path)
+    fmt = JsonFormatter() if settings.get("log_format", "text") == "json" else logging.Formatter(TEXT_FORMAT)
+
+    handlers = []
+    try:
+        fh = _file_handler(os.path.join(save_path, "SNES.log"), settings)
+        fh.setFormatter(fmt); handlers.append(fh)
+    except Exception:
+        pass
     try:
         if sys.stderr:
             sh = logging.StreamHandler(); sh.setFormatter(fmt)
-            logger.addHandler(sh)
+            handlers.append(sh)
     except Exception:
         pass
+
+    q = queue.Queue(maxsize=int(settings.get("log_queue_size", 10000)))
+    qh = DroppingQueueHandler(q)
+    listener = _Listener(q, *handlers, respect_handler_level=True)
+    listener.start()
+    _pipeline = (qh, listener)
+    atexit.register(shutdown_logging)
+
+    logger.setLevel(logging.INFO)
+    logger.addHandler(qh)
     return logger
+
+def log_stats() -> dict:
+    if _pipeline is None:
+        return {"queued": 0, "dropped": 0}
+    qh, _ = _pipeline
+    return {"queued": qh.queue.qsize(), "dropped": qh.dropped}
+
+def shutdown_logging() -> None:
+    """Esvazia a fila e para o listener (chamado na saída)."""
+    global _pipeline
+    if _pipeline is None:
+        return
+    qh, listener = _pipeline
+    _pipeline = None
+    logging.getLogger("SNESLauncher").removeHandler(qh)
+    qh.report_drops()
+    try:
+        listener.stop()
+    except Exception:
+        pass
+    for h in listener.handlers:
+        try: h.close()
+        except Exception: pass
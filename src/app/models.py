@@ -0,0 +1,179 @@
+import bisect
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QSortFilterProxyModel
+from PySide6.QtGui import QColor
+
+# app.catalog/app.archives/app.romheader (sqlite3, zipfile...) só nos métodos:
+# a GUI importa este módulo antes do primeiro quadro e usa os modelos vazios
+
+_TIPOS = ("zip", "rom", "patch")
+_TAG_SUFFIX = {"verified": "  ✓", "bad": "  ✗", "duplicate": "  (duplicado)"}
+_TAG_COLOR = {"bad": "#e57373", "duplicate": "#9e9e9e"}
+
+def _tag_text(tag) -> str:
+    if not tag:
+        return ""
+    if tag["tag"] == "duplicate":
+        return f"Duplicado de {tag['duplicate_of']}"
+    text = {"verified": "Dump verificado", "bad": "Dump ruim/alterado", "unknown": "Fora do DAT"}[tag["tag"]]
+    return f"{text}: {tag['game']}" if tag.get("game") else text
+
+class GameListModel(QAbstractListModel):
+    """
+    Lista de jogos sobre arrays paralelos (rótulo, chave, caminho, tipo),
+    sempre na ordem do catálogo: (sort_key, caminho_relativo).
+
+    Nada de QListWidgetItem por jogo: a view só pede data() das linhas
+    visíveis. Deltas do catálogo viram inserções/remoções pontuais; lotes
+    grandes (p.ex. primeira varredura) viram um reset único.
+    """
+    GameRole = Qt.UserRole
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._labels: list[str] = []
+        self._keys: list[str] = []
+        self._paths: list[str] = []
+        self._tipos = bytearray()
+        self._headers: dict = {}   # rel_path -> cabeçalho (app.romheader), só para a dica
+        self._tags: dict = {}      # rel_path -> marca do DAT/duplicata (app.dat.tag_library)
+
+    # --- API Qt ---
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._paths)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row = index.row()
+        if role == Qt.DisplayRole:
+            tag = self._tags.get(self._paths[row])
+            return self._labels[row] + _TAG_SUFFIX.get(tag["tag"], "") if tag else self._labels[row]
+        if role == self.GameRole:
+            return (_TIPOS[self._tipos[row]], self._paths[row])
+        if role == Qt.ToolTipRole:
+            from app.romheader import summary
+            lines = [self._paths[row], summary(self._headers.get(self._paths[row])),
+                     _tag_text(self._tags.get(self._paths[row]))]
+            return "\n".join(l for l in lines if l)
+        if role == Qt.ForegroundRole:
+            tag = self._tags.get(self._paths[row])
+            color = _TAG_COLOR.get(tag["tag"]) if tag else None
+            return QColor(color) if color else None
+        return None
+
+    # --- acesso direto ---
+    def set_headers(self, headers: dict) -> None:
+        self._headers = headers
+
+    def set_tags(self, tags: dict) -> None:
+        self._tags = tags
+        if self._paths:
+            self.dataChanged.emit(self.index(0), self.index(len(self._paths) - 1),
+                                  [Qt.DisplayRole, Qt.ForegroundRole, Qt.ToolTipRole])
+
+    def tag(self, rel_path: str):
+        return self._tags.get(rel_path)
+
+    def header(self, rel_path: str):
+        return self._headers.get(rel_path)
+
+    def entry(self, row: int) -> tuple[str, str]:
+        return _TIPOS[self._tipos[row]], self._paths[row]
+
+    def key(self, row: int) -> str:
+        return self._keys[row]
+
+    def path(self, row: int) -> str:
+        return self._paths[row]
+
+    def row_of(self, rel_path: str) -> int:
+        """Linha do caminho relativo, ou -1."""
+        from app.catalog import sort_key
+        pos = self._bisect(sort_key(rel_path), rel_path)
+        if pos < len(self._paths) and self._paths[pos] == rel_path:
+            return pos
+        return -1
+
+    def _bisect(self, key: str, rel_path: str) -> int:
+        return bisect.bisect_left(range(len(self._paths)), (key, rel_path),
+                                  key=lambda i: (self._keys[i], self._paths[i]))
+
+    # --- carga / deltas ---
+    def reset(self, entries) -> None:
+        """entries: (tipo, caminho_relativo) já ordenados como no catálogo."""
+        from app.archives import stem
+        self.beginResetModel()
+        self._labels, self._keys, self._paths = [], [], []
+        self._tipos = bytearray()
+        for tipo, rel in entries:
+            label = stem(rel)
+            self._labels.append(label)
+            self._keys.append(label.lower())
+            self._paths.append(rel)
+            self._tipos.append(_TIPOS.index(tipo))
+        self.endResetModel()
+
+    def apply_delta(self, delta) -> None:
+        from app.archives import stem
+        from app.catalog import sort_key
+        for _, rel in delta.removed:
+            row = self.row_of(rel)
+            if row < 0:
+                continue
+            self.beginRemoveRows(QModelIndex(), row, row)
+            del self._labels[row], self._keys[row], self._paths[row], self._tipos[row]
+            self.endRemoveRows()
+
+        added = [g for g in delta.added if self.row_of(g[1]) < 0]
+        if not added:
+            return
+        if len(added) > 64 and len(added) * 8 > len(self._paths):
+            # Muitas entradas novas: merge ordenado + um único reset
+            merged = [self.entry(i) for i in range(len(self._paths))] + added
+            merged.sort(key=lambda g: (sort_key(g[1]), g[1]))
+            self.reset(merged)
+            return
+        for tipo, rel in added:
+            label = stem(rel)
+            row = self._bisect(label.lower(), rel)
+            self.beginInsertRows(QModelIndex(), row, row)
+            self._labels.insert(row, label)
+            self._keys.insert(row, label.lower())
+            self._paths.insert(row, rel)
+            self._tipos.insert(row, _TIPOS.index(tipo))
+            self.endInsertRows()
+
+class GameFilterProxy(QSortFilterProxyModel):
+    """
+    Filtro sobre o GameListModel: só decide QUAIS linhas aparecem e em que
+    ordem (ranking da busca), sem copiar nada. O mapeamento de índices é
+    mantido pelo Qt e reaproveitado entre filtragens.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._rank = None  # {caminho_relativo: posição} ou None = tudo, ordem do catálogo
+
+    def set_results(self, paths) -> None:
+        """paths: caminhos ranqueados (SearchIndex.search) ou None para mostrar tudo."""
+        if paths is None and self._rank is None:
+            return
+        if paths is None:
+            # Desliga a ordenação antes de soltar o ranking (lessThan depende dele)
+            self.sort(-1)
+            self._rank = None
+            self.invalidateFilter()
+            return
+        self._rank = {p: i for i, p in enumerate(paths)}
+        self.invalidateFilter()
+        self.sort(0)
+
+    def filterAcceptsRow(self, source_row: int, source_parent) -> bool:
+        return self._rank is None or self.sourceModel().path(source_row) in self._rank
+
+    def lessThan(self, left, right) -> bool:
+        if self._rank is None:
+            return left.row() < right.row()
+        src = self.sourceModel()
+        n = len(self._rank)
+        return self._rank.get(src.path(left.row()), n) < self._rank.get(src.path(right.row()), n)
@@ -0,0 +1,280 @@
+# src/app/patches.py
+"""
+Patches IPS/BPS/UPS aplicados na hora do lançamento: a biblioteca guarda a
+ROM base uma vez e cada tradução/hack como um arquivo de patch ao lado
+(tipo "patch" no catálogo), em vez de N cópias inteiras da mesma ROM.
+
+- a base é achada pelo CRC32 de origem que BPS/UPS carregam (contra os
+  hashes do catálogo, app.hashing) ou pelo nome: "Jogo (USA) (PT-BR).bps"
+  procura "Jogo (USA) (PT-BR)", "Jogo (USA)", depois "Jogo", tirando as
+  tags do fim;
+- BPS/UPS conferem CRC32 da origem, do resultado e do próprio patch; IPS
+  não tem checksum (a ROM aplicada é conferida pelo checksum interno do
+  SNES, só como aviso: traduções nem sempre o corrigem);
+- base com cabeçalho de copiadora (.smc): BPS/UPS escolhem pelo CRC32; o
+  IPS é aplicado sem o cabeçalho (o usual hoje) e, se o checksum interno
+  não bater, também com ele (patches antigos feitos sobre a .smc);
+- tudo em operações de buffer (fatias de bytearray/memoryview, XOR de
+  blocos como inteiros): laço em Python só por registro/comando, nunca por
+  byte. O resultado vai para o staging (app.staging), com o LRU de lá.
+"""
+import os, re, time, zlib
+from typing import Optional
+
+from app.archives import open_archive, stem
+from app.romheader import copier_offset, parse_header, rom_checksum
+
+PATCH_EXTS = (".ips", ".bps", ".ups")
+_MAGIC = {b"PATCH": "ips", b"BPS1": "bps", b"UPS1": "ups"}
+_TRAILING_TAG = re.compile(r"\s*[\(\[][^\)\]]*[\)\]]\s*$")
+
+class PatchError(Exception):
+    """Patch inválido, truncado ou feito para outra ROM base."""
+
+def patch_kind(patch: bytes) -> str:
+    for magic, kind in _MAGIC.items():
+        if patch.startswith(magic):
+            return kind
+    raise PatchError("Formato de patch desconhecido (esperado IPS, BPS ou UPS)")
+
+def _varint(buf, p: int) -> tuple[int, int]:
+    """Número de tamanho variável do byuu (BPS/UPS). Retorna (valor, nova posição)."""
+    data, shift = 0, 1
+    while True:
+        try:
+            x = buf[p]
+        except IndexError:
+            raise PatchError("Patch truncado") from None
+        p += 1
+        data += (x & 0x7F) * shift
+        if x & 0x80:
+            return data, p
+        shift <<= 7
+        data += shift
+
+def _footer(patch: bytes) -> tuple[int, int, int]:
+    """(crc origem, crc resultado, crc do patch) dos 12 bytes finais de BPS/UPS."""
+    if len(patch) < 12:
+        raise PatchError("Patch truncado")
+    n = len(patch)
+    src, dst, own = (int.from_bytes(patch[i:i + 4], "little") for i in (n - 12, n - 8, n - 4))
+    if zlib.crc32(memoryview(patch)[:-4]) != own:
+        raise PatchError("Patch corrompido (CRC32 do próprio arquivo não confere)")
+    return src, dst, own
+
+def source_crc(patch: bytes) -> Optional[str]:
+    """CRC32 (hex, minúsculo) da ROM base que o patch espera; None para IPS."""
+    if patch_kind(patch) == "ips" or len(patch) < 12:
+        return None
+    return f"{int.from_bytes(patch[-12:-8], 'little'):08x}"
+
+def _pick_source(source: bytes, want: int) -> memoryview:
+    """A base como está ou sem o cabeçalho de copiadora, a que tiver o CRC esperado."""
+    view = memoryview(source)
+    if zlib.crc32(view) == want:
+        return view
+    off = copier_offset(len(source))
+    if off and zlib.crc32(view[off:]) == want:
+        return view[off:]
+    raise PatchError("A ROM base não é a que o patch espera (CRC32 diferente)")
+
+def apply_ips(source: bytes, patch: bytes) -> bytearray:
+    off = copier_offset(len(source))
+    if not off:
+        return _ips_into(bytearray(source), patch)
+    # Sem CRC no IPS: vale o checksum interno para decidir se os
+    # deslocamentos contam com o cabeçalho de copiadora ou não
+    stripped = _ips_into(bytearray(memoryview(source)[off:]), patch)
+    if snes_checksum_ok(stripped):
+        return stripped
+    headered = _ips_into(bytearray(source), patch)
+    if snes_checksum_ok(headered):
+        del headered[:off]
+        return headered
+    return stripped
+
+def _ips_into(out: bytearray, patch: bytes) -> bytearray:
+    """Aplica os registros IPS sobre `out` (no lugar)."""
+    p, n = 5, len(patch)
+    while True:
+        if p + 3 > n:
+            raise PatchError("IPS truncado (sem EOF)")
+        if patch[p:p + 3] == b"EOF":
+            p += 3
+            if p + 3 <= n:   # extensão: tamanho final do arquivo
+                del out[int.from_bytes(patch[p:p + 3], "big"):]
+            return out
+        if p + 5 > n:
+            raise PatchError("IPS truncado")
+        off = int.from_bytes(patch[p:p + 3], "big")
+        size = int.from_bytes(patch[p + 3:p + 5], "big")
+        p += 5
+        if size == 0:   # RLE: (tamanho, valor)
+            if p + 3 > n:
+                raise PatchError("IPS truncado")
+            size = int.from_bytes(patch[p:p + 2], "big")
+            data = patch[p + 2:p + 3] * size
+            p += 3
+        else:
+            data = patch[p:p + size]
+            if len(data) < size:
+                raise PatchError("IPS truncado")
+            p += size
+        end = off + size
+        if end > len(out):
+            out.extend(bytes(end - len(out)))
+        out[off:end] = data
+
+def apply_ups(source: bytes, patch: bytes) -> bytearray:
+    want_src, want_dst, _ = _footer(patch)
+    src_size, p = _varint(patch, 4)
+    dst_size, p = _varint(patch, p)
+    src = _pick_source(source, want_src)
+    if len(src) != src_size:
+        raise PatchError("A ROM base não tem o tamanho que o patch espera")
+    out = bytearray(dst_size)
+    out[:min(src_size, dst_size)] = src[:dst_size]
+    pos, end = 0, len(patch) - 12
+    while p < end:
+        skip, p = _varint(patch, p)
+        pos += skip
+        stop = patch.find(b"\0", p, end)
+        if stop < 0:
+            raise PatchError("UPS truncado")
+        n = stop - p
+        if n:
+            if pos + n > dst_size:
+                raise PatchError("UPS escreve além do fim da ROM")
+            # XOR do bloco inteiro de uma vez (inteiros grandes), não byte a byte
+            x = int.from_bytes(out[pos:pos + n], "little") ^ int.from_bytes(patch[p:stop], "little")
+            out[pos:pos + n] = x.to_bytes(n, "little")
+        pos += n + 1
+        p = stop + 1
+    if zlib.crc32(out) != want_dst:
+        raise PatchError("ROM resultante não confere com o patch (CRC32)")
+    return out
+
+def apply_bps(source: bytes, patch: bytes) -> bytearray:
+    want_src, want_dst, _ = _footer(patch)
+    src_size, p = _varint(patch, 4)
+    dst_size, p = _varint(patch, p)
+    meta, p = _varint(patch, p)
+    p += meta
+    src = _pick_source(source, want_src)
+    if len(src) != src_size:
+        raise PatchError("A ROM base não tem o tamanho que o patch espera")
+    pv = memoryview(patch)
+    out = bytearray(dst_size)
+    pos = src_rel = dst_rel = 0
+    end = len(patch) - 12
+    while p < end:
+        data, p = _varint(patch, p)
+        cmd, length = data & 3, (data >> 2) + 1
+        if pos + length > dst_size:
+            raise PatchError("BPS escreve além do fim da ROM")
+        if cmd == 0:     # SourceRead
+            if pos + length > src_size:
+                raise PatchError("BPS lê além do fim da ROM base")
+            out[pos:pos + length] = src[pos:pos + length]
+        elif cmd == 1:   # TargetRead
+            if p + length > end:
+                raise PatchError("BPS truncado")
+            out[pos:pos + length] = pv[p:p + length]
+            p += length
+        else:
+            d, p = _varint(patch, p)
+            delta = -(d >> 1) if d & 1 else d >> 1
+            if cmd == 2:     # SourceCopy
+                src_rel += delta
+                if src_rel < 0 or src_rel + length > src_size:
+                    raise PatchError("BPS copia fora da ROM base")
+                out[pos:pos + length] = src[src_rel:src_rel + length]
+                src_rel += length
+            else:            # TargetCopy (pode sobrepor o que está sendo escrito: repete o período)
+                dst_rel += delta
+                if dst_rel < 0 or dst_rel >= pos:
+                    raise PatchError("BPS copia de fora do resultado")
+                if dst_rel + length <= pos:
+                    out[pos:pos + length] = out[dst_rel:dst_rel + length]
+                else:
+                    period = bytes(out[dst_rel:pos])
+                    out[pos:pos + length] = (period * (length // len(period) + 1))[:length]
+                dst_rel += length
+        pos += length
+    if pos != dst_size or zlib.crc32(out) != want_dst:
+        raise PatchError("ROM resultante não confere com o patch (CRC32)")
+    return out
+
+_APPLY = {"ips": apply_ips, "bps": apply_bps, "ups": apply_ups}
+
+def apply_patch(source: bytes, patch: bytes) -> bytearray:
+    """Aplica o patch (formato pelo cabeçalho). PatchError se não servir para esta base."""
+    return _APPLY[patch_kind(patch)](source, patch)
+
+def snes_checksum_ok(rom) -> Optional[bool]:
+    """Checksum interno do SNES confere com o cabeçalho? None se não achar cabeçalho."""
+    info = parse_header(rom, len(rom))
+    if info is None:
+        return None
+    return rom_checksum(rom, len(rom)) == info["checksum"]
+
+def base_candidates(rel_path: str) -> list[str]:
+    """Nomes (sort_key) da base pelo nome do patch: o nome inteiro, depois tirando uma tag do fim por vez."""
+    name = stem(rel_path).strip()
+    out = [name.lower()] if name else []
+    while True:
+        shorter = _TRAILING_TAG.sub("", name)
+        if not shorter or shorter == name:
+            return out
+        name = shorter
+        out.append(name.lower())
+
+def find_base(catalog, rel_path: str, patch: Optional[bytes] = None) -> Optional[tuple[str, str, str]]:
+    """
+    (tipo, rel_path, "crc"|"nome") da ROM base do patch, ou None.
+    Primeiro pelo CRC32 de origem (BPS/UPS, se a biblioteca já foi
+    hasheada), depois pelo nome; na dúvida, a da mesma pasta do patch.
+    """
+    folder = os.path.dirname(rel_path)
+
+    def _best(rows):
+        rows = [r for r in rows if r[0] != "patch"]
+        rows.sort(key=lambda r: (os.path.dirname(r[1]) != folder, r[1]))
+        return rows[0] if rows else None
+
+    crc = source_crc(patch) if patch is not None else None
+    if crc:
+        hit = _best(catalog.find_by_crc32(crc))
+        if hit:
+            return hit[0], hit[1], "crc"
+    for key in base_candidates(rel_path):
+        hit = _best(catalog.find_by_sort_key(key))
+        if hit:
+            return hit[0], hit[1], "nome"
+    return None
+
+def read_rom(tipo: str, path: str) -> bytes:
+    """ROM base inteira na memória: arquivo solto ou a primeira ROM do contêiner."""
+    if tipo != "zip":
+        with open(path, "rb") as f:
+            return f.read()
+    buf = bytearray()
+    with open_archive(path) as ar:
+        ar.stream(ar.pick(None), buf.extend)
+    return bytes(buf)
+
+def check_patch(catalog, rel_path: str) -> dict:
+    """
+    Acha a base e aplica o patch só na memória (verify/patches da CLI).
+    {"base", "by", "fmt", "size", "ms", "checksum_ok"}; PatchError se não der.
+    """
+    with open(os.path.join(catalog.root, rel_path), "rb") as f:
+        patch = f.read()
+    base = find_base(catalog, rel_path, patch)
+    if base is None:
+        raise PatchError("ROM base não encontrada na biblioteca")
+    tipo, base_rel, how = base
+    t0 = time.perf_counter()
+    rom = apply_patch(read_rom(tipo, os.path.join(catalog.root, base_rel)), patch)
+    return {"base": base_rel, "by": how, "fmt": patch_kind(patch), "size": len(rom),
+            "ms": round((time.perf_counter() - t0) * 1000, 1), "checksum_ok": snes_checksum_ok(rom)}
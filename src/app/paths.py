@@ -1,4 +1,10 @@
 import os, sys, tempfile
+
+# Sobrescrevem as pastas/o emulador (benchmarks com biblioteca sintética, testes manuais)
+ROMS_ENV = "SNES_ROMS"
+SAVES_ENV = "SNES_SAVES"
+EMULATOR_ENV = "SNES_EMULATOR"
+
 def is_frozen() -> bool:
     return getattr(sys, "frozen", False)
 
@@ -11,15 +17,21 @@ def package_data_dir() -> str:
     return os.path.dirname(os.path.abspath(__file__))
 
 def save_dir() -> str:
+    if os.environ.get(SAVES_ENV):
+        return os.environ[SAVES_ENV]
     return os.path.join(app_base_dir(), "Saves")
 
 def rom_root() -> str:
+    if os.environ.get(ROMS_ENV):
+        return os.environ[ROMS_ENV]
     candidate_pkg = os.path.join(package_data_dir(), "Roms")
     if os.path.isdir(candidate_pkg):
         return candidate_pkg
     return os.path.join(app_base_dir(), "Roms")
 
 def emulator_packaged_path() -> str:
+    if os.environ.get(EMULATOR_ENV):
+        return os.environ[EMULATOR_ENV]
     p = os.path.join(package_data_dir(), "snes9x-x64.exe")
     return p if os.path.exists(p) else os.path.join(app_base_dir(), "snes9x-x64.exe")
 
@@ -0,0 +1,230 @@
+# src/app/romheader.py
+"""
+Cabeçalho interno das ROMs de SNES (título, mapeamento, tamanhos, região,
+coprocessador, checksum) e o índice desses dados no catálogo.
+
+- ROM solta: lida via mmap (só as páginas do cabeçalho saem do disco);
+- ROM dentro de contêiner (ZIP, 7z, .sfc.gz...; app.archives): leitura
+  limitada do membro (64 KiB, ou 4 MiB + 64 KiB quando pode ser ExHiROM);
+  só bz2/xz, que não guardam o tamanho, descomprimem até o fim (contando);
+- cabeçalho de copiadora (512 bytes extras, comum em .smc) é detectado
+  pelo tamanho (resto 512 na divisão por 1024) e pulado.
+
+index_headers() só lê o que mudou desde a última vez (tamanho/mtime no
+catálogo) e distribui os arquivos num pool de processos.
+"""
+import os, mmap, time, zlib
+from typing import Optional
+
+from app.jobs import map_processes
+from app.archives import open_archive
+
+COPIER_SIZE = 512
+# Onde o cabeçalho fica em cada mapeamento, e os nibbles de map_mode aceitos ali
+_LAYOUTS = (
+    ("LoROM", 0x7FC0, (0x0, 0x2, 0x3)),     # 3: SA-1, 2: S-DD1/ExLoROM
+    ("HiROM", 0xFFC0, (0x1, 0xA)),          # A: SPC7110
+    ("ExHiROM", 0x40FFC0, (0x5,)),
+)
+_HEADER_LEN = 0x40
+_BOUNDED_READ = 0x10000
+_EXHIROM_READ = 0x410000
+
+_COPROC = {0x0: "DSP", 0x1: "SuperFX", 0x2: "OBC1", 0x3: "SA-1", 0x4: "S-DD1", 0x5: "S-RTC",
+           0xE: "Outro", 0xF: "Custom"}
+_CUSTOM = {0x00: "SPC7110", 0x01: "ST010/ST011", 0x02: "ST018", 0x10: "CX4"}
+_REGIONS = ("Japão", "EUA", "Europa", "Suécia", "Finlândia", "Dinamarca", "França", "Holanda",
+            "Espanha", "Alemanha", "Itália", "China", "Indonésia", "Coreia", "Global", "Canadá",
+            "Brasil", "Austrália")
+_NTSC = {0, 1, 13, 15, 16}
+
+def copier_offset(size: int) -> int:
+    return COPIER_SIZE if size % 1024 == COPIER_SIZE else 0
+
+def _score(buf, base: int, nibbles) -> int:
+    h = buf[base:base + _HEADER_LEN]
+    if len(h) < _HEADER_LEN:
+        return -1
+    score = 0
+    if (h[0x15] & 0x0F) in nibbles and h[0x15] & 0xE0 == 0x20:
+        score += 2
+    checksum = h[0x1E] | h[0x1F] << 8
+    complement = h[0x1C] | h[0x1D] << 8
+    if checksum ^ complement == 0xFFFF:
+        score += 4
+    if (h[0x3C] | h[0x3D] << 8) >= 0x8000:   # vetor de reset (modo emulação) em área de ROM
+        score += 1
+    if all(0x20 <= b < 0x7F or b >= 0xA0 for b in h[:21]):
+        score += 1
+    if 0x07 <= h[0x17] <= 0x0D:
+        score += 1
+    if h[0x18] <= 0x08:
+        score += 1
+    return score
+
+def parse_header(buf, size: Optional[int] = None) -> Optional[dict]:
+    """
+    Interpreta o cabeçalho a partir de `buf` (bytes/mmap com o começo da ROM,
+    copiadora inclusa) e do tamanho total do arquivo. None se não achar um
+    cabeçalho plausível.
+    """
+    size = len(buf) if size is None else size
+    off = copier_offset(size)
+    best = None
+    for name, base, nibbles in _LAYOUTS:
+        if base + _HEADER_LEN > size - off:
+            continue
+        s = _score(buf, off + base, nibbles)
+        if s >= 4 and (best is None or s > best[0]):
+            best = (s, name, off + base)
+    if best is None:
+        return None
+    _, mapping, at = best
+    h = bytes(buf[at:at + _HEADER_LEN])
+    map_mode, cart = h[0x15], h[0x16]
+    checksum = h[0x1E] | h[0x1F] << 8
+    complement = h[0x1C] | h[0x1D] << 8
+    coproc = None
+    if (cart & 0x0F) >= 0x3:
+        coproc = _COPROC.get(cart >> 4)
+        if coproc == "Custom":
+            coproc = _CUSTOM.get(buf[at - 1], "Custom")
+    region = h[0x19]
+    return {
+        "title": h[:21].decode("ascii", "replace").replace("\ufffd", "?").strip(),
+        "mapping": mapping,
+        "fast": bool(map_mode & 0x10),
+        "map_mode": map_mode,
+        "cart_type": cart,
+        "coprocessor": coproc,
+        "rom_kb": (1 << h[0x17]) if h[0x17] <= 0x0D else None,
+        "sram_kb": (1 << h[0x18]) if 0 < h[0x18] <= 0x08 else 0,
+        "region": _REGIONS[region] if region < len(_REGIONS) else f"0x{region:02X}",
+        "video": "NTSC" if region in _NTSC else "PAL",
+        "version": h[0x1B],
+        "checksum": checksum,
+        "complement": complement,
+        "checksum_ok": checksum ^ complement == 0xFFFF,
+        "copier": bool(off),
+    }
+
+def _byte_sum(data: memoryview) -> int:
+    """
+    Soma dos bytes em C: a metade baixa do Adler-32 é 1 + soma (mod 65521), e
+    em blocos de 256 bytes a soma (até 65280) nunca dá a volta. Uns 4x mais
+    rápido que sum() byte a byte (linha "checksum" de benchmarks/bench_patches.py).
+    """
+    adler = zlib.adler32
+    n = len(data)
+    return sum(adler(data[i:i + 256]) & 0xFFFF for i in range(0, n, 256)) - (n + 255) // 256
+
+def rom_checksum(buf, size: Optional[int] = None) -> int:
+    """Checksum do SNES (soma dos bytes, 16 bits), com o espelhamento de ROMs fora de potência de 2."""
+    off = copier_offset(len(buf) if size is None else size)
+    data = memoryview(buf)[off:]
+    n = len(data)
+    if n == 0:
+        return 0
+    base = 1 << (n.bit_length() - 1)
+    total = _byte_sum(data[:base])
+    rest = n - base
+    if rest:
+        # O resto é espelhado até completar outra potência de 2 (ex.: 3 MB = 2 + 1x2)
+        total += _byte_sum(data[base:]) * (base // rest if base % rest == 0 else 1)
+    return total & 0xFFFF
+
+def read_rom_header(path: str, verify: bool = False) -> Optional[dict]:
+    with open(path, "rb") as f:
+        size = os.fstat(f.fileno()).st_size
+        if size < 0x8000:
+            return None
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mm:
+            info = parse_header(mm, size)
+            if info is not None and verify:
+                info["checksum_match"] = rom_checksum(mm, size) == info["checksum"]
+            return info
+
+def read_archive_header(path: str, member: Optional[str] = None) -> Optional[dict]:
+    """Cabeçalho do membro (o mesmo que o launcher abre por padrão: a primeira ROM)."""
+    with open_archive(path) as ar:
+        if member is None:
+            roms = ar.roms()
+            if not roms:
+                return None
+            member = roms[0].name
+        size = ar.size_of(member)
+        if size is None:
+            limit = COPIER_SIZE + _EXHIROM_READ
+        else:
+            limit = copier_offset(size) + (_EXHIROM_READ if size > _EXHIROM_READ else _BOUNDED_READ)
+        buf, size = ar.read(member, limit)
+    info = parse_header(buf, size)
+    if info is not None:
+        info["member"] = member
+    return info
+
+def _index_one(job) -> tuple:
+    """Worker do pool (precisa ser de módulo para o pickle)."""
+    abs_path, tipo, rel, size, mtime_ns, verify = job
+    try:
+        info = read_archive_header(abs_path) if tipo == "zip" else read_rom_header(abs_path, verify)
+        if info is None:
+            info = {"erro": "cabeçalho não reconhecido"}
+    except Exception as e:
+        info = {"erro": str(e) or type(e).__name__}
+    return rel, size, mtime_ns, info
+
+def index_headers(catalog, workers: Optional[int] = None, verify: bool = False, cancel=None,
+                  logger=None, min_parallel: int = 256, batch: int = 500) -> dict:
+    """
+    Lê o cabeçalho de cada arquivo novo/alterado do catálogo e grava em
+    rom_headers. Até `min_parallel` arquivos roda aqui mesmo (subir o pool
+    custaria mais); acima disso usa um ProcessPoolExecutor com `workers`
+    processos (padrão: núcleos). Retorna {"indexed", "failed", "ms", "files_per_s"}.
+    """
+    t0 = time.perf_counter()
+    stale = catalog.stale_headers()
+    jobs = [(os.path.join(catalog.root, rel), tipo, rel, size, mtime_ns, verify)
+            for rel, tipo, size, mtime_ns in stale]
+    stats = {"indexed": 0, "failed": 0}
+    pending = []
+
+    def _flush():
+        catalog.put_headers(pending)
+        stats["indexed"] += len(pending)
+        stats["failed"] += sum(1 for r in pending if "erro" in r[3])
+        pending.clear()
+
+    results = map_processes(_index_one, jobs, workers, min_parallel)
+    try:
+        for res in results:
+            pending.append(res)
+            if len(pending) >= batch:
+                _flush()
+            # A cada arquivo, não a cada lote: numa pasta de rede um lote leva segundos
+            if cancel is not None and cancel.is_set():
+                break
+        if pending:
+            _flush()
+    finally:
+        results.close()
+    ms = (time.perf_counter() - t0) * 1000
+    stats["ms"] = round(ms, 1)
+    stats["files_per_s"] = round(stats["indexed"] / (ms / 1000), 1) if stats["indexed"] and ms else 0.0
+    if logger is not None and stats["indexed"]:
+        logger.info("Cabeçalhos: %d lidos (%d sem cabeçalho) em %.0f ms", stats["indexed"], stats["failed"], ms)
+    return stats
+
+def summary(info: Optional[dict]) -> str:
+    """Uma linha para a GUI/CLI: título · mapeamento · Mbit · coprocessador · região."""
+    if not info or "erro" in info:
+        return ""
+    parts = [info.get("title") or "?", info.get("mapping", "?")]
+    if info.get("rom_kb"):
+        parts.append(f"{info['rom_kb'] // 128} Mbit" if info["rom_kb"] >= 128 else f"{info['rom_kb']} KB")
+    if info.get("coprocessor"):
+        parts.append(info["coprocessor"])
+    parts.append(f"{info.get('region', '?')} ({info.get('video', '?')})")
+    if not info.get("checksum_ok"):
+        parts.append("checksum inválido")
+    return " · ".join(parts)
@@ -1,33 +1,75 @@
-import os
-from .paths import rom_root
+import os, time
+from typing import Optional, Iterator
+from .catalog import Catalog, Delta
+from .archives import open_archive
+from . import tracing
 
-def carregar_jogos() -> list[tuple[str, str]]:
+def carregar_jogos(catalog: Optional[Catalog] = None) -> list[tuple[str, str]]:
     """
     Retorna lista de tuplas (tipo, caminho_relativo).
-      - tipo = "zip" para arquivos .zip
-      - tipo = "rom" para arquivos .sfc/.smc
+      - tipo = "zip" para contêineres (.zip, .7z, .sfc.gz/.bz2/.xz; ver app.archives)
+      - tipo = "rom" para arquivos .sfc/.smc/.fig/.swc
 
     Faz busca RECURSIVA em Roms\jogos e retorna caminhos relativos
     ao rom_root(), p.ex.: "ActRaiser (USA)\ActRaiser (USA).sfc"
+
+    A busca é incremental: usa o catálogo persistente (Saves/catalog.sqlite3)
+    e só relista as pastas cujo mtime mudou. A lista já vem ordenada.
     """
-    root = rom_root()
-    entries: list[tuple[str, str]] = []
     try:
-        for dirpath, _, filenames in os.walk(root):
-            rel_dir = os.path.relpath(dirpath, root)
-            rel_dir = "" if rel_dir == "." else rel_dir
-
-            for f in filenames:
-                fl = f.lower()
-                if fl.endswith(".zip"):
-                    rel = f if not rel_dir else os.path.join(rel_dir, f)
-                    entries.append(("zip", rel))
-                elif fl.endswith(".sfc") or fl.endswith(".smc"):
-                    rel = f if not rel_dir else os.path.join(rel_dir, f)
-                    entries.append(("rom", rel))
-
-        # Ordena por nome (sem extensão), usando o basename
-        entries.sort(key=lambda x: os.path.splitext(os.path.basename(x[1]))[0].lower())
-        return entries
+        cat = catalog or Catalog()
+        try:
+            with tracing.span("scan", kind="library") as sp:
+                d = cat.rescan()
+                sp.update(added=len(d.added), removed=len(d.removed), modified=len(d.modified))
+            return cat.entries()
+        finally:
+            if catalog is None:
+                cat.close()
     except Exception:
         return []
+
+def iter_jogos(catalog: Catalog, batch_size: int = 200, full: bool = False,
+               cancel=None, interval: float = 0.1) -> Iterator[tuple[Delta, int]]:
+    """
+    Varredura em streaming: gera (Delta, pastas_visitadas) em lotes de até
+    ~batch_size entradas (ou a cada `interval` segundos, para o progresso
+    andar mesmo quando nada muda), para a GUI ir preenchendo a lista.
+
+    Ao contrário de carregar_jogos(), NÃO engole exceções: quem consome
+    (p.ex. o LibraryScanner em thread) decide como reportar o erro.
+    """
+    added, removed, modified = [], [], []
+    dirs = changes = 0
+    last = time.monotonic()
+    with tracing.span("scan", kind="library", full=full, streaming=True) as sp:
+        for d, dirs in catalog.iter_rescan(full=full, cancel=cancel):
+            added += d.added; removed += d.removed; modified += d.modified
+            now = time.monotonic()
+            if len(added) + len(removed) + len(modified) >= batch_size or now - last >= interval:
+                changes += len(added) + len(removed) + len(modified)
+                yield Delta(added, removed, modified), dirs
+                added, removed, modified = [], [], []
+                last = now
+        changes += len(added) + len(removed) + len(modified)
+        sp.update(dirs=dirs, changes=changes)
+        yield Delta(added, removed, modified), dirs
+
+def listar_zip(full_path: str) -> list[str]:
+    """Nomes das ROMs dentro do contêiner (ZIP, 7z...), na ordem em que ele as guarda."""
+    with open_archive(full_path) as ar:
+        return [m.name for m in ar.roms()]
+
+def membros_zip(catalog: Catalog, rel_path: str) -> list[str]:
+    """
+    listar_zip() com cache no catálogo, chaveado por (caminho, tamanho, mtime):
+    só abre o contêiner se ele mudou desde a última listagem.
+    """
+    full_path = os.path.join(catalog.root, rel_path)
+    st = os.stat(full_path)
+    cached = catalog.get_zip_members(rel_path, st.st_size, st.st_mtime_ns)
+    if cached is not None:
+        return cached
+    members = listar_zip(full_path)
+    catalog.put_zip_members(rel_path, st.st_size, st.st_mtime_ns, members)
+    return members
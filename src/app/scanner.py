@@ -0,0 +1,160 @@
+import threading
+from PySide6.QtCore import QObject, Signal
+
+class LibraryScanner(QObject):
+    """
+    Roda iter_jogos() numa thread e entrega os lotes para a GUI via sinais.
+
+    - batch(Delta): entradas novas/removidas/alteradas desde o último lote
+    - progress(int): pastas visitadas até agora
+    - failed(str): erro na varredura (o que já chegou continua válido)
+    - headers(int): cabeçalhos de ROM lidos depois da varredura (app.romheader)
+    - tags(dict): marcas verificado/ruim/duplicado (app.hashing + app.dat)
+    - done(bool): fim da varredura; True se terminou, False se cancelada
+
+    Pedir outra varredura no meio de uma cancela a atual e agenda a nova
+    para quando ela sair; nunca há duas threads gravando no catálogo.
+    """
+    batch = Signal(object)
+    progress = Signal(int)
+    failed = Signal(str)
+    headers = Signal(int)
+    tags = Signal(dict)
+    done = Signal(bool)
+
+    def __init__(self, catalog, logger, batch_size: int = 200, settings=None, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.logger = logger
+        self.batch_size = batch_size
+        self.settings = settings
+        self._lock = threading.Lock()
+        self._thread = None
+        self._cancel = None
+        self._pending = None  # full da próxima varredura, se agendada
+
+    def is_running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def start(self, full: bool = False) -> None:
+        with self._lock:
+            if self.is_running():
+                self._cancel.set()
+                self._pending = bool(full or self._pending)
+                return
+            self._spawn(full)
+
+    def cancel(self) -> None:
+        with self._lock:
+            self._pending = None
+            if self._cancel is not None:
+                self._cancel.set()
+
+    def _spawn(self, full: bool) -> None:
+        cancel = threading.Event()
+        self._cancel = cancel
+        self._thread = threading.Thread(target=self._target, args=(full, cancel), daemon=True)
+        self._thread.start()
+
+    def _target(self, full: bool, cancel: threading.Event) -> None:
+        from app.roms import iter_jogos
+        try:
+            for delta, dirs in iter_jogos(self.catalog, self.batch_size, full=full, cancel=cancel):
+                if delta:
+                    self.batch.emit(delta)
+                self.progress.emit(dirs)
+            if not cancel.is_set():
+                self._post_scan(cancel)
+        except Exception as e:
+            self.logger.exception("Falha na varredura da pasta Roms")
+            self.failed.emit(str(e))
+        finally:
+            with self._lock:
+                finished = not cancel.is_set()
+                pending, self._pending = self._pending, None
+                self._thread = None
+                if pending is not None:
+                    self._spawn(pending)
+            self.done.emit(finished)
+
+    def _setting(self, key: str, default):
+        return default if self.settings is None else self.settings.get(key, default)
+
+    def _post_scan(self, cancel: threading.Event) -> None:
+        """Depois de uma varredura completa: cabeçalhos e hashes do que mudou."""
+        if self._setting("rom_headers", True):
+            from app.romheader import index_headers
+            n = index_headers(self.catalog, cancel=cancel, logger=self.logger)["indexed"]
+            if n:
+                self.headers.emit(n)
+        mode = self._setting("hash_roms", "auto")
+        if not mode or cancel.is_set():
+            return
+        from app.paths import save_dir
+        from app.dat import load_dats, tag_library
+        dat = load_dats(save_dir(), self._setting("dat_path", ""))
+        if mode == "auto" and dat is None:
+            return
+        from app.hashing import hash_library
+        hash_library(self.catalog, cancel=cancel, logger=self.logger)
+        if not cancel.is_set():
+            self.tags.emit(tag_library(self.catalog.hashes(), self.catalog.entries(), dat))
+
+class ZipListLoader(QObject):
+    """
+    Lista as ROMs de um contêiner (ZIP, 7z...) fora da thread da GUI (com cache no catálogo).
+
+    Só o pedido mais recente importa: um único worker atende a fila de
+    tamanho 1 (pedidos antigos ainda não iniciados são descartados) e cada
+    resultado leva o id do pedido, para a GUI ignorar respostas velhas.
+
+    loaded(req_id, rel_path, membros, erro) — erro é "" em caso de sucesso.
+    """
+    loaded = Signal(int, str, list, str)
+
+    def __init__(self, catalog, logger, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.logger = logger
+        self._cond = threading.Condition()
+        self._pending = None
+        self._next_id = 0
+        self._latest = 0
+        self._thread = None
+
+    def request(self, rel_path: str) -> int:
+        with self._cond:
+            self._next_id += 1
+            self._latest = self._next_id
+            self._pending = (self._next_id, rel_path)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._worker, daemon=True)
+                self._thread.start()
+            self._cond.notify()
+            return self._next_id
+
+    def cancel(self) -> None:
+        """Descarta o pedido pendente e invalida o que estiver em andamento."""
+        with self._cond:
+            self._next_id += 1
+            self._latest = self._next_id
+            self._pending = None
+
+    def is_current(self, req_id: int) -> bool:
+        return req_id == self._latest
+
+    def _worker(self) -> None:
+        from app.roms import membros_zip
+        while True:
+            with self._cond:
+                while self._pending is None:
+                    self._cond.wait()
+                req_id, rel_path = self._pending
+                self._pending = None
+            try:
+                members = membros_zip(self.catalog, rel_path)
+                err = ""
+            except Exception as e:
+                members, err = [], str(e) or e.__class__.__name__
+            if self.is_current(req_id):
+                self.loaded.emit(req_id, rel_path, members, err)
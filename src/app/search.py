@@ -0,0 +1,189 @@
+import re, unicodedata
+from array import array
+from typing import Optional
+
+_TAG_RE = re.compile(r"[\(\[]([^\)\]]*)[\)\]]")
+_NON_ALNUM = re.compile(r"[^0-9a-z]+")
+
+def normalizar(texto: str) -> str:
+    """Minúsculas, sem acentos e só [0-9a-z] separados por espaço: "Pokémon" -> "pokemon"."""
+    if texto.isascii():
+        t = texto.lower()
+    else:
+        t = unicodedata.normalize("NFKD", texto)
+        t = "".join(c for c in t if not unicodedata.combining(c)).casefold()
+    return _NON_ALNUM.sub(" ", t).strip()
+
+def separar_tags(nome: str) -> tuple[str, list[str]]:
+    """ "Chrono Trigger (USA) (PT-BR)" -> ("Chrono Trigger", ["USA", "PT-BR"]) """
+    tags = [t.strip() for t in _TAG_RE.findall(nome) if t.strip()]
+    titulo = _TAG_RE.sub(" ", nome)
+    return " ".join(titulo.split()), tags
+
+def _max_edits(token: str) -> int:
+    n = len(token)
+    if n <= 3:
+        return 0
+    if n <= 7:
+        return 1
+    return 2
+
+def _prefix_grams(word: str):
+    # "  w" deslizando de 3 em 3: inclui início de palavra e todos os trigramas internos
+    p = "  " + word
+    return {p[i:i + 3] for i in range(len(word))}
+
+def _prefix_distance(q: str, w: str, limit: int) -> int:
+    """Menor distância de edição entre q e algum prefixo de w (limitada a limit+1)."""
+    prev = list(range(len(w) + 1))
+    for i, cq in enumerate(q, 1):
+        cur = [i] + [0] * len(w)
+        for j, cw in enumerate(w, 1):
+            cur[j] = min(prev[j] + 1, cur[j - 1] + 1, prev[j - 1] + (cq != cw))
+        if min(cur) > limit:
+            return limit + 1
+        prev = cur
+    return min(prev)
+
+class SearchIndex:
+    """
+    Índice de busca montado uma vez por carga do catálogo (e atualizado com
+    os deltas), em vez de recalcular nomes a cada tecla.
+
+    - nomes normalizados (sem acento, casefold) com as tags "(USA) (PT-BR)"
+      separadas do título;
+    - trigramas com marcador de início de palavra -> candidatos para busca
+      aproximada (tolera 1 erro em termos de 4-7 letras, 2 acima disso);
+    - ranking: título começando pela busca > palavra exata > prefixo >
+      substring > aproximado; empate mantém a ordem do catálogo;
+    - se a busca só cresceu (mais letras/termos), filtra dentro do
+      resultado anterior.
+    """
+
+    def __init__(self):
+        self._ids: list[Optional[str]] = []      # slot -> caminho relativo (None = removido)
+        self._slot: dict[str, int] = {}
+        self._titles: list[str] = []
+        self._full: list[str] = []
+        self._words: list[tuple] = []
+        self._tags: list[tuple] = []
+        self._grams: dict[str, array] = {}
+        self._last = None  # (tokens, slots casados)
+
+    @classmethod
+    def build(cls, entries) -> "SearchIndex":
+        """entries: (tipo, caminho_relativo), na ordem do catálogo."""
+        idx = cls()
+        for _, rel in entries:
+            idx.add(rel)
+        return idx
+
+    def __len__(self) -> int:
+        return len(self._slot)
+
+    def add(self, rel_path: str) -> None:
+        if rel_path in self._slot:
+            return
+        from app.archives import stem   # só com o catálogo aberto (fora do primeiro quadro)
+        nome = stem(rel_path)
+        titulo, tags = separar_tags(nome)
+        title_n = normalizar(titulo)
+        tags_n = tuple(normalizar(t) for t in tags)
+        full = " ".join((title_n,) + tags_n)
+        slot = len(self._ids)
+        self._ids.append(rel_path)
+        self._slot[rel_path] = slot
+        self._titles.append(title_n)
+        self._full.append(full)
+        self._tags.append(tags_n)
+        words = tuple(full.split())
+        self._words.append(words)
+        grams = set()
+        for w in words:
+            grams |= _prefix_grams(w)
+        for g in grams:
+            self._grams.setdefault(g, array("I")).append(slot)
+        self._last = None
+
+    def remove(self, rel_path: str) -> None:
+        slot = self._slot.pop(rel_path, None)
+        if slot is not None:
+            # Slot fica morto; as listas de trigramas são filtradas na busca
+            self._ids[slot] = None
+
+    def tags(self, rel_path: str) -> tuple:
+        slot = self._slot.get(rel_path)
+        return self._tags[slot] if slot is not None else ()
+
+    def search(self, query: str) -> Optional[list[str]]:
+        """
+        Retorna os caminhos relativos ordenados por relevância, ou None se a
+        busca estiver vazia (= mostrar tudo, na ordem do catálogo).
+        """
+        q = normalizar(query)
+        if not q:
+            self._last = None
+            return None
+        tokens = q.split()
+
+        pool = None
+        if self._last is not None:
+            old_tokens, old_match = self._last
+            if (len(tokens) >= len(old_tokens)
+                    and all(t.startswith(o) and _max_edits(t) == _max_edits(o)
+                            for o, t in zip(old_tokens, tokens))):
+                pool = old_match
+
+        if pool is None:
+            pool = self._candidates(tokens)
+
+        scored = []
+        matched = set()
+        for slot in (sorted(pool) if pool is not None else range(len(self._ids))):
+            if self._ids[slot] is None:
+                continue
+            score = self._score(slot, tokens, q)
+            if score:
+                matched.add(slot)
+                scored.append((-score, slot))
+        scored.sort()
+        self._last = (tokens, matched)
+        return [self._ids[s] for _, s in scored]
+
+    def _candidates(self, tokens) -> Optional[set]:
+        """Candidatos pelo termo mais seletivo (>= 3 letras); None = varrer tudo."""
+        best = None
+        for t in tokens:
+            if len(t) < 3:
+                continue
+            grams = _prefix_grams(t) | {t[i:i + 3] for i in range(len(t) - 2)}
+            need = max(2, len(t) - 3 * _max_edits(t))
+            counts: dict[int, int] = {}
+            for g in grams:
+                for slot in self._grams.get(g, ()):
+                    counts[slot] = counts.get(slot, 0) + 1
+            exact = {t[i:i + 3] for i in range(len(t) - 2)}
+            cand = {s for s, c in counts.items() if c >= min(need, len(exact))}
+            if best is None or len(cand) < len(best):
+                best = cand
+        return best
+
+    def _score(self, slot: int, tokens, q: str) -> float:
+        full = self._full[slot]
+        words = self._words[slot]
+        total = 0.0
+        for t in tokens:
+            if t in words:
+                total += 4
+            elif any(w.startswith(t) for w in words):
+                total += 3
+            elif t in full:
+                total += 2
+            else:
+                d = _max_edits(t)
+                if not d or not any(_prefix_distance(t, w, d) <= d for w in words):
+                    return 0.0
+                total += 1
+        if self._titles[slot].startswith(q):
+            total += 2
+        return total
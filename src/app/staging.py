@@ -0,0 +1,134 @@
+import os, time, shutil, hashlib, tempfile
+from typing import Callable, Optional
+
+from app.paths import runtime_dir
+
+DEFAULT_CAP_BYTES = 1024 * 1024 * 1024  # 1 GiB
+_TMP_PREFIX = ".tmp-"
+_GRACE_SEC = 120        # entradas usadas há pouco nunca são despejadas
+_STALE_TMP_SEC = 3600   # temporários órfãos (processo morto no meio da escrita)
+
+def staging_root() -> str:
+    return os.path.join(runtime_dir(), "staging")
+
+def _tree_size(path: str) -> int:
+    total = 0
+    for dirpath, _, files in os.walk(path):
+        for f in files:
+            try: total += os.path.getsize(os.path.join(dirpath, f))
+            except OSError: pass
+    return total
+
+class StagingCache:
+    """
+    Cache persistente de ROMs extraídas, em <runtime>/staging/<chave>/<nome da ROM>.
+
+    - chave = sha1(caminho do ZIP | tamanho | mtime | membro): ZIP alterado
+      gera outra chave, a entrada antiga some pelo LRU;
+    - o nome original da ROM é mantido (o snes9x nomeia SRAM/states por ele);
+    - escrita atômica: arquivo temporário na mesma pasta + os.replace;
+    - LRU pelo mtime da ROM (tocado a cada uso) com limite de tamanho;
+    - seguro com duas instâncias do launcher: nada é sobrescrito no lugar,
+      entradas recém-usadas não são despejadas e falhas ao apagar um arquivo
+      em uso (Windows) apenas pulam a entrada.
+    """
+
+    def __init__(self, root: Optional[str] = None, cap_bytes: int = DEFAULT_CAP_BYTES, logger=None):
+        self.root = root or staging_root()
+        self.cap_bytes = int(cap_bytes)
+        self.logger = logger
+        os.makedirs(self.root, exist_ok=True)
+
+    @staticmethod
+    def key_for(archive_path: str, member: str) -> str:
+        st = os.stat(archive_path)
+        ident = "|".join((os.path.normcase(os.path.abspath(archive_path)),
+                          str(st.st_size), str(st.st_mtime_ns), member))
+        return hashlib.sha1(ident.encode("utf-8")).hexdigest()[:24]
+
+    def path_for(self, key: str, member: str) -> str:
+        return os.path.join(self.root, key, os.path.basename(member))
+
+    def get(self, key: str, member: str) -> Optional[str]:
+        """Caminho da ROM já extraída (marcando uso recente), ou None."""
+        p = self.path_for(key, member)
+        try:
+            os.utime(p, None)
+            return p
+        except OSError:
+            return None
+
+    def put(self, key: str, member: str, write: Callable) -> str:
+        """
+        Cria a entrada chamando write(arquivo_binário_aberto) num temporário
+        e publica com os.replace. Se write falhar, nada fica no cache.
+        """
+        dest = self.path_for(key, member)
+        d = os.path.dirname(dest)
+        os.makedirs(d, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(prefix=_TMP_PREFIX, dir=d)
+        try:
+            with os.fdopen(fd, "wb") as f:
+                write(f)
+            try:
+                os.replace(tmp, dest)
+            except PermissionError:
+                # Outra instância publicou e já está usando o arquivo (Windows)
+                if not os.path.exists(dest):
+                    raise
+                os.remove(tmp)
+        except BaseException:
+            try: os.remove(tmp)
+            except OSError: pass
+            raise
+        self.evict(keep=key)
+        return dest
+
+    def evict(self, keep: Optional[str] = None) -> int:
+        """Apaga as entradas menos usadas até caber em cap_bytes. Retorna bytes liberados."""
+        now = time.time()
+        entries = []
+        total = 0
+        try:
+            names = os.listdir(self.root)
+        except OSError:
+            return 0
+        for name in names:
+            d = os.path.join(self.root, name)
+            if not os.path.isdir(d):
+                continue
+            size, last = 0, 0.0
+            try:
+                for f in os.scandir(d):
+                    st = f.stat()
+                    if f.name.startswith(_TMP_PREFIX):
+                        if now - st.st_mtime > _STALE_TMP_SEC:
+                            try: os.remove(f.path)
+                            except OSError: pass
+                        continue
+                    size += st.st_size
+                    last = max(last, st.st_mtime)
+            except OSError:
+                continue
+            total += size
+            entries.append((last, name, size))
+
+        freed = 0
+        entries.sort()
+        for last, name, size in entries:
+            if total <= self.cap_bytes:
+                break
+            if name == keep or now - last < _GRACE_SEC:
+                continue
+            try:
+                shutil.rmtree(os.path.join(self.root, name))
+            except OSError:
+                continue  # em uso por outra instância
+            total -= size
+            freed += size
+        if freed and self.logger:
+            self.logger.info("Staging: %d bytes liberados (LRU), uso atual %d bytes", freed, total)
+        return freed
+
+    def usage(self) -> int:
+        return _tree_size(self.root)
@@ -0,0 +1,135 @@
+# src/app/startup.py
+"""
+Orçamento e perfil da partida da GUI.
+
+Marcas de tempo (mark) são sempre registradas, desde o início do processo,
+para conferir se o primeiro quadro saiu dentro de startup_budget_ms.
+Com o perfil ligado (SNESLauncher.exe --profile-startup ou variável
+SNES_PROFILE_STARTUP=1) também registra cada import, no estilo do
+`python -X importtime` (tempo próprio e acumulado), e ao final grava
+Saves/startup_profile.json e imprime o resumo no stderr.
+"""
+import os, sys, json, time, builtins, threading
+from typing import Optional
+
+PROFILE_FLAG = "--profile-startup"
+PROFILE_ENV = "SNES_PROFILE_STARTUP"
+# Fecha a GUI logo após a partida (medições automatizadas, ver benchmarks/bench_dist.py)
+EXIT_ENV = "SNES_EXIT_AFTER_STARTUP"
+
+_t0: Optional[float] = None
+_profiling = False
+_marks: list = []       # (nome, ms desde o início)
+_imports: list = []     # (profundidade, módulo, ms acumulado, ms próprio)
+_local = threading.local()
+_orig_import = builtins.__import__
+
+def _timed_import(name, globals=None, locals=None, fromlist=(), level=0):
+    stack = getattr(_local, "stack", None)
+    if stack is None:
+        stack = _local.stack = []
+    before = len(sys.modules)
+    stack.append(0.0)          # acumulado dos filhos
+    t0 = time.perf_counter()
+    try:
+        return _orig_import(name, globals, locals, fromlist, level)
+    finally:
+        cum = (time.perf_counter() - t0) * 1000
+        children = stack.pop()
+        if stack:
+            stack[-1] += cum
+        if len(sys.modules) > before:  # só o que de fato carregou módulo novo
+            mod = name if not level else "." * level + name
+            _imports.append((len(stack), mod, cum, cum - children))
+
+def begin(t0: Optional[float] = None, profile: Optional[bool] = None) -> bool:
+    """
+    Chamar o quanto antes no main (t0 = perf_counter() da primeira linha).
+    Retorna se o perfil de imports está ligado.
+    """
+    global _t0, _profiling
+    _t0 = t0 if t0 is not None else time.perf_counter()
+    if profile is None:
+        profile = PROFILE_FLAG in sys.argv or os.environ.get(PROFILE_ENV, "") not in ("", "0")
+    if PROFILE_FLAG in sys.argv:
+        sys.argv.remove(PROFILE_FLAG)
+    if profile and not _profiling:
+        builtins.__import__ = _timed_import
+        _profiling = True
+    mark("begin")
+    return _profiling
+
+def exit_requested() -> bool:
+    return os.environ.get(EXIT_ENV, "") not in ("", "0")
+
+def profiling() -> bool:
+    return _profiling
+
+def elapsed_ms() -> float:
+    return 0.0 if _t0 is None else (time.perf_counter() - _t0) * 1000
+
+def mark(name: str) -> float:
+    ms = elapsed_ms()
+    if _t0 is not None and all(m[0] != name for m in _marks):
+        _marks.append((name, ms))
+    return ms
+
+def marks() -> dict:
+    return dict(_marks)
+
+def _stop_profiling() -> None:
+    global _profiling
+    if _profiling and builtins.__import__ is _timed_import:
+        builtins.__import__ = _orig_import
+    _profiling = False
+
+def finish(logger=None, budget_ms: Optional[float] = None, save_path: Optional[str] = None, top: int = 25) -> dict:
+    """
+    Fecha a medição (depois das tarefas adiadas): loga primeiro quadro x
+    orçamento e, com perfil ligado, grava/imprime a quebra por import.
+    """
+    m = marks()
+    first = m.get("first_paint")
+    if logger is not None and first is not None:
+        if budget_ms and first > budget_ms:
+            logger.warning("Partida: primeiro quadro em %.0f ms (orçamento %.0f ms)", first, budget_ms)
+        else:
+            logger.info("Partida: primeiro quadro em %.0f ms, pronto em %.0f ms",
+                        first, m.get("ready", elapsed_ms()))
+    try:
+        from app import tracing
+        tr = tracing.Trace("startup", begin=False)
+        tracing.record({"trace": tr.id, "kind": "startup", "event": "end", "status": "ok",
+                        "ms": round(m.get("ready", elapsed_ms()), 3)})
+        for name, ms in _marks:
+            tracing.record({"trace": tr.id, "kind": "startup", "event": "mark", "name": name,
+                            "at_ms": round(ms, 3)})
+    except Exception:
+        pass
+
+    report = {"marks_ms": {k: round(v, 1) for k, v in _marks}, "budget_ms": budget_ms}
+    if not _profiling:
+        return report
+    was = list(_imports)
+    _stop_profiling()
+    ranked = sorted(was, key=lambda r: -r[2])
+    report["imports"] = [{"module": mod, "depth": d, "cumulative_ms": round(cum, 2), "self_ms": round(own, 2)}
+                         for d, mod, cum, own in ranked]
+    report["imports_total_ms"] = round(sum(r[3] for r in was), 1)
+    if save_path:
+        try:
+            with open(os.path.join(save_path, "startup_profile.json"), "w", encoding="utf-8") as f:
+                json.dump(report, f, ensure_ascii=False, indent=2)
+        except Exception:
+            pass
+    out = sys.stderr or getattr(sys, "__stderr__", None)
+    if out:
+        try:
+            print("import time: self [ms] | cumulative [ms] | módulo", file=out)
+            for d, mod, cum, own in ranked[:top]:
+                print(f"import time: {own:9.1f} | {cum:9.1f} | {'  ' * d}{mod}", file=out)
+            for k, v in _marks:
+                print(f"startup: {v:9.1f} ms  {k}", file=out)
+        except Exception:
+            pass
+    return report
@@ -0,0 +1,192 @@
+# src/app/tracing.py
+"""
+Rastreamento leve do lançamento (e da varredura) em JSON lines.
+
+Cada lançamento ganha um Trace com id próprio; spans medem etapas
+(zip_open, extract, deploy, conf_patch, popen...) e marks registram
+instantes relativos ao início (window_seen, fullscreen, exit). Tudo vai
+para <Saves>/trace.jsonl, uma linha por evento.
+
+record() só acrescenta a linha num buffer em memória (nada de disco na
+thread da GUI); uma thread grava em lote a cada FLUSH_SECONDS, quando o
+buffer passa de FLUSH_EVENTS, no fim de cada trace e na saída. flush()
+força a escrita (report/load_events chamam antes de ler).
+
+Relatório p50/p95 por etapa sobre o histórico:
+
+    python -m app.tracing report [arquivo]
+"""
+import os, sys, json, time, atexit, threading, contextlib
+from typing import Optional
+
+TRACE_FILE = "trace.jsonl"
+MAX_BYTES = 5 * 1024 * 1024   # acima disso o arquivo vira trace.jsonl.1
+FLUSH_SECONDS = 2.0
+FLUSH_EVENTS = 256
+
+_lock = threading.Lock()      # protege _pending e o início do escritor
+_io_lock = threading.Lock()   # uma escrita por vez no arquivo
+_path: Optional[str] = None
+_pending: list = []
+_wake = threading.Event()
+_writer: Optional[threading.Thread] = None
+
+def trace_path() -> str:
+    global _path
+    if _path is None:
+        from app.paths import save_dir
+        _path = os.path.join(save_dir(), TRACE_FILE)
+    return _path
+
+def set_trace_path(path: Optional[str]) -> None:
+    """Troca o destino (None volta ao padrão em Saves); o pendente vai para o antigo."""
+    global _path
+    flush()
+    _path = path
+
+def record(event: dict) -> None:
+    """Enfileira um evento (sem E/S). Falhas de E/S nunca atrapalham o lançamento."""
+    global _writer
+    event.setdefault("ts", round(time.time(), 3))
+    line = json.dumps(event, ensure_ascii=False, default=str) + "\n"
+    with _lock:
+        _pending.append(line)
+        if _writer is None:
+            _writer = threading.Thread(target=_write_loop, name="trace-writer", daemon=True)
+            _writer.start()
+        if len(_pending) >= FLUSH_EVENTS:
+            _wake.set()
+
+def _write_loop() -> None:
+    while True:
+        _wake.wait(FLUSH_SECONDS)
+        _wake.clear()
+        flush()
+
+def flush() -> None:
+    """Grava o que está no buffer (um open/write por lote)."""
+    global _pending
+    with _io_lock:
+        with _lock:
+            lines, _pending = _pending, []
+        if not lines:
+            return
+        try:
+            path = trace_path()
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            try:
+                if os.path.getsize(path) > MAX_BYTES:
+                    os.replace(path, path + ".1")
+            except OSError:
+                pass
+            with open(path, "a", encoding="utf-8") as f:
+                f.write("".join(lines))
+        except Exception:
+            pass
+
+atexit.register(flush)
+
+class Trace:
+    """Um lançamento (ou outra operação longa) com id, spans e marks."""
+
+    def __init__(self, kind: str = "launch", begin: bool = True, **attrs):
+        self.id = os.urandom(6).hex()
+        self.kind = kind
+        self.t0 = time.perf_counter()
+        self._marks = set()
+        if begin:
+            record({"trace": self.id, "kind": kind, "event": "begin", **attrs})
+
+    def elapsed_ms(self) -> float:
+        return (time.perf_counter() - self.t0) * 1000
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attrs):
+        """
+        Mede o bloco. O dict devolvido aceita atributos extras, ex.:
+            with tr.span("extract") as sp: sp["hit"] = True
+        """
+        t0 = time.perf_counter()
+        ok = True
+        try:
+            yield attrs
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            record({"trace": self.id, "kind": self.kind, "event": "span", "name": name,
+                    "ms": round((time.perf_counter() - t0) * 1000, 3), "ok": ok, **attrs})
+
+    def mark(self, name: str, once: bool = True, **attrs) -> None:
+        """Instante (ms desde o início do trace); once=True ignora repetições."""
+        if once and name in self._marks:
+            return
+        self._marks.add(name)
+        record({"trace": self.id, "kind": self.kind, "event": "mark", "name": name,
+                "at_ms": round(self.elapsed_ms(), 3), **attrs})
+
+    def end(self, status: str = "ok", **attrs) -> None:
+        record({"trace": self.id, "kind": self.kind, "event": "end", "status": status,
+                "ms": round(self.elapsed_ms(), 3), **attrs})
+        _wake.set()   # trace completo: o escritor grava já, fora desta thread
+
+def span(name: str, kind: str = "task", **attrs):
+    """Span avulso (sem lançamento), ex.: varredura da biblioteca."""
+    return Trace(kind, begin=False).span(name, **attrs)
+
+def _pct(values: list, p: float) -> float:
+    values = sorted(values)
+    if not values:
+        return 0.0
+    k = (len(values) - 1) * p / 100.0
+    lo = int(k)
+    hi = min(lo + 1, len(values) - 1)
+    return values[lo] + (values[hi] - values[lo]) * (k - lo)
+
+def load_events(path: Optional[str] = None) -> list:
+    flush()
+    path = path or trace_path()
+    out = []
+    for p in (path + ".1", path):
+        try:
+            with open(p, "r", encoding="utf-8") as f:
+                for line in f:
+                    try: out.append(json.loads(line))
+                    except ValueError: pass
+        except OSError:
+            pass
+    return out
+
+def report(path: Optional[str] = None) -> list:
+    """
+    Linhas (etapa, n, p50, p95) em ms. Spans usam a duração; marks usam o
+    instante desde o início do lançamento (prefixo "@"); "total" é o end.
+    """
+    stages: dict[str, list] = {}
+    for ev in load_events(path):
+        kind = ev.get("kind", "")
+        if ev.get("event") == "span":
+            stages.setdefault(f"{kind}.{ev.get('name')}", []).append(float(ev.get("ms", 0)))
+        elif ev.get("event") == "mark":
+            stages.setdefault(f"{kind}.@{ev.get('name')}", []).append(float(ev.get("at_ms", 0)))
+        elif ev.get("event") == "end":
+            stages.setdefault(f"{kind}.total", []).append(float(ev.get("ms", 0)))
+    return [(name, len(v), _pct(v, 50), _pct(v, 95)) for name, v in sorted(stages.items())]
+
+def main(argv=None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    if not argv or argv[0] != "report":
+        print("uso: python -m app.tracing report [trace.jsonl]")
+        return 2
+    rows = report(argv[1] if len(argv) > 1 else None)
+    if not rows:
+        print("Sem eventos de trace.")
+        return 0
+    w = max(len(r[0]) for r in rows)
+    print(f"{'etapa':<{w}}  {'n':>5}  {'p50 ms':>10}  {'p95 ms':>10}")
+    for name, n, p50, p95 in rows:
+        print(f"{name:<{w}}  {n:>5}  {p50:>10.1f}  {p95:>10.1f}")
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,114 @@
+import os, sys
+from PySide6.QtCore import QObject, QTimer, QFileSystemWatcher, Signal
+
+_NETWORK_FS = {"nfs", "nfs4", "cifs", "smb3", "smbfs", "fuse.sshfs", "9p", "afs"}
+
+def is_network_path(path: str) -> bool:
+    """
+    True para compartilhamentos de rede (UNC, unidade mapeada, montagem nfs/cifs).
+    Nesses casos o QFileSystemWatcher não é confiável e usamos polling.
+    """
+    try:
+        p = os.path.abspath(path)
+        if p.startswith("\\\\") or p.startswith("//"):
+            return True
+        if sys.platform.startswith("win"):
+            import ctypes
+            DRIVE_REMOTE = 4
+            drive = os.path.splitdrive(p)[0] + "\\"
+            return ctypes.windll.kernel32.GetDriveTypeW(drive) == DRIVE_REMOTE
+        best, fstype = "", ""
+        with open("/proc/mounts", "r", encoding="utf-8") as f:
+            for line in f:
+                parts = line.split()
+                if len(parts) < 3:
+                    continue
+                mnt = parts[1].replace("\\040", " ")
+                if (p == mnt or p.startswith(mnt.rstrip("/") + "/")) and len(mnt) > len(best):
+                    best, fstype = mnt, parts[2]
+        return fstype in _NETWORK_FS
+    except Exception:
+        return False
+
+class RomWatcher(QObject):
+    """
+    Observa rom_root() e subpastas e emite `dirty()` quando é hora de um
+    rescan incremental (que a GUI roda no LibraryScanner e aplica só o Delta).
+
+    - Local: QFileSystemWatcher nas pastas do catálogo (sem custo em repouso).
+    - Rede (ou se o watcher recusar alguma pasta): polling a cada poll_ms;
+      cada poll é um rescan incremental, que só faz stat das pastas.
+
+    Rajadas de eventos (copiar centenas de ROMs) são agrupadas: `dirty` sai
+    debounce_ms após o último evento, mas nunca espera mais que max_wait_ms
+    desde o primeiro evento pendente. Assim o número de atualizações da lista
+    fica limitado pela duração da cópia, não pelo número de arquivos.
+
+    Depois de cada rescan, chame sync_paths() para observar pastas novas.
+    """
+    dirty = Signal()
+
+    def __init__(self, catalog, logger, debounce_ms: int = 750, max_wait_ms: int = 3000,
+                 poll_ms: int = 5000, parent=None):
+        super().__init__(parent)
+        self.catalog = catalog
+        self.logger = logger
+        self.max_wait_ms = max_wait_ms
+        self._fsw = None
+
+        self._debounce = QTimer(self)
+        self._debounce.setSingleShot(True)
+        self._debounce.setInterval(debounce_ms)
+        self._debounce.timeout.connect(self._flush)
+
+        self._max_wait = QTimer(self)
+        self._max_wait.setSingleShot(True)
+        self._max_wait.setInterval(max_wait_ms)
+        self._max_wait.timeout.connect(self._flush)
+
+        self._poll = QTimer(self)
+        self._poll.setInterval(poll_ms)
+        self._poll.timeout.connect(self._flush)
+
+    def start(self) -> None:
+        root = self.catalog.root
+        if is_network_path(root):
+            self.logger.info("Pasta Roms em rede (%s): usando polling", root)
+            self._poll.start()
+            return
+        self._fsw = QFileSystemWatcher(self)
+        self._fsw.directoryChanged.connect(self._on_event)
+        self.sync_paths()
+
+    def stop(self) -> None:
+        for t in (self._debounce, self._max_wait, self._poll):
+            t.stop()
+        if self._fsw is not None:
+            dirs = self._fsw.directories()
+            if dirs:
+                self._fsw.removePaths(dirs)
+
+    def sync_paths(self) -> None:
+        if self._fsw is None:
+            return
+        wanted = set(self.catalog.dirs())
+        current = set(self._fsw.directories())
+        gone = current - wanted
+        if gone:
+            self._fsw.removePaths(list(gone))
+        new = wanted - current
+        if new:
+            failed = self._fsw.addPaths(list(new))
+            if failed and not self._poll.isActive():
+                self.logger.warning("QFileSystemWatcher recusou %d pasta(s); ativando polling", len(failed))
+                self._poll.start()
+
+    def _on_event(self, _path: str) -> None:
+        self._debounce.start()
+        if not self._max_wait.isActive():
+            self._max_wait.start()
+
+    def _flush(self) -> None:
+        self._debounce.stop()
+        self._max_wait.stop()
+        self.dirty.emit()
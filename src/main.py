@@ -1,11 +1,13 @@
 # src/main.py
-import os, sys, faulthandler
-from PySide6.QtWidgets import QApplication
-from app.paths import app_base_dir, save_dir
-from app.logging_conf import setup_logger
-from app.gui import MainWindow
+import time
+_T0 = time.perf_counter()
+import os, sys, faulthandler, multiprocessing
 
 def run_gui():
+    from app import startup
+    from app.paths import app_base_dir, save_dir
+    from app.logging_conf import setup_logger
+
     _stream = sys.stderr or getattr(sys, "__stderr__", None)
     try:
         if _stream: faulthandler.enable(_stream)
@@ -15,10 +17,21 @@ def run_gui():
     except Exception: pass
 
     logger = setup_logger(save_dir())
+    from PySide6.QtWidgets import QApplication
     app = QApplication(sys.argv)
     app.setQuitOnLastWindowClosed(True)
+    startup.mark("qapplication")
+    from app.gui import MainWindow
+    startup.mark("import_gui")
     win = MainWindow(logger); win.showFullScreen()
+    startup.mark("shown")
     rc = app.exec(); sys.exit(rc)
 
 if __name__ == "__main__":
+    # Workers do pool de processos (app.romheader/app.hashing, spawn) reimportam
+    # este arquivo como __mp_main__: só os imports do topo rodam neles, e no
+    # build PyInstaller o freeze_support os desvia daqui, sem Qt
+    multiprocessing.freeze_support()
+    from app import startup
+    startup.begin(_T0)
     run_gui()
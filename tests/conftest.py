@@ -0,0 +1,8 @@
+import os, sys, shutil, atexit, tempfile
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "src"))
+
+# Saves (trace.jsonl, config, log) num temporário: os testes nunca escrevem em src/app/Saves
+_saves = tempfile.mkdtemp(prefix="snes_tests_")
+os.environ["SNES_SAVES"] = _saves
+atexit.register(shutil.rmtree, _saves, True)
@@ -0,0 +1,40 @@
+import os, threading
+
+from app.catalog import Catalog
+
+def _touch(path: str) -> None:
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "wb") as f:
+        f.write(b"\0" * 1024)
+
+def _catalog(tmp_path) -> Catalog:
+    return Catalog(db_path=str(tmp_path / "catalog.sqlite3"), root=str(tmp_path / "Roms"))
+
+def test_rescan_lista_subpastas(tmp_path):
+    _touch(str(tmp_path / "Roms" / "a.sfc"))
+    _touch(str(tmp_path / "Roms" / "X" / "Y" / "b.smc"))
+    cat = _catalog(tmp_path)
+    try:
+        d = cat.rescan()
+        assert sorted(r for _, r in d.added) == [os.path.join("X", "Y", "b.smc"), "a.sfc"]
+        assert not cat.rescan()
+    finally:
+        cat.close()
+
+def test_varredura_cancelada_nao_perde_pasta_nova(tmp_path):
+    root = tmp_path / "Roms"
+    _touch(str(root / "a.sfc"))
+    cat = _catalog(tmp_path)
+    try:
+        cat.rescan()
+        _touch(str(root / "Nova" / "b.sfc"))
+        os.utime(root, ns=(os.stat(root).st_atime_ns, os.stat(root).st_mtime_ns + 1_000_000_000))
+        cancel = threading.Event()
+        for _ in cat.iter_rescan(cancel=cancel):
+            cancel.set()   # para logo depois da raiz: "Nova" ainda não foi listada
+        assert cat.entries() == [("rom", "a.sfc")]
+
+        cat.rescan()
+        assert ("rom", os.path.join("Nova", "b.sfc")) in cat.entries()
+    finally:
+        cat.close()
@@ -0,0 +1,11 @@
+import os
+
+from app.deploy import deploy_files
+
+def test_so_os_arquivos_do_emulador(tmp_path):
+    for name in ("snes9x-x64.exe", "snes9x.conf", "python311.dll", "Qt6Core.dll", "vcruntime140.dll"):
+        (tmp_path / name).write_bytes(b"x")
+    (tmp_path / "shaders").mkdir()
+    (tmp_path / "shaders" / "crt.glsl").write_bytes(b"x")
+    assert deploy_files(str(tmp_path), "snes9x-x64.exe") == \
+        ["snes9x-x64.exe", "snes9x.conf", os.path.join("shaders", "crt.glsl")]
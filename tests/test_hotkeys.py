@@ -0,0 +1,90 @@
+from app.hotkeys import HotkeyService, LongPressDetector, PollingBackend, SimulatedBackend, key_code
+from app.jobs import CancelToken
+
+class Relogio:
+    def __init__(self):
+        self.agora = 0.0
+
+    def __call__(self) -> float:
+        return self.agora
+
+class TokenFalso(CancelToken):
+    """wait() avança o relógio em vez de dormir; cancela sozinho em `ate`."""
+
+    def __init__(self, relogio: Relogio, ate: float):
+        super().__init__()
+        self.relogio, self.ate = relogio, ate
+
+    def wait(self, timeout=None) -> bool:
+        self.relogio.agora += timeout or 0.0
+        if self.relogio.agora >= self.ate:
+            self.cancel()
+        return self.is_set()
+
+class TokenNoFim(CancelToken):
+    """O aviso de parada (None na fila) entra já, atrás dos eventos emitidos."""
+
+    def add_callback(self, cb) -> None:
+        cb()
+
+def _consome(svc: HotkeyService) -> list:
+    svc.run(TokenNoFim())
+    return [key for key, _ in svc.fired]
+
+def test_key_code():
+    assert [key_code(n) for n in ("F12", "esc", "p", "0x7B", "F25", "")] == [0x7B, 0x1B, ord("P"), 0x7B, None, None]
+
+def test_detector_limiar_autorepeat_e_cooldown():
+    d = LongPressDetector(600, cooldown_ms=500)
+    assert d.feed("F12", True, 0.0) == []
+    assert d.feed("F12", True, 0.3) == []             # autorepeat não reinicia a segurada
+    assert d.poll(0.59) == []
+    assert [k for k, _ in d.poll(0.6)] == ["F12"]
+    assert d.poll(2.0) == []                          # uma vez por segurada
+    d.feed("F12", False, 2.0)
+    d.feed("F12", True, 2.1)                          # cooldown acabou em 1.1
+    assert [k for k, _ in d.poll(2.7)] == ["F12"]
+    d.feed("F12", False, 2.8)
+    d.feed("F12", True, 2.9)                          # cooldown até 3.2: não conta
+    assert d.poll(4.0) == []
+
+def test_detector_toque_curto_e_soltar_depois_do_prazo():
+    d = LongPressDetector(600)
+    d.feed("F12", True, 0.0)
+    assert d.feed("F12", False, 0.2) == []
+    d.feed("F12", True, 1.0)
+    # Soltou depois do limiar sem nenhum poll no meio: conta no próprio release
+    assert [(k, round(late, 3)) for k, late in d.feed("F12", False, 1.9)] == [("F12", 0.3)]
+
+def test_detector_teclas_independentes():
+    d = LongPressDetector(600)
+    d.feed("F12", True, 0.0)
+    d.feed("pad:BACK", True, 0.4)
+    assert d.next_deadline() == 0.6
+    assert [k for k, _ in d.poll(0.7)] == ["F12"]
+    d.feed("pad:BACK", False, 0.8)                    # segurou só 0.4 s
+    assert d.poll(2.0) == []
+
+def test_backend_por_eventos():
+    rel = Relogio()
+    svc = HotkeyService(600, lambda key: None, clock=rel)
+    sim = SimulatedBackend([(0.0, "F12", True), (0.1, "F12", True), (1.0, "F12", False),
+                            (1.2, "F12", True), (1.3, "F12", False),      # cooldown
+                            (2.0, "P", True), (2.2, "P", False),          # toque curto
+                            (3.0, "F12", True), (3.8, "F12", False)], events=True, clock=rel)
+    sim.run(svc.emit, TokenFalso(rel, ate=10.0))
+    assert _consome(svc) == ["F12", "F12"]
+    assert sim.wakeups == 9
+
+def test_backend_por_polling_so_emite_mudancas():
+    rel = Relogio()
+    svc = HotkeyService(600, lambda key: None, clock=rel)
+    segurando = {0x7B: [(0.0, 1.0), (3.0, 3.3)], ord("P"): [(1.5, 2.4)], 0x1B: [(0.0, 5.0)]}
+    ler = lambda code: any(a <= rel.agora < b for a, b in segurando[code])
+    # ESC está segurado o tempo todo, mas não é tecla do atalho: nunca chega ao serviço
+    poll = PollingBackend({0x7B: "F12", ord("P"): "P"}, ler, interval_ms=50)
+    emitidos = []
+    poll.run(lambda key, pressed: (emitidos.append((key, pressed)), svc.emit(key, pressed)),
+             TokenFalso(rel, ate=4.0))
+    assert emitidos == [("F12", True), ("F12", False), ("P", True), ("P", False), ("F12", True), ("F12", False)]
+    assert _consome(svc) == ["F12", "P"]
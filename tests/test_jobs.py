@@ -0,0 +1,5 @@
+from app.jobs import map_processes
+
+def test_map_processes_em_ordem_no_pool():
+    # abs é picklável e existe no processo filho (spawn)
+    assert list(map_processes(abs, range(-300, 0), workers=2, min_parallel=1)) == list(range(300, 0, -1))
@@ -0,0 +1,20 @@
+import logging
+
+from app.launcher import Launcher, LaunchResult
+
+def test_busy_nao_mexe_na_sessao_ativa(tmp_path):
+    eventos = []
+    L = Launcher(logging.getLogger("test"), on_finished=lambda: eventos.append("finished"),
+                 on_error=lambda r: eventos.append("error"), on_result=lambda r: eventos.append("result"))
+    ativo = LaunchResult("ok", "", "", trace_id="ativo")
+    L.last_result, L.last_status = ativo, "ok"
+    L._session = object()   # sessão em andamento
+    try:
+        rom = str(tmp_path / "Jogo.sfc")
+        assert L.run_with_type("rom", rom, None, fullscreen=False, block=True) == "Busy"
+        assert L.run_with_type("rom", rom, None, fullscreen=False) == "Busy"
+        assert eventos == []
+        assert L.last_result is ativo and L.last_status == "ok"
+    finally:
+        L._session = None
+        L.shutdown()
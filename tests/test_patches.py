@@ -0,0 +1,73 @@
+import os
+
+from app.catalog import Catalog
+from app.patches import apply_patch, base_candidates, find_base, snes_checksum_ok
+from app.romheader import rom_checksum
+
+def _library(tmp_path, names):
+    root = tmp_path / "Roms"
+    for n in names:
+        p = root / n
+        p.parent.mkdir(parents=True, exist_ok=True)
+        p.write_bytes(b"\0" * 1024)
+    cat = Catalog(db_path=str(tmp_path / "catalog.sqlite3"), root=str(root))
+    cat.rescan()
+    return cat
+
+def test_candidatos_comecam_pelo_nome_inteiro():
+    assert base_candidates("Jogo (USA) (PT-BR).ips") == ["jogo (usa) (pt-br)", "jogo (usa)", "jogo"]
+    assert base_candidates("Jogo (USA).ips") == ["jogo (usa)", "jogo"]
+    assert base_candidates("Chrono Trigger.ips") == ["chrono trigger"]
+
+def test_base_com_o_mesmo_nome_do_patch(tmp_path):
+    cat = _library(tmp_path, ["Jogo (USA).sfc", "Jogo (USA).ips"])
+    try:
+        assert find_base(cat, "Jogo (USA).ips", b"PATCHEOF") == ("rom", "Jogo (USA).sfc", "nome")
+    finally:
+        cat.close()
+
+def test_base_sem_tags(tmp_path):
+    cat = _library(tmp_path, ["Chrono Trigger.sfc", os.path.join("hacks", "Chrono Trigger.ips")])
+    try:
+        assert find_base(cat, os.path.join("hacks", "Chrono Trigger.ips"), b"PATCHEOF") == \
+            ("rom", "Chrono Trigger.sfc", "nome")
+    finally:
+        cat.close()
+
+def test_base_pelo_nome_sem_a_tag_da_traducao(tmp_path):
+    cat = _library(tmp_path, ["Jogo (USA).sfc", "Jogo (USA) (PT-BR).ips"])
+    try:
+        assert find_base(cat, "Jogo (USA) (PT-BR).ips", b"PATCHEOF")[1] == "Jogo (USA).sfc"
+    finally:
+        cat.close()
+
+def test_ips_com_rle_e_extensao():
+    patch = b"PATCH" + b"\x00\x00\x02\x00\x02AB" + b"\x00\x00\x08\x00\x00\x00\x03Z" + b"EOF"
+    assert apply_patch(b"\0" * 8, patch) == b"\0\0AB\0\0\0\0ZZZ"
+
+def _lorom(texto: bytes) -> bytearray:
+    """LoROM de 128 KiB com cabeçalho plausível e checksum interno certo."""
+    rom = bytearray(128 * 1024)
+    h = 0x7FC0
+    rom[h:h + 21] = b"JOGO DE TESTE".ljust(21)
+    rom[h + 0x15], rom[h + 0x17], rom[h + 0x3D] = 0x20, 0x07, 0x80
+    rom[0x100:0x100 + len(texto)] = texto
+    rom[h + 0x1C:h + 0x20] = b"\xff\xff\x00\x00"   # soma de checksum + complemento é fixa
+    c = rom_checksum(rom)
+    rom[h + 0x1C:h + 0x20] = (c ^ 0xFFFF).to_bytes(2, "little") + c.to_bytes(2, "little")
+    return rom
+
+def _ips(base: bytes, alvo: bytes, desloc: int = 0) -> bytes:
+    regs = b""
+    for at in (0x100, 0x7FDC):   # texto e checksum/complemento
+        regs += (at + desloc).to_bytes(3, "big") + len(alvo[at:at + 4]).to_bytes(2, "big") + alvo[at:at + 4]
+    return b"PATCH" + regs + b"EOF"
+
+def test_ips_sobre_base_com_cabecalho_de_copiadora():
+    base, alvo = _lorom(b"OLA!"), _lorom(b"OI!!")
+    assert snes_checksum_ok(alvo)
+    smc = bytes(512) + bytes(base)
+    # Patch feito sobre a ROM sem cabeçalho (o usual) e um antigo, feito sobre a .smc
+    assert apply_patch(smc, _ips(base, alvo)) == alvo
+    assert apply_patch(smc, _ips(base, alvo, desloc=512)) == alvo
+    assert apply_patch(bytes(base), _ips(base, alvo)) == alvo
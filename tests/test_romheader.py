@@ -0,0 +1,36 @@
+import random, threading
+
+from app.catalog import Catalog
+from app.romheader import index_headers, rom_checksum
+
+def _soma(rom: bytes) -> int:
+    n = len(rom)
+    base = 1 << (n.bit_length() - 1)
+    rest = n - base
+    return (sum(rom[:base]) + sum(rom[base:]) * (base // rest if rest and base % rest == 0 else 1)) & 0xFFFF
+
+def test_checksum_confere_com_a_soma_byte_a_byte():
+    rnd = random.Random(1)
+    for n in (1, 255, 256, 257, 0x8000, 0x18000):   # 0x18000: espelhado (64 + 32x2 KiB)
+        rom = rnd.randbytes(n)
+        assert rom_checksum(rom) == _soma(rom), n
+    cheia = b"\xff" * 0x20000                      # pior caso de cada bloco
+    assert rom_checksum(cheia) == _soma(cheia)
+    assert rom_checksum(bytes(512) + cheia) == _soma(cheia)   # cabeçalho de copiadora
+    assert rom_checksum(b"") == 0
+
+def test_index_headers_para_no_arquivo_do_cancelamento(tmp_path):
+    root = tmp_path / "Roms"
+    root.mkdir()
+    for i in range(20):
+        (root / f"Jogo {i:02d}.sfc").write_bytes(b"\0" * 1024)
+    cat = Catalog(db_path=str(tmp_path / "catalog.sqlite3"), root=str(root))
+    try:
+        cat.rescan()
+        cancel = threading.Event()
+        cancel.set()
+        # Lote de 500 bem maior que a biblioteca: o cancelamento vale já no primeiro arquivo
+        assert index_headers(cat, cancel=cancel)["indexed"] == 1
+        assert index_headers(cat)["indexed"] == 19
+    finally:
+        cat.close()
@@ -0,0 +1,18 @@
+from app import tracing
+
+def test_record_so_grava_em_lote(tmp_path):
+    path = tmp_path / "trace.jsonl"
+    tracing.set_trace_path(str(path))
+    try:
+        # Com o arquivo "ocupado" quem registra não espera: só enfileira
+        with tracing._io_lock:
+            tr = tracing.Trace("launch", tipo="rom")
+            with tr.span("deploy"):
+                pass
+            assert len(tracing._pending) == 2 and not path.exists()
+        tracing.flush()
+        assert len(path.read_text(encoding="utf-8").splitlines()) == 2
+        tr.end("ok")
+        assert [name for name, *_ in tracing.report(str(path))] == ["launch.deploy", "launch.total"]
+    finally:
+        tracing.set_trace_path(None)